@@ -0,0 +1,77 @@
+# advice_index.py
+from __future__ import annotations
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+import countries
+from countries import country_key
+
+# ---------------------------------
+# Investing advice index
+# ---------------------------------
+# One canonical dataset (files/investing_advice.json) feeds the investing_advice
+# tool, the Saving & Investing page and the chat's EC$ investing ideas. The index
+# keys every tip under (country, age_group, goal) and (country, age_group, None),
+# and resolves names like "Antigua and Barbuda", "St Kitts" or "SVG" to one
+# canonical country through the shared registry (countries.py), so every
+# lookup is a couple of dict hits.
+AGE_GROUPS = ("youth", "adult")
+FLAG_URL = "https://flagcdn.com/w320/{iso2}.png"
+
+
+class Tip(NamedTuple):
+    text: str        # plain text (tool output, chat)
+    markdown: str    # same tip with links (page)
+    goal: str        # save | invest | learn | earn
+
+
+class AdviceIndex:
+    """Immutable index over validated advice records (see data_loaders.load_investing_advice)."""
+
+    def __init__(self, countries: List[Dict[str, Any]], age_groups: Optional[Dict[str, str]] = None,
+                 goals: Optional[List[str]] = None):
+        names: List[str] = []
+        aliases: Dict[str, str] = {}
+        by_iso2: Dict[str, str] = {}
+        flags: Dict[str, str] = {}
+        tips: Dict[Tuple[str, str, Optional[str]], Tuple[Tip, ...]] = {}
+        for c in countries:
+            name = c["name"]
+            names.append(name)
+            for alias in [name, c.get("iso2") or "", *c.get("aliases", ())]:
+                if alias:
+                    aliases.setdefault(country_key(alias), name)
+            if c.get("iso2"):
+                by_iso2[c["iso2"].upper()] = name
+                flags[name] = FLAG_URL.format(iso2=c["iso2"].lower())
+            for group, group_tips in c["advice"].items():
+                tips[(name, group, None)] = tuple(group_tips)
+                for t in group_tips:
+                    tips[(name, group, t.goal)] = tips.get((name, group, t.goal), ()) + (t,)
+        self.countries: Tuple[str, ...] = tuple(names)
+        self.age_groups: Mapping[str, str] = MappingProxyType(dict(age_groups or {g: g.title() for g in AGE_GROUPS}))
+        self.goals: Tuple[str, ...] = tuple(goals or sorted({k[2] for k in tips if k[2]}))
+        self.aliases: Mapping[str, str] = MappingProxyType(aliases)
+        self.by_iso2: Mapping[str, str] = MappingProxyType(by_iso2)
+        self.flags: Mapping[str, str] = MappingProxyType(flags)
+        self.tips: Mapping[Tuple[str, str, Optional[str]], Tuple[Tip, ...]] = MappingProxyType(tips)
+
+    def __len__(self) -> int:
+        return len(self.countries)
+
+    def resolve(self, country: str) -> Optional[str]:
+        """Canonical country name for any known spelling, else None."""
+        name = self.aliases.get(country_key(country or ""))
+        if name is None:
+            c = countries.lookup(country)
+            name = self.by_iso2.get(c.iso2) if c else None
+        return name
+
+    def flag(self, country: str) -> Optional[str]:
+        return self.flags.get(self.resolve(country) or "")
+
+    def advice(self, country: str, age_group: str = "youth", goal: Optional[str] = None) -> Tuple[Tip, ...]:
+        name = self.resolve(country)
+        if name is None:
+            return ()
+        return self.tips.get((name, (age_group or "").strip().lower(), (goal or "").strip().lower() or None), ())
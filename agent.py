@@ -1,17 +1,19 @@
 import os
 import time
 import requests
-import pycountry
+import countries
 import streamlit as st
 
 from currency_converter import currencyconverter
-from common_scams import commonscams2
+from common_scams import commonscams2, check_scam_contacts
 from budget_gen import budgeting_function
 from save_invest import investing_advice
 from small_hustles import get_random_side_job, generate_business_idea
+from image_pipeline import agno_images
+from telemetry import TurnTimer
+from tool_budget import budget_hook, select_tools, parse_budgets, BUDGETS
 from agno.agent import Agent
 from agno.models.openrouter import OpenRouter
-from agno.media import Image
 from agno.tools.duckduckgo import DuckDuckGoTools
 from agno.tools.yfinance import YFinanceTools
 from agno.tools.googlesearch import GoogleSearchTools
@@ -30,6 +32,19 @@ if not API_KEY:
 
 MODEL_ID = os.getenv("OPENROUTER_MODEL") or st.secrets.get("OPENROUTER_MODEL") or "google/gemini-2.5-flash"
 
+def _secret(key: str):
+    """st.secrets.get that tolerates a missing secrets.toml (env-only deployments)."""
+    try:
+        return st.secrets.get(key)
+    except Exception:
+        return None
+
+# Point at a local OpenAI-compatible stand-in for load tests (see loadtest/mock_openrouter.py)
+BASE_URL = os.getenv("OPENROUTER_BASE_URL") or _secret("OPENROUTER_BASE_URL") or "https://openrouter.ai/api/v1"
+
+# Per-tool time budgets from secrets, e.g. TOOL_BUDGETS = "duckduckgo=8,yfinance_tools=12"
+BUDGETS.update(parse_budgets(_secret("TOOL_BUDGETS")))
+
 # Optional profile fields (not required here, but available if you want them elsewhere)
 profile = st.session_state.get("user_profile", {})
 base_currency = profile.get("base_currency", "XCD")
@@ -38,17 +53,7 @@ tone = profile.get("tone", "Friendly")
 # ----------------------------
 # ECCU context + persona tone
 # ----------------------------
-ECCU_COUNTRIES = [
-    "Antigua and Barbuda",
-    "Dominica",
-    "Grenada",
-    "Saint Kitts and Nevis",
-    "Saint Lucia",
-    "Saint Vincent and the Grenadines",
-    "Anguilla",
-    "Montserrat",
-]
-_ECCU_SET = set(ECCU_COUNTRIES)
+ECCU_COUNTRIES = [c.name for c in countries.ECCU_COUNTRIES]
 
 COUNTRY_TONE = {
     "Antigua and Barbuda": {
@@ -158,11 +163,12 @@ TOOL PRIORITY
 - Use built-in tools before generic reasoning:
   1) currencyconverter (for conversions)
   2) budgeting_function (when amounts/budgets arise)
-  3) investing_advice (beginner-friendly, risk-aware)
-  4) get_random_side_job / generate_business_idea (contextual hustles)
-  5) DuckDuckGo / GoogleSearch / Wikipedia (facts, definitions, fees) with citations
-  6) YFinanceTools (market context)
-  7) ThinkingTools for careful planning (do not expose chain-of-thought; share conclusions only)
+  3) investing_advice (beginner-friendly, risk-aware; any spelling of an ECCU country, optional goal: save, invest, learn or earn)
+  4) check_scam_contacts (when a message contains phone/WhatsApp numbers, links, emails or @/$ handles and the user asks if it is legit)
+  5) get_random_side_job (filter by remote, low cost, skill, cost band, country or keyword) / generate_business_idea (contextual hustles)
+  6) DuckDuckGo / GoogleSearch / Wikipedia (facts, definitions, fees) with citations
+  7) YFinanceTools (market context)
+  8) ThinkingTools for careful planning (do not expose chain-of-thought; share conclusions only)
 
 FORMATTING
 - When numbers appear, use the user’s base currency; if different from local, show both (e.g., “EC$ 150 (~US$ 55)”).
@@ -206,73 +212,18 @@ REPLY TEMPLATE (GUIDELINE, NOT RIGID)
 # Location detection (profile-first, then IP)
 # ----------------------------
 
-# Normalize common aliases -> ISO names
-_ALIASES = {
-    "Antigua & Barbuda": "Antigua and Barbuda",
-    "St. Kitts & Nevis": "Saint Kitts and Nevis",
-    "St Kitts & Nevis": "Saint Kitts and Nevis",
-    "St. Lucia": "Saint Lucia",
-    "St Lucia": "Saint Lucia",
-    "St. Vincent & the Grenadines": "Saint Vincent and the Grenadines",
-    "St Vincent & the Grenadines": "Saint Vincent and the Grenadines",
-}
-
-# Country -> preferred currency
-_COUNTRY_TO_CURRENCY = {
-    # ECCU block
-    "Anguilla": "XCD",
-    "Antigua and Barbuda": "XCD",
-    "Dominica": "XCD",
-    "Grenada": "XCD",
-    "Montserrat": "XCD",
-    "Saint Kitts and Nevis": "XCD",
-    "Saint Lucia": "XCD",
-    "Saint Vincent and the Grenadines": "XCD",
-    # Wider Caribbean commonly used
-    "Barbados": "BBD",
-    "Trinidad and Tobago": "TTD",
-    "Jamaica": "JMD",
-    "Bahamas": "BSD",
-    "Haiti": "HTG",
-    "Cuba": "CUP",
-    "Dominican Republic": "DOP",
-    # Fallbacks
-    "United States": "USD",
-    "United Kingdom": "GBP",
-    "Canada": "CAD",
-    "France": "EUR",
-}
-
-
-
-
-
-
-def _normalize_country_name(name: str | None) -> str:
-    if not name:
-        return ""
-    name = name.strip()
-    return _ALIASES.get(name, name)
-
-def _country_to_iso2(name: str) -> str | None:
-    try:
-        c = pycountry.countries.lookup(_normalize_country_name(name))
-        return c.alpha_2
-    except Exception:
-        return None
-
+# Aliases, ISO codes and currencies come from the shared registry (countries.py)
 def _build_location(country: str, city: str = "", lat=None, lon=None, source="profile/ip/override") -> dict:
-    country_norm = _normalize_country_name(country)
-    iso2 = _country_to_iso2(country_norm) if country_norm else None
-    currency = _COUNTRY_TO_CURRENCY.get(country_norm)
+    c = countries.lookup(country)
+    country_norm = c.name if c else (country or "").strip()
     return {
         "country": country_norm or None,
-        "country_code": iso2,
+        "country_code": c.iso2 if c else None,
         "city": city or None,
         "latitude": lat,
         "longitude": lon,
-        "currency": currency,
-        "is_eccu": bool(country_norm in _ECCU_SET),
+        "currency": c.currency if c else None,
+        "is_eccu": bool(c and c.is_eccu),
         "source": source,
         "ts": int(time.time()),
     }
@@ -330,12 +281,8 @@ def _ip_provider_ipinfo() -> dict | None:
                 lat, lon = [float(x) for x in loc.split(",", 1)]
             except Exception:
                 pass
-        country = None
-        if cc:
-            try:
-                country = pycountry.countries.lookup(cc).name
-            except Exception:
-                pass
+        c = countries.lookup(cc)
+        country = c.name if c else None
         if not country:
             return None
         return _build_location(country, city=city, lat=lat, lon=lon, source="ipinfo.io")
@@ -359,7 +306,7 @@ def detect_user_location(force_refresh: bool = False) -> dict:
 
     # Wizard profile (most reliable)
     prof = st.session_state.get("user_profile") or {}
-    prof_country = _normalize_country_name(prof.get("country"))
+    prof_country = countries.canonical(prof.get("country"))
     if prof_country:
         loc = _build_location(prof_country, source="profile")
         st.session_state["user_location"] = loc
@@ -429,31 +376,59 @@ def build_instructions(location: dict) -> str:
 # ----------------------------
 # Agent runner
 # ----------------------------
-def agent(message, image=None, location=None):
-    instructions = build_instructions(location or {})
-    _agent = Agent(
-        name="💼 Financial AI Agent",
-        model=OpenRouter(id=MODEL_ID, api_key=API_KEY, max_tokens=60000),
-        tools=[
-            DuckDuckGoTools(),
-            YFinanceTools(historical_prices=True),
-            GoogleSearchTools(),
-            HackerNewsTools(),
-            WikipediaTools(),
-            ThinkingTools(add_instructions=True),
-            currencyconverter,
-            commonscams2,
-            budgeting_function,
-            investing_advice,
-            get_random_side_job,
-            generate_business_idea
-        ],
-        tool_choice="auto",
-        instructions=instructions,
-        add_history_to_messages=True,
-    )
+def agent(message, images=None, location=None, timer=None, scam_report=None):
+    """
+    Build the agent for this turn and return its event stream.
+    Pass a telemetry.TurnTimer as `timer` to time prompt and agent construction;
+    the stream includes tool call events so the caller can time those too.
+    A flagged scam_detector.ScamReport for the user's message is passed on as a
+    SCAM CHECK note so the reply leads with the warning.
+    `images` are image_pipeline.PreparedImage (already downsized), sent as bytes.
+    """
+    timer = timer or TurnTimer()
+    with timer.span("build_prompt"):
+        instructions = build_instructions(location or {})
+        if scam_report:
+            instructions += (
+                "\n\nSCAM CHECK (local phrase matcher, already shown to the user): the latest message or upload "
+                f"matches known scam patterns: {scam_report.summary()}. Open with a clear, calm warning, explain "
+                "the red flags, and tell the user not to pay, share codes or personal details until it is verified."
+            )
+    with timer.span("build_agent"):
+        # Tools whose recent p95 blew their time budget sit out for a while (see tool_budget.py)
+        tools, demoted = select_tools(
+            [
+                DuckDuckGoTools(),
+                YFinanceTools(historical_prices=True),
+                GoogleSearchTools(),
+                HackerNewsTools(),
+                WikipediaTools(),
+                ThinkingTools(add_instructions=True),
+            ],
+            [
+                currencyconverter,
+                commonscams2,
+                check_scam_contacts,
+                budgeting_function,
+                investing_advice,
+                get_random_side_job,
+                generate_business_idea,
+            ],
+        )
+        timer.demoted_tools = demoted
+        _agent = Agent(
+            name="💼 Financial AI Agent",
+            model=OpenRouter(id=MODEL_ID, api_key=API_KEY, base_url=BASE_URL, max_tokens=60000),
+            tools=tools,
+            tool_choice="auto",
+            tool_hooks=[budget_hook],
+            instructions=instructions,
+            add_history_to_messages=True,
+        )
+    timer.agent = _agent  # lets the caller read run metrics (token usage) after the stream ends
 
-    if image:
-        image = [Image(filepath=image)]
+    images = agno_images(images) if images else None
 
-    return _agent.run(message=message, images=image, stream=True)
+    # run() is a lazy generator: the request goes out on the caller's first next(), so
+    # time-to-first-chunk is measured in the stream loop (TurnTimer.content / ttft_ms)
+    return _agent.run(message=message, images=images, stream=True, stream_intermediate_steps=True)
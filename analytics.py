@@ -0,0 +1,241 @@
+# analytics.py
+"""
+Streaming analytics over conversation logs and quiz scores.
+
+    python analytics.py [--logs files/conversations] [--scores files/scores.json]
+                        [--out files/analytics/summary.json]
+
+Everything is read through generators (one log line / one score object at a
+time), and latencies go into fixed log-scale histograms, so memory stays flat
+no matter how large the logs grow. The summary is written column-oriented:
+each table is {"column": [values...]}.
+"""
+from __future__ import annotations
+import argparse
+import gzip
+import json
+import re
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from telemetry import LatencyHistogram
+
+FILES_DIR = Path("files")
+CONVO_DIR = FILES_DIR / "conversations"
+SCORES_PATH = FILES_DIR / "scores.json"
+SUMMARY_PATH = FILES_DIR / "analytics" / "summary.json"
+
+_ERROR_PREFIX = "Error:"
+_DIGITS_RE = re.compile(r"\d+")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Generators
+# ──────────────────────────────────────────────────────────────────────────────
+def iter_log_files(log_dir: Path = CONVO_DIR) -> Iterator[Tuple[str, Path]]:
+    """Yield (user_key, path) for live logs and rotated .jsonl.gz archives."""
+    if not log_dir.exists():
+        return
+    for p in sorted(log_dir.iterdir()):
+        if p.name.endswith(".jsonl"):
+            yield p.name[: -len(".jsonl")], p
+        elif p.name.endswith(".jsonl.gz"):
+            yield p.name.split(".", 1)[0], p
+
+
+def iter_entries(path: Path) -> Iterator[dict]:
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except Exception:
+                continue
+
+
+def iter_turns(log_dir: Path = CONVO_DIR) -> Iterator[dict]:
+    """
+    Pair each assistant entry with the user entry before it, yielding
+    {"user", "country", "tools", "latency_ms", "error", "reply"} per turn.
+    """
+    for user_key, path in iter_log_files(log_dir):
+        prev_user: Optional[dict] = None
+        for e in iter_entries(path):
+            role = e.get("role")
+            if role == "user":
+                prev_user = e
+                continue
+            if role != "assistant":
+                continue
+            meta = e.get("meta") or {}
+            latency = (meta.get("timings") or {}).get("total_ms")
+            if latency is None and prev_user is not None:
+                try:
+                    latency = (datetime.fromisoformat(e["ts"]) - datetime.fromisoformat(prev_user["ts"])).total_seconds() * 1000
+                except Exception:
+                    latency = None
+            reply = e.get("content") or ""
+            yield {
+                "user": user_key,
+                "country": meta.get("country") or (prev_user or {}).get("meta", {}).get("country") or "Unknown",
+                "tools": meta.get("tools") or [],
+                "latency_ms": latency,
+                "error": reply.startswith(_ERROR_PREFIX),
+                "reply": reply,
+            }
+            prev_user = None
+
+
+def iter_json_array(path: Path, chunk_size: int = 64 * 1024) -> Iterator[dict]:
+    """Incrementally decode a top-level JSON array without loading the whole file."""
+    if not path.exists():
+        return
+    dec = json.JSONDecoder()
+    buf = ""
+    started = False
+    with path.open("r", encoding="utf-8") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            buf += chunk
+            pos = 0
+            while True:
+                while pos < len(buf) and buf[pos] in " \t\r\n,":
+                    pos += 1
+                if not started:
+                    if pos < len(buf) and buf[pos] == "[":
+                        started = True
+                        pos += 1
+                        continue
+                    break
+                if pos < len(buf) and buf[pos] == "]":
+                    return
+                try:
+                    obj, end = dec.raw_decode(buf, pos)
+                except ValueError:
+                    break  # need more data
+                yield obj
+                pos = end
+            buf = buf[pos:]
+            if not chunk:
+                return
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Aggregation
+# ──────────────────────────────────────────────────────────────────────────────
+def _error_signature(reply: str) -> str:
+    """'Error: cannot access local variable 'location'...' -> stable bucket key."""
+    return _DIGITS_RE.sub("N", reply[:80]).strip()
+
+
+def _columns(rows: List[dict], keys: List[str]) -> Dict[str, list]:
+    return {k: [r.get(k) for r in rows] for k in keys}
+
+
+def summarize(log_dir: Path = CONVO_DIR, scores_path: Path = SCORES_PATH) -> dict:
+    turns = 0
+    errors = 0
+    latency = LatencyHistogram()
+    by_country: Dict[str, Counter] = defaultdict(Counter)
+    country_latency: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+    tool_calls: Counter = Counter()
+    error_kinds: Counter = Counter()
+    users = set()
+
+    for t in iter_turns(log_dir):
+        turns += 1
+        users.add(t["user"])
+        c = by_country[t["country"]]
+        c["turns"] += 1
+        if t["error"]:
+            errors += 1
+            c["errors"] += 1
+            error_kinds[_error_signature(t["reply"])] += 1
+        for name in t["tools"]:
+            tool_calls[name] += 1
+            c["tool_calls"] += 1
+        if t["latency_ms"] is not None:
+            latency.add(t["latency_ms"])
+            country_latency[t["country"]].add(t["latency_ms"])
+
+    quiz: Dict[str, Counter] = defaultdict(Counter)
+    for s in iter_json_array(scores_path):
+        if not isinstance(s, dict):
+            continue
+        q = quiz[s.get("category") or "Unknown"]
+        q["runs"] += 1
+        q["correct"] += int(s.get("score") or 0)
+        q["asked"] += int(s.get("total") or 0)
+
+    country_rows = [
+        {
+            "country": k,
+            "turns": v["turns"],
+            "errors": v["errors"],
+            "error_rate": round(v["errors"] / v["turns"], 4) if v["turns"] else 0.0,
+            "tool_calls": v["tool_calls"],
+            "p50_ms": country_latency[k].summary()["p50_ms"],
+            "p90_ms": country_latency[k].summary()["p90_ms"],
+        }
+        for k, v in sorted(by_country.items(), key=lambda kv: -kv[1]["turns"])
+    ]
+    tool_rows = [{"tool": k, "calls": v} for k, v in tool_calls.most_common()]
+    error_rows = [{"signature": k, "count": v} for k, v in error_kinds.most_common(20)]
+    quiz_rows = [
+        {
+            "category": k,
+            "runs": v["runs"],
+            "correct": v["correct"],
+            "asked": v["asked"],
+            "accuracy": round(v["correct"] / v["asked"], 4) if v["asked"] else None,
+        }
+        for k, v in sorted(quiz.items())
+    ]
+
+    return {
+        "generated_at": datetime.now().astimezone().isoformat(timespec="seconds"),
+        "totals": {
+            "users": len(users),
+            "turns": turns,
+            "errors": errors,
+            "error_rate": round(errors / turns, 4) if turns else 0.0,
+            "latency": latency.summary(),
+        },
+        "tables": {
+            "by_country": _columns(country_rows, ["country", "turns", "errors", "error_rate", "tool_calls", "p50_ms", "p90_ms"]),
+            "by_tool": _columns(tool_rows, ["tool", "calls"]),
+            "errors": _columns(error_rows, ["signature", "count"]),
+            "quiz_by_category": _columns(quiz_rows, ["category", "runs", "correct", "asked", "accuracy"]),
+        },
+    }
+
+
+def write_summary(summary: dict, out: Path = SUMMARY_PATH) -> Path:
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(summary, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Aggregate chat logs and quiz scores.")
+    ap.add_argument("--logs", type=Path, default=CONVO_DIR)
+    ap.add_argument("--scores", type=Path, default=SCORES_PATH)
+    ap.add_argument("--out", type=Path, default=SUMMARY_PATH)
+    args = ap.parse_args(argv)
+
+    summary = summarize(args.logs, args.scores)
+    path = write_summary(summary, args.out)
+    t = summary["totals"]
+    print(f"{t['turns']} turns from {t['users']} users · error rate {t['error_rate']:.1%} · "
+          f"p50 {t['latency']['p50_ms']} ms · p90 {t['latency']['p90_ms']} ms")
+    print(f"Summary written to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,15 +2,21 @@
 from __future__ import annotations
 from pathlib import Path
 from typing import Dict, List, Optional
-import base64, urllib.parse, json, random, re, uuid, time
+import base64, urllib.parse, json, os, random, re, threading, uuid, time
 
 import requests
 import streamlit as st
 
+import avatar_local
+from avatar_cache import CACHE, FULL_SIZE, avatar_key
+
 # ---------- Storage ----------
 AVATAR_DIR = Path("files/avatars")
 AVATAR_DIR.mkdir(parents=True, exist_ok=True)
 
+# Avatars render locally (avatar_local.py); set AVATAR_REMOTE=1 to use api.dicebear.com instead
+REMOTE_AVATARS = os.getenv("AVATAR_REMOTE", "").strip().lower() in ("1", "true", "yes")
+
 # ---------- Per-session / per-user helpers ----------
 def _sanitize_email(email: str) -> str:
     email = (email or "").strip().lower().replace("@", "_at_").replace(".", "_")
@@ -30,9 +36,6 @@ def _user_key(email_hint: Optional[str]) -> str:
 def avatar_path_for_current_user(email_hint: Optional[str] = None) -> Path:
     return AVATAR_DIR / f"{_user_key(email_hint)}_avatar.svg"
 
-def avatar_png_path_for_current_user(email_hint: Optional[str] = None) -> Path:
-    return AVATAR_DIR / f"{_user_key(email_hint)}_avatar.png"
-
 def avatar_exists_for_current_user(email_hint: Optional[str] = None) -> bool:
     return avatar_path_for_current_user(email_hint).exists()
 
@@ -45,13 +48,16 @@ def _fetch_svg(url: str) -> str:
 
 @st.cache_data(show_spinner=False, ttl=3600)
 def _load_schema(style: str) -> dict | None:
+    bundled = avatar_local.load_schema(style)
+    if bundled and not REMOTE_AVATARS:
+        return bundled
     try:
         url = f"https://api.dicebear.com/9.x/{style}/schema.json"
         r = requests.get(url, timeout=15)
         r.raise_for_status()
         return r.json()
     except Exception:
-        return None
+        return bundled
 
 def _schema_enum(schema: dict, key: str) -> List[str] | None:
     try:
@@ -64,7 +70,7 @@ def _schema_enum(schema: dict, key: str) -> List[str] | None:
         pass
     return None
 
-# ---------- DiceBear fetch (radius fixed at 0, size fixed at 512) ----------
+# ---------- DiceBear fetch (opt-in; radius fixed at 0, size fixed at 512) ----------
 def _dicebear_build_url(style: str, seed: str, params: Dict[str, str]) -> str:
     q = {"seed": seed, "size": "512", "radius": "0"}  # fixed values
     for k, v in params.items():
@@ -89,6 +95,109 @@ def _fetch_with_backoff(style: str, seed: str, params: Dict[str, str]) -> str:
             delay *= 1.6
     raise last or RuntimeError("DiceBear unavailable")
 
+def _renderer_for(style: str) -> str:
+    return "local" if (not REMOTE_AVATARS and avatar_local.supports(style)) else "dicebear"
+
+def _render_svg(style: str, seed: str, params: Dict[str, str]) -> str:
+    if _renderer_for(style) == "local":
+        return avatar_local.render_svg(style, seed, params)
+    return _fetch_with_backoff(style, seed, params)
+
+# ---------- Background preview (debounced, latest request wins) ----------
+PREVIEW_DEBOUNCE_S = 0.35   # wait for the user to stop clicking before fetching
+PREVIEW_POLL_S = 0.5        # how often the placeholder checks for the result
+
+class PreviewWorker:
+    """
+    One per session. `request()` records the newest (key, producer) and wakes a
+    single background thread; after a short debounce the thread renders only
+    the most recent request, so a burst of widget changes costs one fetch.
+    Results land in the avatar cache, which is where the UI and Save read them.
+    """
+
+    def __init__(self, debounce_s: float = PREVIEW_DEBOUNCE_S):
+        self.debounce_s = debounce_s
+        self._cond = threading.Condition()
+        self._pending = None          # (key, produce) waiting to run
+        self._in_flight = None        # key being rendered right now
+        self._errors: Dict[str, str] = {}
+        self._thread = None
+
+    def request(self, key: str, produce) -> None:
+        with self._cond:
+            if self._in_flight == key or (self._pending and self._pending[0] == key):
+                return
+            self._pending = (key, produce)
+            self._errors.pop(key, None)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="avatar-preview", daemon=True)
+                self._thread.start()
+
+    def busy(self, key: str) -> bool:
+        with self._cond:
+            return self._in_flight == key or bool(self._pending and self._pending[0] == key)
+
+    def error(self, key: str) -> Optional[str]:
+        with self._cond:
+            return self._errors.get(key)
+
+    def wait(self, key: str, timeout: float) -> Optional[str]:
+        """Block until `key` is rendered (or failed / timed out); returns the cached SVG if any."""
+        deadline = time.time() + timeout
+        with self._cond:
+            while self._in_flight == key or (self._pending and self._pending[0] == key):
+                left = deadline - time.time()
+                if left <= 0:
+                    break
+                self._cond.wait(left)
+        return CACHE.get_svg(key)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.debounce_s)
+            with self._cond:
+                job, self._pending = self._pending, None
+                if job is None:
+                    self._thread = None
+                    return
+                self._in_flight = job[0]
+            key, produce = job
+            try:
+                CACHE.get_or_create_svg(key, produce)
+            except Exception as e:
+                with self._cond:
+                    self._errors[key] = str(e)
+            with self._cond:
+                self._in_flight = None
+                self._cond.notify_all()
+
+def _preview_worker() -> PreviewWorker:
+    if "avatar_preview_worker" not in st.session_state:
+        st.session_state["avatar_preview_worker"] = PreviewWorker()
+    return st.session_state["avatar_preview_worker"]
+
+def _show_svg(svg: str) -> None:
+    b64 = base64.b64encode(svg.encode("utf-8")).decode()
+    st.markdown(f'<img src="data:image/svg+xml;base64,{b64}" width="256">', unsafe_allow_html=True)
+
+def _preview_placeholder() -> None:
+    st.markdown(
+        "<div style='width:256px;height:256px;border-radius:16px;background:#f2f5f9;display:flex;"
+        "align-items:center;justify-content:center;color:#8a94a6;font-size:14px;'>Rendering preview…</div>",
+        unsafe_allow_html=True,
+    )
+
+@st.fragment(run_every=PREVIEW_POLL_S)
+def _pending_preview(key: str) -> None:
+    """Re-runs on its own (not the whole page) until the worker has the preview."""
+    svg = CACHE.get_svg(key)
+    if svg is not None:
+        _show_svg(svg)
+    elif _preview_worker().error(key):
+        st.error(f"Preview failed: {_preview_worker().error(key)}")
+    else:
+        _preview_placeholder()
+
 # ---------- UI ----------
 HUMAN_STYLES = [
     "adventurer",
@@ -101,7 +210,7 @@ OPTION_VALUES = {
 }
 
 def dicebear_ui(email_hint: Optional[str]) -> dict | None:
-    st.write("**Generate a human-style avatar** (DiceBear).")
+    st.write("**Generate a human-style avatar** (DiceBear-style).")
 
     style = st.selectbox("Style", HUMAN_STYLES, index=0)
 
@@ -143,37 +252,46 @@ def dicebear_ui(email_hint: Optional[str]) -> dict | None:
         if lock_access and params.get("accessories") and params["accessories"] != "none":
             params["accessoriesProbability"] = "100"
 
-    # Preview
-    try:
-        svg_preview = _fetch_with_backoff(style, seed, params)
-        b64 = base64.b64encode(svg_preview.encode("utf-8")).decode()
-        st.markdown(f'<img src="data:image/svg+xml;base64,{b64}" width="256">', unsafe_allow_html=True)
-    except Exception as e:
-        st.error(f"Preview failed: {e}")
+    # Preview (content-addressed: each style/seed/params combination is rendered once).
+    # Local renders take well under a millisecond and run inline; remote fetches
+    # go to the session's background worker and show a placeholder meanwhile.
+    renderer = _renderer_for(style)
+    key = avatar_key(style, seed, params, renderer)
+    produce = lambda: _render_svg(style, seed, dict(params))
+    svg_preview = CACHE.get_svg(key)
+    if svg_preview is None and renderer == "local":
+        try:
+            svg_preview = CACHE.get_or_create_svg(key, produce)
+        except Exception as e:
+            st.error(f"Preview failed: {e}")
+    if svg_preview is not None:
+        _show_svg(svg_preview)
+    elif renderer != "local":
+        _preview_worker().request(key, produce)
+        _pending_preview(key)
 
     # Save
     if st.button("💾 Save avatar", type="primary"):
         try:
-            svg = _fetch_with_backoff(style, seed, params)
+            # reuse the preview: wait for an in-flight render instead of fetching it twice
+            svg = CACHE.get_svg(key) or (_preview_worker().wait(key, timeout=30) if renderer != "local" else None)
+            svg = svg or CACHE.get_or_create_svg(key, produce)
             svg_path = avatar_path_for_current_user(email_hint)
             svg_path.write_text(svg, encoding="utf-8")
 
-            png_path = None
-            try:
-                import cairosvg
-                png_path = str(avatar_png_path_for_current_user(email_hint))
-                cairosvg.svg2png(bytestring=svg.encode("utf-8"), write_to=png_path,
-                                 output_width=512, output_height=512)
-            except Exception:
-                pass
+            # PNGs (512 for the profile, 64 for chat bubbles) are rendered once into the cache
+            pngs = CACHE.render_all(key)
+            png_path = str(pngs[FULL_SIZE]) if pngs.get(FULL_SIZE) else None
 
             cfg = {
                 "mode": "dicebear",
+                "renderer": renderer,
                 "style": style,
                 "seed": seed,
                 "radius": 0,
                 "size": 512,
                 "params": params,
+                "cache_key": key,
             }
             st.session_state["avatar_saved_paths"] = {"svg": str(svg_path), "png": png_path}
             st.session_state["avatar_config"] = cfg
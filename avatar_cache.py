@@ -0,0 +1,170 @@
+# avatar_cache.py
+from __future__ import annotations
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+# ---------- Storage ----------
+# files/avatars/cache/<key>.svg and <key>_<size>.png, where key = sha256 of the
+# avatar's inputs (style + seed + params + renderer). Same inputs → same files, so every
+# avatar is fetched and rasterised once and served from disk/memory after that.
+CACHE_DIR = Path("files/avatars/cache")
+PNG_SIZES = (64, 512)
+THUMB_SIZE = 64    # chat bubbles
+FULL_SIZE = 512    # saved profile PNG
+MEMORY_ITEMS = 128
+
+_raster_ok: Optional[bool] = None  # cairosvg importable? (checked once)
+
+
+def _canonical_params(params: Optional[Dict[str, str]]) -> Dict[str, str]:
+    # mirror the DiceBear URL builder: empty / "none" values are not sent
+    return {k: str(v) for k, v in sorted((params or {}).items()) if v and v != "none"}
+
+
+def avatar_key(style: str, seed: str, params: Optional[Dict[str, str]] = None, renderer: str = "dicebear") -> str:
+    blob = json.dumps({"style": style, "seed": seed, "params": _canonical_params(params), "renderer": renderer},
+                      sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:32]
+
+
+def key_for_config(cfg: Optional[dict]) -> Optional[str]:
+    """Key for a saved `avatar_config` (None for configs without style/seed)."""
+    if not cfg or not cfg.get("style") or not cfg.get("seed"):
+        return None
+    return avatar_key(cfg["style"], cfg["seed"], cfg.get("params"), cfg.get("renderer", "dicebear"))
+
+
+def key_for_svg(svg: str) -> str:
+    """Fallback key for an SVG with no known inputs (old profiles)."""
+    return "svg-" + hashlib.sha256(svg.encode("utf-8")).hexdigest()[:28]
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _rasteriser():
+    global _raster_ok
+    if _raster_ok is False:
+        return None
+    try:
+        import cairosvg  # optional dependency
+        _raster_ok = True
+        return cairosvg
+    except Exception:
+        _raster_ok = False
+        return None
+
+
+class AvatarCache:
+    """SVG text in a small in-memory LRU, SVG + PNG files on disk, keyed by avatar_key()."""
+
+    def __init__(self, root: Path = CACHE_DIR, memory_items: int = MEMORY_ITEMS):
+        self.root = Path(root)
+        self.memory_items = memory_items
+        self._svgs: "OrderedDict[str, str]" = OrderedDict()
+        self._pngs: Dict[Tuple[str, int], Path] = {}
+        self._lock = threading.Lock()
+
+    # ---------- paths ----------
+    def svg_path(self, key: str) -> Path:
+        return self.root / f"{key}.svg"
+
+    def png_path(self, key: str, size: int) -> Path:
+        return self.root / f"{key}_{size}.png"
+
+    # ---------- SVG ----------
+    def get_svg(self, key: str) -> Optional[str]:
+        with self._lock:
+            svg = self._svgs.get(key)
+            if svg is not None:
+                self._svgs.move_to_end(key)
+                return svg
+        try:
+            svg = self.svg_path(key).read_text(encoding="utf-8")
+        except OSError:
+            return None
+        self._remember(key, svg)
+        return svg
+
+    def put_svg(self, key: str, svg: str) -> Path:
+        path = self.svg_path(key)
+        if not path.exists():
+            self.root.mkdir(parents=True, exist_ok=True)
+            _write_atomic(path, svg.encode("utf-8"))
+        self._remember(key, svg)
+        return path
+
+    def get_or_create_svg(self, key: str, produce: Callable[[], str]) -> str:
+        """Cached SVG for `key`, calling `produce()` (e.g. a DiceBear fetch) only on a miss."""
+        svg = self.get_svg(key)
+        if svg is None:
+            svg = produce()
+            self.put_svg(key, svg)
+        return svg
+
+    def _remember(self, key: str, svg: str) -> None:
+        with self._lock:
+            self._svgs[key] = svg
+            self._svgs.move_to_end(key)
+            while len(self._svgs) > self.memory_items:
+                self._svgs.popitem(last=False)
+
+    # ---------- PNG ----------
+    def cached_png(self, key: str, size: int = THUMB_SIZE) -> Optional[Path]:
+        """PNG already rendered (or found) by this process; no disk or SVG work."""
+        return self._pngs.get((key, size))
+
+    def png(self, key: str, size: int = THUMB_SIZE) -> Optional[Path]:
+        """PNG at `size`px, rendered from the cached SVG on first use; None if it can't be rendered."""
+        hit = self.cached_png(key, size)
+        if hit is not None:
+            return hit
+        path = self.png_path(key, size)
+        if not path.exists():
+            svg = self.get_svg(key)
+            cairosvg = _rasteriser()
+            if svg is None or cairosvg is None:
+                return None
+            try:
+                data = cairosvg.svg2png(bytestring=svg.encode("utf-8"), output_width=size, output_height=size)
+            except Exception:
+                return None
+            self.root.mkdir(parents=True, exist_ok=True)
+            _write_atomic(path, data)
+        self._pngs[(key, size)] = path
+        return path
+
+    def render_all(self, key: str, sizes=PNG_SIZES) -> Dict[int, Optional[Path]]:
+        return {s: self.png(key, s) for s in sizes}
+
+
+CACHE = AvatarCache()
+
+
+def thumbnail_path(cfg: Optional[dict], svg_path: Optional[str], size: int = THUMB_SIZE) -> Optional[Path]:
+    """
+    Small PNG for a saved avatar. Uses the config's key when there is one and
+    seeds the cache from the user's SVG file if the cache doesn't have it yet.
+    """
+    key = key_for_config(cfg)
+    hit = CACHE.cached_png(key, size) if key else None
+    if hit is not None:
+        return hit
+    if key is None or CACHE.get_svg(key) is None:
+        if not svg_path or not os.path.exists(svg_path):
+            return None
+        try:
+            svg = Path(svg_path).read_text(encoding="utf-8")
+        except OSError:
+            return None
+        key = key or key_for_svg(svg)
+        CACHE.put_svg(key, svg)
+    return CACHE.png(key, size)
@@ -0,0 +1,347 @@
+# avatar_local.py
+"""
+Offline avatar renderer for the two human styles we offer ("adventurer" and
+"personas"). It takes the same option names as the DiceBear API, reads the
+option lists from bundled schemas in files/avatar_schemas/, and composes an
+SVG from simple vector parts, so a preview costs well under a millisecond
+and needs no network.
+
+The artwork is our own and only approximates DiceBear's look. The seed drives
+every choice the user leaves open, so the same style + seed + params always
+gives the same SVG, which keeps the avatar cache keys stable.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import random
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+SCHEMA_DIR = Path("files/avatar_schemas")
+LOCAL_STYLES = ("adventurer", "personas")
+SIZE = 512
+
+
+# ---------- Schema ----------
+@lru_cache(maxsize=None)
+def load_schema(style: str) -> Optional[dict]:
+    try:
+        return json.loads((SCHEMA_DIR / f"{style}.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _enum(schema: dict, key: str) -> List[str]:
+    prop = (schema.get("properties") or {}).get(key) or {}
+    return list((prop.get("items") or {}).get("enum") or prop.get("enum") or [])
+
+
+def _defaults(schema: dict, key: str) -> List[str]:
+    return list(((schema.get("properties") or {}).get(key) or {}).get("default") or [])
+
+
+def _prob(schema: dict, params: Dict[str, str], key: str) -> int:
+    raw = params.get(f"{key}Probability")
+    if raw not in (None, ""):
+        try:
+            return max(0, min(100, int(float(raw))))
+        except ValueError:
+            pass
+    return int(((schema.get("properties") or {}).get(f"{key}Probability") or {}).get("default", 100))
+
+
+class _Picker:
+    """Seeded choices: an explicit param wins, otherwise the seed decides."""
+
+    def __init__(self, style: str, seed: str, schema: dict, params: Dict[str, str]):
+        digest = hashlib.sha256(f"{style}:{seed}".encode("utf-8")).digest()
+        self.rng = random.Random(int.from_bytes(digest[:8], "big"))
+        self.schema = schema
+        self.params = {k: v for k, v in (params or {}).items() if v not in (None, "")}
+
+    def variant(self, key: str) -> Optional[str]:
+        options = _enum(self.schema, key)
+        roll = self.rng.choice(options) if options else None  # always draw, so picks stay stable
+        v = self.params.get(key)
+        if v == "none":
+            return None
+        return v if v in options else roll
+
+    def color(self, key: str, fallback: str) -> str:
+        palette = _defaults(self.schema, key) or [fallback]
+        roll = self.rng.choice(palette)
+        v = str(self.params.get(key, "")).lstrip("#")
+        ok = len(v) == 6 and all(c in "0123456789abcdefABCDEF" for c in v)
+        return "#" + (v if ok else roll)
+
+    def chance(self, key: str) -> bool:
+        roll = self.rng.random() * 100
+        return roll < _prob(self.schema, self.params, key)
+
+    def optional(self, key: str) -> Optional[str]:
+        """A variant gated by `<key>Probability`; both draws happen either way."""
+        v = self.variant(key)
+        return v if self.chance(key) else None
+
+
+def _index(variant: Optional[str]) -> int:
+    digits = "".join(c for c in (variant or "") if c.isdigit())
+    return int(digits) if digits else sum(map(ord, variant or ""))
+
+
+def _shade(hex_color: str, factor: float) -> str:
+    h = hex_color.lstrip("#")
+    r, g, b = (int(h[i:i + 2], 16) for i in (0, 2, 4))
+    return "#%02x%02x%02x" % tuple(max(0, min(255, int(c * factor))) for c in (r, g, b))
+
+
+# ---------- Parts (100×100 canvas) ----------
+INK = "#262e33"
+
+
+def _eyes(kind: str, n: int) -> str:
+    lx, rx, y = 41, 59, 47
+    if kind == "closed":
+        return (f'<path d="M{lx-4} {y} q4 3 8 0M{rx-4} {y} q4 3 8 0" stroke="{INK}" '
+                f'stroke-width="1.6" fill="none" stroke-linecap="round"/>')
+    if kind == "happy":
+        return (f'<path d="M{lx-4} {y+1} q4 -4 8 0M{rx-4} {y+1} q4 -4 8 0" stroke="{INK}" '
+                f'stroke-width="1.6" fill="none" stroke-linecap="round"/>')
+    if kind == "wink":
+        return (f'<circle cx="{lx}" cy="{y}" r="2.4" fill="{INK}"/>'
+                f'<path d="M{rx-4} {y} q4 3 8 0" stroke="{INK}" stroke-width="1.6" fill="none" stroke-linecap="round"/>')
+    if kind == "sunglasses":
+        return (f'<rect x="{lx-7}" y="{y-4}" width="14" height="8" rx="3" fill="{INK}"/>'
+                f'<rect x="{rx-7}" y="{y-4}" width="14" height="8" rx="3" fill="{INK}"/>'
+                f'<path d="M{lx+7} {y-1} h{rx-lx-14}" stroke="{INK}" stroke-width="1.4"/>')
+    rx_, ry_ = (2.2 + (n % 3) * 0.5, 2.6 + (n % 4) * 0.4)
+    white = n % 2 == 0
+    out = ""
+    for x in (lx, rx):
+        if white:
+            out += f'<ellipse cx="{x}" cy="{y}" rx="{rx_+1.6}" ry="{ry_+1.2}" fill="#fff"/>'
+        out += f'<ellipse cx="{x}" cy="{y}" rx="{rx_}" ry="{ry_}" fill="{INK}"/>'
+        out += f'<circle cx="{x+0.9}" cy="{y-1}" r="0.8" fill="#fff"/>'
+    return out
+
+
+def _eyebrows(n: int, color: str) -> str:
+    tilt = (n % 5 - 2) * 1.2
+    arch = -1.5 - (n % 3)
+    w = 1.6 + (n % 2) * 0.8
+    return (f'<path d="M35 {40+tilt} q6 {arch} 12 {-tilt}M53 {40} q6 {arch} 12 {tilt}" stroke="{color}" '
+            f'stroke-width="{w}" fill="none" stroke-linecap="round"/>')
+
+
+def _mouth(kind: str, n: int) -> str:
+    if kind == "frown":
+        return f'<path d="M44 66 q6 -4 12 0" stroke="{INK}" stroke-width="1.8" fill="none" stroke-linecap="round"/>'
+    if kind == "surprise":
+        return f'<ellipse cx="50" cy="65" rx="3" ry="4" fill="{INK}"/>'
+    if kind == "smirk":
+        return f'<path d="M44 64 q7 3 12 -2" stroke="{INK}" stroke-width="1.8" fill="none" stroke-linecap="round"/>'
+    if kind == "lips":
+        return '<path d="M44 64 q6 -3 12 0 q-6 5 -12 0z" fill="#c2455e"/>'
+    if kind == "pacifier":
+        return '<circle cx="50" cy="65" r="4" fill="#7ec8e3"/><circle cx="50" cy="65" r="1.6" fill="#fff"/>'
+    if kind == "open" or (kind == "smile" and n % 4 == 3):
+        return ('<path d="M43 62 q7 9 14 0z" fill="#6b1d1d"/>'
+                '<path d="M45 62.5 h10 q-5 2.4 -10 0z" fill="#fff"/>')
+    width = 10 + (n % 5) * 1.5
+    depth = 3 + (n % 3) * 1.5
+    return (f'<path d="M{50-width/2} 63 q{width/2} {depth} {width} 0" stroke="{INK}" stroke-width="1.8" '
+            f'fill="none" stroke-linecap="round"/>')
+
+
+def _nose(kind: str, skin: str) -> str:
+    dark = _shade(skin, 0.8)
+    if kind == "wrinkles":
+        return (f'<path d="M48 52 q2 4 4 0" stroke="{dark}" stroke-width="1.4" fill="none" stroke-linecap="round"/>'
+                f'<path d="M44 56 l-2 1M56 56 l2 1" stroke="{dark}" stroke-width="0.8"/>')
+    r = 3 if kind == "mediumRound" else 2
+    return f'<ellipse cx="50" cy="55" rx="{r}" ry="{r*0.8}" fill="{dark}"/>'
+
+
+def _glasses(n: int) -> str:
+    if n % 2:
+        lens = '<circle cx="{x}" cy="47" r="6.5" fill="none" stroke="{c}" stroke-width="1.6"/>'
+    else:
+        lens = '<rect x="{xl}" y="41.5" width="13" height="11" rx="2.5" fill="none" stroke="{c}" stroke-width="1.6"/>'
+    c = ("#1f2937", "#7c2d12", "#1d4ed8", "#be185d", "#374151")[n % 5]
+    out = "".join(lens.format(x=x, xl=x - 6.5, c=c) for x in (41, 59))
+    return out + f'<path d="M47.5 47 h5" stroke="{c}" stroke-width="1.6"/>'
+
+
+def _hair_back(kind: str, color: str) -> str:
+    """Parts of the hair that sit behind the head (long hair, buns)."""
+    if kind in ("long", "extraLong", "bobCut", "bobBangs", "pigtails"):
+        bottom = {"extraLong": 96, "long": 84, "pigtails": 70}.get(kind, 66)
+        out = f'<path d="M26 44 Q24 {bottom} 34 {bottom} L66 {bottom} Q76 {bottom} 74 44 Z" fill="{color}"/>'
+        if kind == "pigtails":
+            out += f'<circle cx="22" cy="58" r="7" fill="{color}"/><circle cx="78" cy="58" r="7" fill="{color}"/>'
+        return out
+    if kind in ("bun", "curlyBun", "straightBun", "bunUndercut"):
+        return f'<circle cx="50" cy="17" r="9" fill="{color}"/>'
+    return ""
+
+
+def _hair_front(kind: str, n: int, color: str) -> str:
+    if kind in ("bald", ""):
+        return ""
+    if kind == "balding":
+        return (f'<path d="M27 46 q-1 -8 4 -12 M73 46 q1 -8 -4 -12" stroke="{color}" stroke-width="4" '
+                f'fill="none" stroke-linecap="round"/>')
+    if kind in ("buzzcut", "fade"):
+        op = 0.55 if kind == "buzzcut" else 0.8
+        return f'<path d="M27 42 Q28 19 50 19 Q72 19 73 42 Q62 30 50 30 Q38 30 27 42Z" fill="{color}" opacity="{op}"/>'
+    if kind == "mohawk":
+        return f'<path d="M45 34 Q44 10 50 8 Q56 10 55 34 Z" fill="{color}"/>'
+    if kind in ("beanie", "cap"):
+        hat = ("#e24553", "#456dff", "#6dbb58", "#f3b63a")[n % 4]
+        out = f'<path d="M25 40 Q26 15 50 15 Q74 15 75 40 Z" fill="{hat}"/>'
+        if kind == "cap":
+            out += f'<path d="M50 38 Q70 35 82 40 Q70 43 50 41Z" fill="{_shade(hat, 0.75)}"/>'
+        else:
+            out += f'<rect x="24" y="36" width="52" height="6" rx="3" fill="{_shade(hat, 0.8)}"/>'
+        return out
+    # generic cap of hair with a fringe that varies with the variant number
+    fringe_y = 30 + (n % 4) * 2
+    part = 38 + (n % 5) * 6
+    path = (f"M25 46 Q24 17 50 17 Q76 17 75 46 Q72 {fringe_y} {part} {fringe_y-2} "
+            f"Q{part-8} {fringe_y+6} 40 {fringe_y+1} Q30 {fringe_y+4} 25 46Z")
+    out = f'<path d="{path}" fill="{color}"/>'
+    if kind in ("curly", "curlyHighTop", "curlyBun"):
+        top = 12 if kind == "curlyHighTop" else 19
+        out += "".join(f'<circle cx="{x}" cy="{top + abs(50 - x) * 0.35}" r="6" fill="{color}"/>'
+                       for x in range(28, 74, 8))
+    if kind in ("shortComboverChops", "sideShave"):
+        out += f'<rect x="25" y="44" width="4" height="10" rx="2" fill="{color}"/>'
+        out += f'<rect x="71" y="44" width="4" height="10" rx="2" fill="{color}"/>'
+    return out
+
+
+def _facial_hair(kind: str, color: str) -> str:
+    if kind in ("beardMustache", "pyramid"):
+        return (f'<path d="M30 54 Q32 80 50 82 Q68 80 70 54 Q66 68 58 66 Q50 62 42 66 Q34 68 30 54Z" fill="{color}"/>'
+                f'<path d="M42 60 q8 -4 16 0 q-8 3 -16 0z" fill="{color}"/>')
+    if kind == "walrus" or kind == "mustache":
+        return f'<path d="M41 61 q9 -6 18 0 q-9 4 -18 0z" fill="{color}"/>'
+    if kind in ("goatee", "soulPatch"):
+        h = 8 if kind == "goatee" else 4
+        return f'<path d="M46 69 h8 l-2 {h} h-4z" fill="{color}"/>'
+    if kind == "shadow":
+        return f'<path d="M30 54 Q32 80 50 82 Q68 80 70 54 Q60 74 50 74 Q40 74 30 54Z" fill="{color}" opacity="0.25"/>'
+    return ""
+
+
+def _features(kind: str, skin: str) -> str:
+    if kind == "blush":
+        return '<ellipse cx="36" cy="56" rx="4" ry="2.4" fill="#f49a9a" opacity="0.6"/><ellipse cx="64" cy="56" rx="4" ry="2.4" fill="#f49a9a" opacity="0.6"/>'
+    if kind == "freckles":
+        dot = _shade(skin, 0.7)
+        return "".join(f'<circle cx="{x}" cy="{y}" r="0.7" fill="{dot}"/>'
+                       for x, y in ((36, 54), (39, 56), (42, 54), (58, 54), (61, 56), (64, 54)))
+    if kind == "birthmark":
+        return f'<circle cx="62" cy="60" r="1" fill="{_shade(skin, 0.55)}"/>'
+    if kind == "mustache":
+        return _facial_hair("mustache", INK)
+    return ""
+
+
+def _body(shape: str, clothing: str, skin: str) -> str:
+    neck = f'<rect x="44" y="66" width="12" height="14" fill="{_shade(skin, 0.9)}"/>'
+    w = {"small": 26, "squared": 36, "rounded": 34, "checkered": 34}.get(shape, 34)
+    r = 4 if shape == "squared" else 14
+    out = neck + f'<rect x="{50-w}" y="78" width="{2*w}" height="30" rx="{r}" fill="{clothing}"/>'
+    if shape == "checkered":
+        dark = _shade(clothing, 0.8)
+        out += "".join(f'<rect x="{x}" y="{y}" width="6" height="6" fill="{dark}"/>'
+                       for x in range(18, 82, 12) for y in (84, 96))
+    return out
+
+
+# ---------- Styles ----------
+def _adventurer(pick: _Picker) -> str:
+    skin = pick.color("skinColor", "f2d3b1")
+    hair_color = pick.color("hairColor", "6a4e35")
+    hair = pick.optional("hair")
+    eyes = pick.variant("eyes")
+    brows = pick.variant("eyebrows")
+    mouth = pick.variant("mouth")
+    glasses = pick.optional("glasses")
+    earrings = pick.optional("earrings")
+    feature = pick.optional("features")
+
+    hair_kind = "long" if (hair or "").startswith("long") else ("short" if hair else "bald")
+    n_eyes = _index(eyes)
+    eye_kind = ("closed" if n_eyes % 9 == 0 else "happy" if n_eyes % 7 == 0 else "open")
+    m = _index(mouth)
+    mouth_kind = ("open" if m % 6 == 0 else "smirk" if m % 7 == 0 else "surprise" if m % 11 == 0 else "smile")
+
+    parts = [
+        _hair_back(hair_kind, hair_color),
+        _body("rounded", "#5bc0de", skin),
+        f'<ellipse cx="26" cy="50" rx="4" ry="6" fill="{skin}"/><ellipse cx="74" cy="50" rx="4" ry="6" fill="{skin}"/>',
+        f'<ellipse cx="50" cy="46" rx="24" ry="27" fill="{skin}"/>',
+        _features(feature, skin) if feature else "",
+        _eyes(eye_kind, n_eyes),
+        _eyebrows(_index(brows), _shade(hair_color, 0.9)),
+        _nose("smallRound", skin),
+        _mouth(mouth_kind, m),
+        _hair_front(hair_kind, _index(hair), hair_color),
+        _glasses(_index(glasses)) if glasses else "",
+    ]
+    if earrings:
+        color = ("#f3b63a", "#d1d5db", "#e24553")[_index(earrings) % 3]
+        parts.append(f'<circle cx="25" cy="58" r="1.8" fill="{color}"/><circle cx="75" cy="58" r="1.8" fill="{color}"/>')
+    return "".join(parts)
+
+
+_PERSONA_EYES = {"happy": "happy", "sleep": "closed", "wink": "wink", "sunglasses": "sunglasses"}
+
+
+def _personas(pick: _Picker) -> str:
+    skin = pick.color("skinColor", "e5a07e")
+    hair_color = pick.color("hairColor", "362c47")
+    clothing = pick.color("clothingColor", "456dff")
+    body = pick.variant("body") or "rounded"
+    eyes = pick.variant("eyes") or "open"
+    hair = pick.variant("hair") or "bald"
+    mouth = pick.variant("mouth") or "smile"
+    nose = pick.variant("nose") or "smallRound"
+    facial = pick.optional("facialHair")
+
+    parts = [
+        _hair_back(hair, hair_color),
+        _body(body, clothing, skin),
+        f'<rect x="27" y="22" width="46" height="52" rx="22" fill="{skin}"/>',
+        _eyes(_PERSONA_EYES.get(eyes, "open"), 1),
+        _glasses(2) if eyes == "glasses" else "",
+        _nose(nose, skin),
+        _facial_hair(facial, hair_color) if facial else "",
+        _mouth("open" if mouth == "bigSmile" else mouth, 0),
+        _hair_front(hair, _index(hair), hair_color),
+    ]
+    return "".join(parts)
+
+
+_RENDERERS: Dict[str, Callable[[_Picker], str]] = {
+    "adventurer": _adventurer,
+    "personas": _personas,
+}
+
+
+def supports(style: str) -> bool:
+    return style in _RENDERERS and load_schema(style) is not None
+
+
+def render_svg(style: str, seed: str, params: Optional[Dict[str, str]] = None, size: int = SIZE) -> str:
+    """SVG avatar for `style`/`seed`/`params` (DiceBear option names). Raises ValueError for unknown styles."""
+    if not supports(style):
+        raise ValueError(f"No local renderer for avatar style '{style}'")
+    pick = _Picker(style, seed, load_schema(style), params or {})
+    body = _RENDERERS[style](pick)
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100" width="{size}" height="{size}">'
+            f'<metadata>style={style}; renderer=local</metadata>'
+            f'<clipPath id="c"><rect width="100" height="100"/></clipPath><g clip-path="url(#c)">{body}</g></svg>')
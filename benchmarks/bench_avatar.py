@@ -0,0 +1,28 @@
+# benchmarks/bench_avatar.py
+"""DiceBear SVG → PNG rasterisation (the step behind every saved avatar and chat bubble)."""
+from __future__ import annotations
+
+import pytest
+
+try:
+    import cairosvg
+except Exception:  # missing wheel or missing libcairo
+    cairosvg = None
+
+pytestmark = pytest.mark.skipif(cairosvg is None, reason="cairosvg/libcairo not available")
+
+
+@pytest.mark.parametrize("size", [64, 512])
+def bench_svg_to_png(benchmark, avatar_svg, size):
+    png = benchmark(cairosvg.svg2png, bytestring=avatar_svg, output_width=size, output_height=size)
+    assert png[:8] == b"\x89PNG\r\n\x1a\n"
+
+
+def bench_thumbnail_cached(benchmark, avatar_svg, tmp_path):
+    """What a chat rerun pays once the 64px thumbnail exists."""
+    from avatar_cache import thumbnail_path
+    svg_file = tmp_path / "bench_avatar.svg"
+    svg_file.write_bytes(avatar_svg)
+    cfg = {"style": "adventurer", "seed": "bench", "params": {"hairColor": "000000"}}
+    assert thumbnail_path(cfg, str(svg_file)) is not None
+    benchmark(thumbnail_path, cfg, str(svg_file))
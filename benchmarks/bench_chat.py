@@ -0,0 +1,51 @@
+# benchmarks/bench_chat.py
+"""Per-turn chat work that runs outside the LLM: prompt building, file text, logging."""
+from __future__ import annotations
+import io
+
+import pytest
+import streamlit as st
+
+from conftest import BENCH_EMAIL
+
+
+@pytest.fixture(scope="module")
+def chatbot():
+    import chatbot  # runs the profile guard against the bench workspace
+    return chatbot
+
+
+@pytest.mark.parametrize("location", [
+    {"country": "Dominica", "region": "Saint George", "city": "Roseau", "is_eccu": True},
+    {"country": "Canada", "region": "Ontario", "city": "Toronto", "is_eccu": False},
+    {},
+], ids=["eccu", "global", "unknown"])
+def bench_build_instructions(benchmark, bench_profile, location):
+    from agent import build_instructions
+    st.session_state["user_profile"] = bench_profile
+    text = benchmark(build_instructions, location)
+    assert "{" not in text[:50]
+
+
+@pytest.mark.parametrize("fixture_name", ["pdf_small", "pdf_large"], ids=["2p", "40p"])
+def bench_extract_pdf_text(benchmark, chatbot, request, fixture_name):
+    raw = request.getfixturevalue(fixture_name)
+    text = benchmark(lambda: chatbot.extract_pdf_text(io.BytesIO(raw)))
+    assert "balance" in text
+
+
+def bench_log_message_enqueue(benchmark):
+    from setup_wizard import log_message
+    benchmark(log_message, "user", "How do I start an emergency fund on EC$1,800 a month?", email=BENCH_EMAIL)
+
+
+def bench_log_message_durable(benchmark):
+    """Enqueue plus a writer flush: the cost until the line is on disk."""
+    from log_writer import get_writer
+    from setup_wizard import log_message
+
+    def run():
+        log_message("assistant", "Start with EC$50 a week into a separate account.", email=BENCH_EMAIL)
+        get_writer().flush()
+
+    benchmark(run)
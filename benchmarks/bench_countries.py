@@ -0,0 +1,58 @@
+# benchmarks/bench_countries.py
+"""Country and currency registries vs the per-call pycountry paths they replaced."""
+from __future__ import annotations
+
+import pytest
+
+import countries
+import currencies
+
+try:
+    import pycountry
+except Exception:
+    pycountry = None
+
+# what profiles, IP providers and the chat actually send
+NAMES = ["St. Lucia", "Antigua & Barbuda", "Saint Vincent and the Grenadines", "Jamaica",
+         "United States", "Germany", "DM", "Trinidad & Tobago"]
+
+
+def _registry_iso2s():
+    return [countries.iso2(n) for n in NAMES]
+
+
+def _pycountry_iso2s():
+    out = []
+    for n in NAMES:
+        try:
+            out.append(pycountry.countries.lookup(countries.canonical(n)).alpha_2)
+        except LookupError:
+            out.append(None)
+    return out
+
+
+def bench_registry_lookup(benchmark):
+    assert benchmark(_registry_iso2s) == ["LC", "AG", "VC", "JM", "US", "DE", "DM", "TT"]
+
+
+@pytest.mark.skipif(pycountry is None, reason="pycountry not installed")
+def bench_pycountry_lookup(benchmark):
+    benchmark(_pycountry_iso2s)
+
+
+def _pycountry_picker():
+    world = sorted({c.alpha_3 for c in pycountry.currencies if hasattr(c, "alpha_3") and len(c.alpha_3) == 3})
+    for bad in ("XTS", "XXX"):
+        if bad in world:
+            world.remove(bad)
+    return world, world.index("XCD")
+
+
+def bench_currency_picker_registry(benchmark):
+    codes, idx = benchmark(lambda: (currencies.CODES, currencies.index_of("XCD")))
+    assert codes[idx] == "XCD" and currencies.is_valid("XCD") and not currencies.is_valid("XTS")
+
+
+@pytest.mark.skipif(pycountry is None, reason="pycountry not installed")
+def bench_currency_picker_pycountry(benchmark):
+    benchmark(_pycountry_picker)
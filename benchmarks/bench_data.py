@@ -0,0 +1,50 @@
+# benchmarks/bench_data.py
+"""JSON-backed catalogs: side hustles, quiz questions, investing advice and the leaderboard."""
+from __future__ import annotations
+
+import data_loaders
+from finance_quiz import load_questions, sort_leaderboard
+from small_hustles import get_random_side_job, load_side_hustles
+
+
+def bench_load_side_hustles_cold(benchmark):
+    items = benchmark.pedantic(load_side_hustles, setup=data_loaders.clear_cache, rounds=50)
+    assert items
+
+
+def bench_load_side_hustles_cached(benchmark):
+    load_side_hustles()
+    assert benchmark(load_side_hustles)
+
+
+def bench_get_random_side_job(benchmark):
+    load_side_hustles()
+    benchmark(get_random_side_job, remote_only=True, low_cost_only=True)
+
+
+def bench_load_questions_cold(benchmark):
+    qs = benchmark.pedantic(load_questions, setup=data_loaders.clear_cache, rounds=50)
+    assert qs
+
+
+def bench_load_questions_cached(benchmark):
+    load_questions()
+    assert benchmark(load_questions)
+
+
+def bench_leaderboard_sort(benchmark, synthetic_scores):
+    top = benchmark(sort_leaderboard, synthetic_scores, "Warm-up (10)")
+    assert top and all(r["category"] == "Warm-up (10)" for r in top)
+
+
+def bench_catalog_pick_multi_filter(benchmark):
+    from small_hustles import get_catalog
+    catalog = get_catalog()
+    pick = benchmark(catalog.pick, remote_only=True, skills=["marketing"], keyword="social")
+    assert pick is None or pick["remote"]
+
+
+def bench_investing_advice_alias(benchmark):
+    from save_invest import investing_advice
+    tips = benchmark(investing_advice, "Saint Kitts and Nevis", "adult", "invest")
+    assert tips and not tips[0].startswith("No data")
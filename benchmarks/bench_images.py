@@ -0,0 +1,27 @@
+# benchmarks/bench_images.py
+"""Per-turn image preparation: decode, EXIF-rotate, downsize and re-encode phone photos."""
+from __future__ import annotations
+import io
+
+import pytest
+
+from image_pipeline import MAX_SIDE, prepare_many
+
+
+@pytest.fixture(scope="module")
+def photos():
+    np = pytest.importorskip("numpy")
+    from PIL import Image
+    rng = np.random.default_rng(0)
+    out = []
+    for i in range(3):  # 12 MP JPEGs with some noise, roughly phone-camera sized
+        px = (np.linspace(0, 255, 4032)[None, :, None] + rng.normal(0, 20, (3024, 4032, 3))).clip(0, 255)
+        buf = io.BytesIO()
+        Image.fromarray(px.astype("uint8")).save(buf, "JPEG", quality=95)
+        out.append((f"photo{i}.jpg", buf.getvalue()))
+    return out
+
+
+def bench_prepare_three_photos(benchmark, photos):
+    prepared = benchmark.pedantic(prepare_many, args=(photos,), rounds=3, iterations=1)
+    assert len(prepared) == 3 and all(max(p.size) == MAX_SIDE and p.saved > 0 for p in prepared)
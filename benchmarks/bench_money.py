@@ -0,0 +1,46 @@
+# benchmarks/bench_money.py
+"""Budget generator and currency converter math."""
+from __future__ import annotations
+import random
+
+import pytest
+
+from budget_gen import budgeting_function
+from currency_converter import COMMON_PAIRS, SUPPORTED, _compute_deltas, _convert_amount
+
+EXPENSES = [
+    {"Category": "rent", "Amount": 900.0},
+    {"Category": "groceries", "Amount": 450.0},
+    {"Category": "transport", "Amount": 180.0},
+    {"Category": "phone", "Amount": 75.0},
+    {"Category": "utilities", "Amount": 160.0},
+    {"Category": "church", "Amount": 50.0},
+]
+
+RATES = {"USD": 1.0, "XCD": 2.7, "JMD": 156.4, "TTD": 6.78, "BBD": 2.0, "BSD": 1.0,
+         "HTG": 131.9, "CUP": 24.0, "DOP": 59.2, "EUR": 0.92, "GBP": 0.79}
+
+
+@pytest.mark.parametrize("income", [1500.0, 4000.0], ids=["shortfall", "surplus_chart"])
+def bench_budgeting_function(benchmark, income):
+    import matplotlib
+    matplotlib.use("Agg")
+    result = benchmark(budgeting_function, income, EXPENSES)
+    assert "summary" in result
+
+
+def bench_convert_amount_all_pairs(benchmark):
+    pairs = [(b, t) for b in SUPPORTED for t in SUPPORTED]
+
+    def run():
+        return [_convert_amount(125.0, b, t, RATES) for b, t in pairs]
+
+    out = benchmark(run)
+    assert len(out) == len(pairs)
+
+
+def bench_compute_deltas(benchmark):
+    rng = random.Random(1)
+    prev = {k: v * (1 + rng.uniform(-0.02, 0.02)) for k, v in RATES.items()}
+    out = benchmark(_compute_deltas, prev, RATES)
+    assert set(out) <= set(COMMON_PAIRS)
@@ -0,0 +1,45 @@
+# benchmarks/bench_quiz.py
+"""Quiz difficulty calibration (one batch over every answer) and adaptive next-question picks."""
+from __future__ import annotations
+
+import pytest
+
+import quiz_irt
+
+
+@pytest.fixture(scope="module")
+def answers():
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(1)
+    n_q, n_s, per = 50, 20_000, 10     # 200k answers: 20k quiz runs of 10 questions
+    b, theta = rng.normal(0, 1, n_q), rng.normal(0, 1, n_s)
+    s = np.repeat(np.arange(n_s), per)
+    q = np.concatenate([rng.choice(n_q, per, replace=False) for _ in range(n_s)])
+    y = rng.random(len(s)) < 1 / (1 + np.exp(b[q] - theta[s]))
+    return q + 1000, s, y, b
+
+
+def bench_rasch_fit_200k_answers(benchmark, answers):
+    np = pytest.importorskip("numpy")
+    q, s, y, b_true = answers
+    cal = benchmark.pedantic(quiz_irt.fit_rasch, args=(q, s, y), rounds=3, iterations=1)
+    assert np.corrcoef(cal.b, b_true)[0, 1] > 0.98
+
+
+def bench_adaptive_pick(benchmark):
+    questions = [{"question": f"Question {i}"} for i in range(5_000)]
+    idx = quiz_irt.DifficultyIndex(questions, {quiz_irt.question_id(q): (i % 100) / 25 - 2
+                                               for i, q in enumerate(questions)})
+    used = set(range(0, 5_000, 3))
+    assert benchmark(idx.pick, 0.37, used) is not None
+
+
+def bench_event_log_stats(benchmark, answers, tmp_path):
+    import quiz_events
+    q, s, y, _ = answers
+    log = quiz_events.EventLog(tmp_path / "answers.bin", buffer_records=4096)
+    for qid, sess, ok in zip(q.tolist(), s.tolist(), y.tolist()):
+        log.append(quiz_events.AnswerEvent(qid, 0, ok, 4000, sess, 0.0))
+    log.flush()
+    stats = benchmark(lambda: quiz_events.question_stats(quiz_events.read_events(log.path)))
+    assert int(stats.answers.sum()) == len(q)
@@ -0,0 +1,46 @@
+# benchmarks/bench_scam.py
+"""Local scam-phrase scan that runs on every chat turn (prompt + extracted file text)."""
+from __future__ import annotations
+
+from common_scams import check_text
+
+SMS = ("CONGRATULATIONS! You have won US$500,000 in the Caribbean lottery. Pay the processing fee "
+       "via Western Union within 24 hours to claim your prize.")
+CLEAN = "How should I budget my EC$2000 salary each month and still save for a laptop?"
+# ordinary questions that only use topic words from the lexicon
+BENIGN = (
+    "How much is the taxi fare from the airport? Is the driver paid cash only?",
+    "book a boat trip tour excursion for my family",
+    "budget for the rental deposit",
+    "You won't believe how high the ATM fee was",
+    "If you won't pay the credit card on time is there a late fee?",
+    "What is the processing fee for a passport?",
+)
+
+
+def bench_scam_scan_sms(benchmark):
+    assert benchmark(check_text, SMS)
+
+
+def bench_scam_scan_clean(benchmark):
+    assert not benchmark(check_text, CLEAN)
+
+
+def bench_scam_scan_benign_topics(benchmark):
+    reports = benchmark(lambda: [check_text(t) for t in BENIGN])
+    assert not any(reports), [r.summary() for r in reports]
+
+
+def bench_scam_scan_100kb(benchmark):
+    text = (CLEAN + " ") * (100_000 // (len(CLEAN) + 1)) + SMS
+    assert benchmark(check_text, text)
+
+
+def bench_blocklist_lookup(benchmark, tmp_path):
+    import scam_blocklist
+    # synthetic indicators, only to size a realistic filter (300k entries)
+    keys = [f"phone:1758{i:07d}" for i in range(300_000)]
+    path = tmp_path / "bench.bloom"
+    scam_blocklist.build(keys, path)
+    findings, available = benchmark(scam_blocklist.check_text, "WhatsApp +1 758 000 0042 or pay $quickcash", path)
+    assert available and findings[0].listed
@@ -0,0 +1,36 @@
+# benchmarks/bench_statement.py
+"""Local statement categorization: chunked CSV read → merchant keys → categories → monthly totals."""
+from __future__ import annotations
+import random
+
+import pytest
+
+from statement_engine import analyze_csv, budget_inputs
+
+DESCRIPTIONS = ("POS PURCHASE MASSY STORES #0231", "DIGICEL TOPUP REF 99812", "KFC ROSEAU", "RUBIS GAS STATION",
+                "NETFLIX.COM", "ATM WITHDRAWAL 0012", "LUCELEC BILL PMT", "WESTERN UNION 8812",
+                "MONTHLY SERVICE FEE", "CORNER SHOP 12", "AMAZON MKTPLACE")
+
+
+@pytest.fixture(scope="module")
+def statement_csv(tmp_path_factory):
+    # synthetic 100k-row, 3-year export; only the shape matters
+    rnd = random.Random(7)
+    path = tmp_path_factory.mktemp("statement") / "statement.csv"
+    lines = ["Date,Description,Amount"]
+    for i in range(100_000):
+        day, month, year = rnd.randint(1, 28), rnd.randint(1, 12), rnd.choice((2023, 2024, 2025))
+        if i % 50 == 0:
+            lines.append(f"{day:02d}/{month:02d}/{year},SALARY ACME LTD,{rnd.randint(3000, 6000)}")
+        else:
+            lines.append(f'{day:02d}/{month:02d}/{year},"{rnd.choice(DESCRIPTIONS)} {rnd.randint(1, 999)}",'
+                         f"-{rnd.uniform(5, 400):.2f}")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def bench_statement_100k_rows(benchmark, statement_csv):
+    summary = benchmark.pedantic(analyze_csv, args=(statement_csv,), rounds=3, iterations=1)
+    assert summary.rows == 100_000 and len(summary.months) == 36
+    income, expenses = budget_inputs(summary)
+    assert income > 0 and expenses
@@ -0,0 +1,144 @@
+# benchmarks/conftest.py
+"""
+Shared setup for the benchmark suite.
+
+The app modules read and write relative to the working directory (files/...),
+and chatbot.py runs the profile guard at import time, so the whole session
+runs inside a throwaway copy of files/ with a completed profile. Nothing a
+benchmark writes ever lands in the real data.
+"""
+from __future__ import annotations
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+BENCH_EMAIL = "bench@example.com"
+BENCH_PROFILE = {
+    "setup_complete": True, "name": "Bench", "role": "Student", "home_region": "ECCU",
+    "country": "Dominica", "base_currency": "XCD", "tone": "Friendly",
+    "goals": ["Budgeting", "Saving"], "email": BENCH_EMAIL, "allow_location": False, "is_eccu": True,
+}
+
+
+def pytest_configure(config):
+    if "bench_*.py" not in config.getini("python_files"):
+        return  # collected from a plain `pytest` run at the root: stay inert
+    work = Path(tempfile.mkdtemp(prefix="eccb-bench-"))
+    (work / "files").mkdir()
+    for name in ("questions.json", "side_huslte_options.json", "scores.json",
+                 "common_scams.json", "investing_advice.json", "scam_lexicon.json",
+                 "merchant_categories.json"):
+        if (ROOT / "files" / name).exists():
+            shutil.copy(ROOT / "files" / name, work / "files" / name)
+    shutil.copytree(ROOT / "files" / "avatars", work / "files" / "avatars")
+    (work / "files" / "user_profile.json").write_text(json.dumps(BENCH_PROFILE), encoding="utf-8")
+
+    # the storage path in pytest.ini is relative to the repo root; pin it before we leave
+    opt = config.option
+    if getattr(opt, "benchmark_storage", None) and "://" not in opt.benchmark_storage:
+        opt.benchmark_storage = str((ROOT / opt.benchmark_storage).resolve())
+
+    config._eccb_workdir = work
+    config._eccb_cwd = os.getcwd()
+    os.environ.setdefault("OPENROUTER_API_KEY", "bench-key")
+    os.environ.setdefault("OPENROUTER_MODEL", "bench/model")
+    os.environ["TURN_METRICS_PATH"] = str(work / "files" / "metrics" / "turns.jsonl")
+    os.chdir(work)
+
+
+def pytest_unconfigure(config):
+    work = getattr(config, "_eccb_workdir", None)
+    if work is None:
+        return
+    try:
+        from log_writer import get_writer
+        get_writer().flush()
+    except Exception:
+        pass
+    os.chdir(config._eccb_cwd)
+    shutil.rmtree(work, ignore_errors=True)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Synthetic inputs
+# ──────────────────────────────────────────────────────────────────────────────
+LOREM = ("Monthly statement for account ending 4821. Opening balance EC$ 2,450.00. "
+         "Grocery purchase Massy Stores 86.40. Digicel top up 25.00. Salary deposit 3,100.00. "
+         "Transfer to savings 400.00. LIAT ticket 512.75. Closing balance EC$ 4,525.85.").split()
+
+
+def make_pdf(pages: int, lines_per_page: int = 40, seed: int = 0) -> bytes:
+    """A valid text-only PDF (Helvetica, one content stream per page) built by hand."""
+    rng = random.Random(seed)
+    objs = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the kids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for _ in range(pages):
+        lines = [" ".join(rng.choice(LOREM) for _ in range(10)) for _ in range(lines_per_page)]
+        body = "BT /F1 10 Tf 12 TL 40 800 Td " + " ".join(f"({ln}) '" for ln in lines) + " ET"
+        stream = body.encode("latin-1")
+        objs.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objs)
+        objs.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                    b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id)
+        kids.append(len(objs))
+    objs[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (" ".join(f"{k} 0 R" for k in kids).encode(), pages)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objs, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (i, obj)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1)
+    out += b"".join(b"%010d 00000 n \n" % o for o in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objs) + 1, xref)
+    return bytes(out)
+
+
+@pytest.fixture(scope="session")
+def pdf_small() -> bytes:
+    return make_pdf(pages=2)
+
+
+@pytest.fixture(scope="session")
+def pdf_large() -> bytes:
+    return make_pdf(pages=40)
+
+
+@pytest.fixture(scope="session")
+def avatar_svg() -> bytes:
+    return (ROOT / "files" / "avatars" / "guest_avatar.svg").read_bytes()
+
+
+@pytest.fixture(scope="session")
+def synthetic_scores():
+    """~5k leaderboard rows across every quiz category."""
+    rng = random.Random(3)
+    cats = ["Easy Peasy (5)", "Warm-up (10)", "Steady Climb (20)", "Marathon (30)",
+            "Pro League (40)", "Hardcore Expert (50)"]
+    rows = []
+    for i in range(5000):
+        cat = rng.choice(cats)
+        total = int(cat.split("(")[1].rstrip(")"))
+        rows.append({"username": f"user{i}", "country": "Dominica", "avatar": "🐢",
+                     "category": cat, "score": rng.randint(0, total), "total": total})
+    return rows
+
+
+@pytest.fixture(scope="session")
+def bench_profile():
+    return dict(BENCH_PROFILE)
@@ -161,11 +161,39 @@ def display_budget_report(result):
 
 
 
+def display_statement_report(summary, currency="XCD"):
+    """Spending by category from statement_engine.analyze_csv, then the usual budget report."""
+    from statement_engine import budget_inputs, summary_markdown
+
+    st.markdown(summary_markdown(summary, currency))
+    if len(summary.spending.columns):
+        st.subheader("📅 Monthly Spending by Category")
+        st.bar_chart(summary.spending)
+
+    income, expenses = budget_inputs(summary)
+    if income > 0 and expenses:
+        display_budget_report(budgeting_function(income, expenses))
+    else:
+        st.info("No money coming in was found in this statement, so no budget plan could be suggested.")
+
+
 def gen_budget():
     # Sample streamlit call for user input
     st.header("📊 Your Budget Plan Generator")
     monthly_income = st.number_input("Enter your total monthly income (XCD)", min_value=0.0, step=50.0)
 
+    statement = st.file_uploader("…or upload a bank statement (CSV) to see where your money went", type=["csv"])
+    if statement is not None:
+        from statement_engine import analyze_csv
+
+        summary = analyze_csv(statement)
+        if summary is None:
+            st.warning("That file doesn't look like a bank statement: it needs date, description and amount "
+                       "(or debit/credit) columns.")
+        else:
+            display_statement_report(summary)
+            return
+
     st.markdown("### Add Your Expenses")
 
     expense_data = []
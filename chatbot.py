@@ -1,18 +1,24 @@
 # chatbot.py
 from __future__ import annotations
-from typing import Optional
 from dotenv import load_dotenv
 import streamlit as st
-import tempfile
 import PyPDF2
 import os
 import requests
-import base64, mimetypes
-from pathlib import Path
 
 # Import the modularized agent utilities
 from agent import detect_user_location, agent as run_agent
 from setup_wizard import ensure_profile_on_load, log_message, get_user_profile
+from convo_store import resume_messages
+from telemetry import TurnTimer, export_turn_metrics
+from tool_budget import STATS
+from avatar_cache import thumbnail_path
+import countries
+import receipt_ocr
+from image_pipeline import prepare_many, savings_note
+from ingest import MAX_TEXT_CHARS, UploadTooLarge, ingest
+from statement_engine import analyze_csv, is_statement_question, summary_markdown
+import currencies
 
 # 🔒 Force profile setup if missing; update profile if it already exists
 ensure_profile_on_load()
@@ -23,82 +29,68 @@ load_dotenv()
 # =========================
 # Helpers: file processing
 # =========================
-def extract_pdf_text(pdf_file):
-    """Extract text content from a PDF file using PyPDF2."""
+def extract_pdf_text(pdf_file, max_chars=MAX_TEXT_CHARS):
+    """Extract text content from a PDF file using PyPDF2, stopping once `max_chars` are read."""
     try:
         pdf_reader = PyPDF2.PdfReader(pdf_file)
         text_content = ""
         for page_num in range(len(pdf_reader.pages)):
             page = pdf_reader.pages[page_num]
             text_content += (page.extract_text() or "") + "\n"
-        return text_content.strip()
+            if len(text_content) >= max_chars:
+                break
+        return text_content.strip()[:max_chars]
     except Exception as e:
         return f"Error reading PDF: {str(e)}"
 
-def read_text_file(file):
-    """Read text content from various file types."""
+def _analyze_statement(upload):
+    """statement_engine summary for a stored bank-statement CSV, else None."""
     try:
-        content = file.read().decode('utf-8')
-        return content
-    except UnicodeDecodeError:
-        try:
-            file.seek(0)
-            content = file.read().decode('latin-1')
-            return content
-        except Exception as e:
-            return f"Error reading file: {str(e)}"
+        return analyze_csv(upload.path)
+    except Exception:
+        return None
+
+def read_text_file(file, uploads=None):
+    """
+    Text of an upload, streamed through ingest.py: the raw bytes go to
+    files/uploads (by content hash) and at most INGEST_MAX_CHARS are decoded.
+    Appends the Upload to `uploads` when given. Returns (text, upload).
+    """
+    try:
+        ing = ingest(file)
+    except UploadTooLarge as e:
+        return f"Skipped: {e}.", None
+    except Exception as e:
+        return f"Error reading file: {str(e)}", None
+    if uploads is not None:
+        uploads.append(ing.upload)
+    note = f"\n\n_[Truncated: showing the first {len(ing.text):,} characters of {ing.upload.size:,} bytes.]_" \
+        if ing.truncated else ""
+    return ing.text + note, ing.upload
 
 # =========================
-# Avatar loader (prefer PNG path; convert SVG if needed)
+# Avatar loader (64px thumbnail from the avatar cache)
 # =========================
 def _avatar_src_from_profile(profile: dict) -> str:
     """
     Return a path for Streamlit chat avatar.
-      1) Prefer PNG path (session, then profile).
-      2) If only SVG exists, try convert to PNG; if that fails, return the SVG path.
+      1) 64px PNG thumbnail from the avatar cache (rendered once per avatar).
+      2) Without a rasteriser: a saved PNG, else the SVG path.
       3) Last resort: emoji.
     """
-    def _svg_to_png(svg_path: str) -> Optional[str]:
-        try:
-            import cairosvg  # optional dependency
-        except Exception:
-            return None
-        try:
-            svg_path = os.path.abspath(svg_path)
-            png_path = str(Path(svg_path).with_suffix(".png"))
-            with open(svg_path, "rb") as f:
-                cairosvg.svg2png(bytestring=f.read(), write_to=png_path, output_width=512, output_height=512)
-            return png_path if os.path.exists(png_path) else None
-        except Exception:
-            return None
-
-    # 1) Session (freshly saved this run)
     paths = st.session_state.get("avatar_saved_paths") or {}
-    png = paths.get("png")
-    svg = paths.get("svg")
-    if png and os.path.exists(png):
-        return png
+    cfg = st.session_state.get("avatar_config") or (profile or {}).get("avatar_config")
+    svg = paths.get("svg") or (profile or {}).get("avatar_svg")
+
+    thumb = thumbnail_path(cfg, svg)
+    if thumb is not None:
+        return str(thumb)
+
+    for png in (paths.get("png"), (profile or {}).get("avatar_png")):
+        if png and os.path.exists(png):
+            return png
     if svg and os.path.exists(svg):
-        # Try convert once
-        png2 = _svg_to_png(svg)
-        if png2 and os.path.exists(png2):
-            st.session_state.setdefault("avatar_saved_paths", {})["png"] = png2
-            return png2
-        # Fallback: use SVG path directly
         return svg
-
-    # 2) Persisted profile
-    p_png = (profile or {}).get("avatar_png")
-    if p_png and os.path.exists(p_png):
-        return p_png
-    p_svg = (profile or {}).get("avatar_svg")
-    if p_svg and os.path.exists(p_svg):
-        png2 = _svg_to_png(p_svg)
-        if png2 and os.path.exists(png2):
-            return png2
-        return p_svg  # fallback to SVG path
-
-    # 3) Emoji fallback
     return "👤"
 
 # =========================
@@ -109,13 +101,36 @@ def _show_menu():
     st.session_state["chat_quick_actions_shown"] = False
     st.session_state.pop("chat_mode", None)
 
+# =========================
+# Debug panel (toggle with /debug)
+# =========================
+def _render_debug_panel(meta: dict):
+    with st.expander("🛠️ Turn timings", expanded=False):
+        st.dataframe(
+            [{"span": k.removesuffix("_ms"), "ms": v} for k, v in meta.get("timings", {}).items()],
+            hide_index=True, use_container_width=True,
+        )
+        if meta.get("tool_calls"):
+            st.caption("Tool calls")
+            st.dataframe(meta["tool_calls"], hide_index=True, use_container_width=True)
+        st.caption(" · ".join(f"{k}: {v}" for k, v in meta.get("tokens", {}).items()))
+        if STATS.hist:
+            st.caption("Tool latency (this process)")
+            st.dataframe(STATS.table(), hide_index=True, use_container_width=True)
+        if meta.get("demoted_tools"):
+            st.caption("Demoted this turn (p95 over budget): " + ", ".join(meta["demoted_tools"]))
+
 # =========================
 # MAIN: Chatbot UI
 # =========================
 def render_chatbot():
-    # 🧠 Session state for chat history
+    # 🧠 Session state for chat history (returning users pick up where they left off)
     if "messages" not in st.session_state:
-        st.session_state.messages = []
+        try:
+            st.session_state.messages = resume_messages(profile.get("email"))
+        except Exception:
+            st.session_state.messages = []
+        st.session_state["resumed_count"] = len(st.session_state.messages)
 
     st.title("🌋 SoufrièreSense AI")
 
@@ -143,6 +158,8 @@ def render_chatbot():
             badge = "📍 Unknown"
 
     st.caption(badge + f" · {profile_region}")
+    if st.session_state.get("resumed_count"):
+        st.caption(f"↩️ Resumed your last {st.session_state['resumed_count']} messages.")
 
 
     # Inline open of the setup wizard if requested
@@ -186,24 +203,13 @@ def render_chatbot():
         allow_loc = bool(p.get("allow_location", True))
         selected_base = (p.get("base_currency") or "XCD").upper()
 
-        # ECCU & Caribbean list
-        CARIBBEAN = ["XCD", "JMD", "TTD", "BBD", "BSD", "HTG", "CUP", "DOP"]
-        COUNTRY_TO_CUR = {
-            "Anguilla": "XCD", "Antigua & Barbuda": "XCD", "Dominica": "XCD", "Grenada": "XCD",
-            "Montserrat": "XCD", "St. Kitts & Nevis": "XCD", "St. Lucia": "XCD", "St. Vincent & the Grenadines": "XCD",
-            "Barbados": "BBD", "Trinidad & Tobago": "TTD", "Jamaica": "JMD", "Bahamas": "BSD",
-            "Haiti": "HTG", "Cuba": "CUP", "Dominican Republic": "DOP",
-            "United States": "USD", "United Kingdom": "GBP", "Canada": "CAD", "Eurozone": "EUR",
-        }
-
         # Prefer profile country; fallback to live detection only if allowed and profile is empty
         try:
             ctry = (p.get("country") or "").strip()
             if (not ctry) and allow_loc:
                 loc = detect_user_location()
                 ctry = (loc.get("country") or "").strip()
-            if ctry in COUNTRY_TO_CUR:
-                selected_base = COUNTRY_TO_CUR[ctry]
+            selected_base = countries.currency_for(ctry) or selected_base
         except Exception:
             pass
 
@@ -212,25 +218,16 @@ def render_chatbot():
         set_choice = st.radio("Target currency set", ["ECCU & Caribbean", "World"], horizontal=True)
 
         if set_choice == "ECCU & Caribbean":
-            eccu_carib = sorted(set(["XCD"] + CARIBBEAN))
-            idx = eccu_carib.index("USD") if "USD" in eccu_carib else 0
-            target = st.selectbox("Target currency", eccu_carib, index=idx)
+            codes = currencies.REGIONAL_CODES
+            target = st.selectbox("Target currency", codes, index=currencies.index_of("USD", codes=codes),
+                                  format_func=currencies.label)
         else:
-            try:
-                import pycountry
-                world = sorted({c.alpha_3 for c in pycountry.currencies if hasattr(c, "alpha_3") and len(c.alpha_3) == 3})
-            except Exception:
-                world = ["USD", "GBP", "EUR", "CAD", "JMD", "TTD", "BBD", "BSD", "XCD"]
-            for bad in ["XTS", "XXX"]:
-                if bad in world:
-                    world.remove(bad)
-            default_idx = world.index("USD") if "USD" in world else 0
-            target = st.selectbox("Target currency", world, index=default_idx)
+            target = st.selectbox("Target currency", currencies.CODES, index=currencies.index_of("USD"),
+                                  format_func=currencies.label)
 
         amount = st.number_input("Amount", min_value=0.0, value=100.0, step=1.0)
 
-        def _valid_code(code: str) -> bool:
-            return isinstance(code, str) and len(code) == 3 and code.isalpha()
+        _valid_code = currencies.is_valid
 
         if st.button("Convert now"):
             b = (base or "").upper().strip()
@@ -266,7 +263,7 @@ def render_chatbot():
                 st.error("❌ Conversion failed due to a numeric error.")
                 return
 
-            st.success(f"{amount:,.2f} {b} → {res:,.2f} {t}")
+            st.success(f"{currencies.format_amount(amount, b)} → {currencies.format_amount(res, t)}")
             st.caption("Source: ExchangeRate-API (USD-based).")
 
             # --- Branch: if the user converted INTO EC$ (XCD), suggest local investing ideas ---
@@ -279,156 +276,28 @@ def render_chatbot():
                 pp = st.session_state.get("user_profile", {}) or {}
                 country = (pp.get("country") or "").strip()
 
-                # normalize common short forms
-                _ALIASES = {
-                    "Antigua & Barbuda": "Antigua and Barbuda",
-                    "St. Kitts & Nevis": "Saint Kitts and Nevis",
-                    "St Kitts & Nevis": "Saint Kitts and Nevis",
-                    "St. Lucia": "Saint Lucia",
-                    "St Lucia": "Saint Lucia",
-                    "St. Vincent & the Grenadines": "Saint Vincent and the Grenadines",
-                    "St Vincent & the Grenadines": "Saint Vincent and the Grenadines",
-                }
-                country = _ALIASES.get(country, country)
-
-                ECCU_COUNTRIES = [
-                    "Antigua and Barbuda",
-                    "Dominica",
-                    "Grenada",
-                    "Saint Kitts and Nevis",
-                    "Saint Lucia",
-                    "Saint Vincent and the Grenadines",
-                    "Anguilla",
-                    "Montserrat",
-                ]
-
-                if not country or country not in ECCU_COUNTRIES:
+                # one advice index for the tool, the Saving & Investing page and this flow;
+                # it resolves "St. Lucia" / "Saint Lucia" / "LC" to the same country
+                from data_loaders import load_investing_advice
+                index = load_investing_advice()[0]
+                country = index.resolve(country) or ""
+
+                if not country:
                     # Try live location as a helpful fallback
                     try:
                         loc = detect_user_location()
-                        maybe = (loc.get("country") or "").strip()
-                        country = _ALIASES.get(maybe, maybe)
+                        country = index.resolve((loc.get("country") or "").strip()) or ""
                     except Exception:
                         pass
 
-                if not country or country not in ECCU_COUNTRIES:
-                    country = st.selectbox("Pick your ECCU country", ECCU_COUNTRIES)
+                if not country:
+                    country = st.selectbox("Pick your ECCU country", list(index.countries))
 
                 # Heuristic age group from setup role
                 role = (pp.get("role") or "").lower()
                 age_group = "youth" if role == "student" else "adult"
 
-                # Try to use your investing tool; if it doesn't return a list, fall back to local data
-                recs = None
-                try:
-                    from save_invest import investing_advice as _invest
-                    maybe = _invest(country, age_group)
-                    if isinstance(maybe, (list, tuple)):
-                        recs = list(maybe)
-                except Exception:
-                    recs = None
-
-                if not recs:
-                    # Fallback recommendations per country (short + practical)
-                    RECS = {
-                        "Antigua and Barbuda": {
-                            "youth": [
-                                "Open a youth saver/CD at a local bank; auto-save part of side-hustle income.",
-                                "Join a school/college savings club or co-op; set a weekly EC$ goal.",
-                                "Learn the basics with a small mutual fund or ETF via a supervised account.",
-                            ],
-                            "adult": [
-                                "Use fixed deposits or credit-union partner plans for guaranteed returns.",
-                                "Consider government T-Bills/Bonds for conservative growth.",
-                                "Co-invest in tourism micro-businesses (tours, rentals) with solid cashflow.",
-                            ],
-                        },
-                        "Dominica": {
-                            "youth": [
-                                "Use NBD junior accounts + set a monthly auto-transfer.",
-                                "Save profits from market sales (dasheen, produce) toward a small CD.",
-                                "Learn about gov’t savings bonds as a first safe instrument.",
-                            ],
-                            "adult": [
-                                "Buy gov’t T-Bills/Bonds; ladder maturities for liquidity.",
-                                "Credit union fixed-share plans for steady EC$ growth.",
-                                "Eco-tourism or agro-processing micro-investments with vetted partners.",
-                            ],
-                        },
-                        "Grenada": {
-                            "youth": [
-                                "Join Early Savers/Junior accounts; save seasonal income (Spicemas gigs).",
-                                "Start a tiny emergency fund (EC$300–500) before investing.",
-                                "Practice dollar-cost averaging into a regional index fund (small amounts).",
-                            ],
-                            "adult": [
-                                "Use fixed deposits; compare bank vs credit-union yields.",
-                                "Consider real-asset co-ownership (equipment for agro/fishing).",
-                                "Explore government instruments for conservative returns.",
-                            ],
-                        },
-                        "Saint Kitts and Nevis": {
-                            "youth": [
-                                "Open a Youth Saver; auto-save allowances/side gigs.",
-                                "Learn via mock portfolios before buying real funds.",
-                                "Participate in school/club co-op savings challenges.",
-                            ],
-                            "adult": [
-                                "Fixed deposits & gov’t T-Bills; ladder 3/6/12-month terms.",
-                                "Solar/energy co-ops for dividend-like cashflows.",
-                                "Real estate/tourism shares with careful due diligence.",
-                            ],
-                        },
-                        "Saint Lucia": {
-                            "youth": [
-                                "Use youth accounts; save carnival/holiday income.",
-                                "Take an intro investing course; start micro-investing monthly.",
-                                "Build a starter emergency fund (1–2 months expenses).",
-                            ],
-                            "adult": [
-                                "Credit-union products + gov’t bonds for base portfolio.",
-                                "Tourism-adjacent rentals or land leasing (evaluate cashflow).",
-                                "Gradually add diversified funds for growth.",
-                            ],
-                        },
-                        "Saint Vincent and the Grenadines": {
-                            "youth": [
-                                "Join Youth Savers; set an EC$10/day habit.",
-                                "Save side-hustle/freelance income toward a 6-month CD.",
-                                "Study basic ETFs before buying anything.",
-                            ],
-                            "adult": [
-                                "Fixed-term accounts; compare rates at banks/credit unions.",
-                                "Co-own small equipment for fishing or agro processing.",
-                                "T-Bills/Bonds for stability; diversify gradually.",
-                            ],
-                        },
-                        "Anguilla": {
-                            "youth": [
-                                "Youth saver/CD accounts; automate 10–20% of income.",
-                                "Learn budgeting + set a quarterly savings challenge.",
-                                "Start with a conservative fund via supervised account.",
-                            ],
-                            "adult": [
-                                "Term deposits for safe yield; roll maturities.",
-                                "Local small-business co-investment (tourism services).",
-                                "Gov’t bonds or regional funds for diversification.",
-                            ],
-                        },
-                        "Montserrat": {
-                            "youth": [
-                                "Join a junior savings club; auto-save from summer/part-time jobs.",
-                                "Target EC$1k emergency fund before investing.",
-                                "Learn investing basics; try tiny monthly index-fund buys.",
-                            ],
-                            "adult": [
-                                "Term deposits at Bank of Montserrat; compare rates/penalties.",
-                                "Participate in vetted community co-ops (housing/energy).",
-                                "Use gov’t savings bonds for low-risk returns.",
-                            ],
-                        },
-                    }
-                    recs = RECS.get(country, {}).get(age_group, [])
+                recs = [t.text for t in index.advice(country, age_group)]
 
                 if recs:
                     st.write(f"**Country:** {country}  ·  **Profile:** {'Student/Youth' if age_group=='youth' else 'Adult'}")
@@ -473,7 +342,7 @@ def render_chatbot():
     for msg in st.session_state.messages:
         avatar = user_avatar_src if msg["role"] == "user" else bot_avatar_src
         with st.chat_message(msg["role"], avatar=avatar):
-            st.markdown(msg["content"])
+            st.markdown(msg.get("display", msg["content"]))
 
       # --- Quick actions panel at the bottom (above chat input) ---
     # Initialize flags once
@@ -523,6 +392,10 @@ def render_chatbot():
             st.session_state["open_setup_now"] = True
             st.rerun()
             return
+        if low == "/debug":
+            st.session_state["debug_timings"] = not st.session_state.get("debug_timings", False)
+            st.toast(f"Debug timings {'on' if st.session_state['debug_timings'] else 'off'}.", icon="🛠️")
+            return
 
         uploaded_files = data.get("files", None)
 
@@ -532,6 +405,8 @@ def render_chatbot():
         # Process uploaded files if any
         file_content = ""
         image_files = []
+        statements = []   # (file name, statement_engine.StatementSummary)
+        uploads = []      # ingest.Upload: stored by content hash, history keeps only the reference
 
         if uploaded_files:
             for uploaded_file in uploaded_files:
@@ -539,34 +414,76 @@ def render_chatbot():
                 file_extension = file_name.split('.')[-1] if '.' in file_name else ""
 
                 if file_extension == "pdf":
-                    pdf_text = extract_pdf_text(uploaded_file)
-                    file_content += f"\n\n**PDF Content ({file_name}):**\n{pdf_text}\n"
+                    try:
+                        uploads.append(ingest(uploaded_file, decode=False).upload)
+                    except UploadTooLarge as e:
+                        file_content += f"\n\n**Skipped {file_name}:** {e}.\n"
+                    else:
+                        pdf_text = extract_pdf_text(uploaded_file)
+                        file_content += f"\n\n**PDF Content ({file_name}):**\n{pdf_text}\n"
 
                 elif file_extension in ["txt", "md", "py", "js", "html", "css", "json", "xml", "csv"]:
-                    text_content = read_text_file(uploaded_file)
-                    file_content += f"\n\n**File Content ({file_name}):**\n{text_content}\n"
+                    text_content, upload = read_text_file(uploaded_file, uploads)
+                    if file_extension == "csv" and upload and (summary := _analyze_statement(upload)) is not None:
+                        # Bank statement: categorized locally; the LLM only ever sees the summary table
+                        statements.append((file_name, summary))
+                        file_content += f"\n\n**Statement summary ({file_name}):**\n" + summary_markdown(
+                            summary, profile.get("base_currency") or "XCD") + "\n"
+                    else:
+                        file_content += f"\n\n**File Content ({file_name}):**\n{text_content}\n"
 
                 elif file_extension in ["jpg", "jpeg", "png", "gif", "bmp", "webp"]:
                     image_files.append(uploaded_file)
-                    user_message["image"] = uploaded_file
+                    try:
+                        uploads.append(ingest(uploaded_file, decode=False).upload)
+                    except UploadTooLarge as e:
+                        image_files.pop()
+                        file_content += f"\n\n**Skipped {file_name}:** {e}.\n"
 
                 else:
                     try:
-                        text_content = read_text_file(uploaded_file)
+                        text_content, _ = read_text_file(uploaded_file, uploads)
                         file_content += f"\n\n**File Content ({file_name}):**\n{text_content}\n"
                     except Exception:
                         file_content += f"\n\n**Unsupported file type: {file_name}**\n"
 
+        timer = TurnTimer()
+
+        # Receipt photos read offline (receipt_ocr.py) reach the agent as text: no vision-model call for them
+        receipt_files = []
+        if image_files and receipt_ocr.available():
+            with timer.span("receipt_ocr"):
+                receipts = receipt_ocr.read_receipts(f.getvalue() for f in image_files)
+            for img_file, receipt in zip(image_files, receipts):
+                if receipt is not None and receipt.ok:
+                    receipt_files.append(img_file)
+                    file_content += "\n\n" + receipt_ocr.receipt_markdown(receipt, img_file.name.lower()) + "\n"
+        vision_files = [f for f in image_files if f not in receipt_files]
+
+        # "Where did my money go?" about an uploaded statement is answered locally, no LLM call
+        local_answer = None
+        if statements and is_statement_question(prompt):
+            local_answer = "\n\n".join(summary_markdown(s, profile.get("base_currency") or "XCD")
+                                       for _, s in statements)
+
         # Combine prompt with file content
         if file_content:
             user_message["content"] = (prompt or "") + file_content
+        if local_answer is not None:
+            # the stored message keeps the summary for follow-up turns; the bubble only names the file
+            user_message["display"] = (prompt or "") + "".join(
+                f"\n\n📎 Statement: {name} ({s.rows:,} transactions)" for name, s in statements)
+        if uploads:
+            user_message["uploads"] = [u.ref() for u in uploads]
 
         # Add user message to chat history
         st.session_state.messages.append(user_message)
 
         # ⏺️ Log the user message (per-user JSONL)
         try:
-            log_message("user", user_message["content"], email=profile.get("email"))
+            log_message("user", user_message["content"], email=profile.get("email"),
+                        meta={"country": location.get("country"),
+                              **({"uploads": user_message["uploads"]} if uploads else {})})
         except Exception:
             pass
 
@@ -575,7 +492,22 @@ def render_chatbot():
             if image_files:
                 for img_file in image_files:
                     st.image(img_file, width=200)
-            st.markdown(user_message["content"])
+            st.markdown(user_message.get("display", user_message["content"]))
+
+        if local_answer is not None:
+            with st.chat_message("assistant", avatar=bot_avatar_src):
+                st.markdown(local_answer)
+                for _, summary in statements:
+                    if len(summary.spending.columns):
+                        st.bar_chart(summary.spending)
+                st.caption("📊 Categorized on this device; ask a follow-up for tips.")
+            st.session_state.messages.append({"role": "assistant", "content": local_answer})
+            try:
+                log_message("assistant", local_answer, email=profile.get("email"),
+                            meta={"country": location.get("country"), "local": "statement_engine"})
+            except Exception:
+                pass
+            return
 
         # Generate assistant response (with avatar)
         with st.chat_message("assistant", avatar=bot_avatar_src):
@@ -584,16 +516,28 @@ def render_chatbot():
             full_response = ""
             current_action = None
 
+            # 🚨 Local scam check on the prompt + extracted file text, before the LLM is called
+            scam_report = None
+            try:
+                from common_scams import check_text, render_scam_report
+                with timer.span("scam_check"):
+                    scam_report = check_text(user_message["content"])
+                render_scam_report(scam_report)
+            except Exception:
+                pass
+
+            images = []
             try:
-                # Handle image files for the agent
-                image_path = None
-                if image_files:
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{image_files[0].name.split('.')[-1]}") as tmp_file:
-                        tmp_file.write(image_files[0].getvalue())
-                        image_path = tmp_file.name
+                # Every image, downsized in memory (image_pipeline.py) and passed to the agent as bytes
+                if vision_files:
+                    with timer.span("prepare_images"):
+                        images = prepare_many((f.name, f.getvalue()) for f in vision_files)
+                    if images:
+                        st.caption(savings_note(images))
 
                 # Get streaming response from the AI agent
-                response_stream = run_agent(st.session_state.messages, image_path, location=location)
+                response_stream = run_agent(st.session_state.messages, images, location=location, timer=timer,
+                                            scam_report=scam_report)
 
                 # Process and display the streaming response
                 for chunk in response_stream:
@@ -601,24 +545,31 @@ def render_chatbot():
                         if chunk.event == 'RunResponseContent':
                             if hasattr(chunk, 'content') and chunk.content:
                                 full_response += chunk.content
+                                timer.content(chunk.content)
                                 if current_action:
                                     action_placeholder.empty()
                                     current_action = None
 
                         elif chunk.event == 'ToolCallStarted':
                             tool_name = chunk.tool.tool_name if hasattr(chunk.tool, 'tool_name') else "Unknown Tool"
+                            timer.tool_started(tool_name, getattr(chunk.tool, 'tool_call_id', None))
                             current_action = f"🔧 Calling {tool_name}..."
                             action_placeholder.info(current_action)
 
                         elif chunk.event == 'ToolCallCompleted':
+                            tool = getattr(chunk, 'tool', None)
+                            tool_name = getattr(tool, 'tool_name', None) or "Unknown Tool"
+                            took_ms = timer.tool_completed(tool_name, getattr(tool, 'tool_call_id', None),
+                                                           error=bool(getattr(tool, 'tool_call_error', False)))
                             if current_action:
-                                action_placeholder.success("✅ Tool call completed")
+                                took = f" in {took_ms / 1000:.2f}s" if took_ms is not None else ""
+                                action_placeholder.success(f"✅ {tool_name} completed{took}")
 
                     if full_response:
                         message_placeholder.markdown(full_response + "● ")
 
-                if image_path:
-                    os.unlink(image_path)
+                run_response = getattr(getattr(timer, "agent", None), "run_response", None)
+                timer.record_usage(getattr(run_response, "metrics", None))
 
             except Exception as e:
                 full_response = f"Error: {str(e)}"
@@ -627,6 +578,23 @@ def render_chatbot():
 
             action_placeholder.empty()
             message_placeholder.markdown(full_response)
+            turn_meta = timer.to_meta()
+            if getattr(timer, "demoted_tools", None):
+                turn_meta["demoted_tools"] = timer.demoted_tools
+            if receipt_files:
+                turn_meta["receipts_ocr"] = len(receipt_files)
+            if images:
+                turn_meta["images"] = len(images)
+                turn_meta["image_bytes_saved"] = sum(i.saved for i in images)
+            if scam_report:
+                turn_meta["scam_flags"] = [h.id for h in scam_report.flagged]
+            if turn_meta["tool_calls"]:
+                st.caption("🔧 " + " → ".join(
+                    f"{c['name']} {c['ms'] / 1000:.2f}s" if c["ms"] is not None else c["name"]
+                    for c in turn_meta["tool_calls"]
+                ))
+            if st.session_state.get("debug_timings"):
+                _render_debug_panel(turn_meta)
 
         # Add assistant response to chat history
         assistant_message = {"role": "assistant", "content": full_response}
@@ -634,6 +602,9 @@ def render_chatbot():
 
         # ⏺️ Log the assistant reply
         try:
-            log_message("assistant", full_response, email=profile.get("email"))
+            log_message("assistant", full_response, email=profile.get("email"),
+                        meta={"country": location.get("country"), **turn_meta})
+            export_turn_metrics(turn_meta, country=location.get("country"),
+                                error=full_response.startswith("Error:"))
         except Exception:
             pass
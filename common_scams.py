@@ -1,10 +1,13 @@
 import streamlit as st
 import random
 
+import scam_blocklist
+from data_loaders import load_common_scams, load_scam_detector
+
 
 def commonscams2(show_one=True):
     """
-    Returns one or all common scams found in the Caribbean.
+    Returns one or all common scams found in the Caribbean (files/common_scams.json).
 
     Args:
         show_one (bool): If True, return one random scam. If False, return all scams.
@@ -12,18 +15,9 @@ def commonscams2(show_one=True):
     Returns:
         dict or list: A single scam (dict) or a list of scams (list of dicts)
     """
-    common_scams = [
-        {"title": "Taxi Overcharging & Fake Taxis", "description": "Drivers quote inflated prices, refuse to use meters, or aren't licensed at all."},
-        {"title": "Fake Tour Operators & Excursion Scams", "description": "Scammers pose as guides or sell tours that never happen."},
-        {"title": "Street Hustler / Friendly Local Scam", "description": "A 'friendly' offers help or a tour, then demands money or tips."},
-        {"title": "Credit Card Skimming", "description": "ATM or card readers are rigged to steal your data."},
-        {"title": "Pickpocketing & Distraction Thefts", "description": "Someone distracts you, another steals your belongings."},
-        {"title": "Timeshare/Vacation Club Scams", "description": "You're lured with free gifts but pressured into shady, expensive deals."},
-        {"title": "Romance Scams (Online or In-Person)", "description": "Fake relationships built to extract money from victims."},
-        {"title": "Fake Goods (Cigars, Jewelry, Designer Items)", "description": "Vendors sell counterfeits as authentic, especially Cuban cigars or gold jewelry."},
-        {"title": "Rental Damage Scams (Jet Skis, Cars, Scooters)", "description": "You’re blamed for damage that already existed and charged unfairly."},
-        {"title": "Lottery, Inheritance & Advance Fee Scams", "description": "You’re told you won something, but must pay to claim it."}
-    ]
+    common_scams = [dict(s) for s in load_common_scams()[0]]
+    if not common_scams:
+        return {} if show_one else []
 
     if show_one:
         return random.choice(common_scams)
@@ -33,14 +27,59 @@ def commonscams2(show_one=True):
 
 
 
+def check_text(text: str):
+    """
+    Scans pasted text (SMS, email, PDF text) against the local scam lexicon.
+
+    Returns:
+        scam_detector.ScamReport: truthy when a category reached its flag score.
+    """
+    return load_scam_detector().scan(text)
+
+
+def check_scam_contacts(text: str):
+    """
+    Looks up phone/WhatsApp numbers, website domains, emails and @/$ payment handles
+    found in `text` against the local blocklist of reported scam contacts.
+
+    Args:
+        text (str): The message, email or offer to check.
+
+    Returns:
+        dict: {"blocklist_available": bool, "listed": [...], "not_listed": [...]}.
+              A listed contact has been reported before (small false-positive chance);
+              not listed does NOT mean safe.
+    """
+    findings, available = scam_blocklist.check_text(text)
+    return {
+        "blocklist_available": available,
+        "listed": [{"type": f.kind, "value": f.value} for f in findings if f.listed],
+        "not_listed": [{"type": f.kind, "value": f.value} for f in findings if not f.listed],
+    }
+
+
+def render_scam_report(report, heading: str = "⚠️ This looks like a scam") -> None:
+    """Warning box for a flagged ScamReport (nothing for a clean one)."""
+    if not report:
+        return
+    lines = [f"**{heading}**"]
+    for hit in report.flagged:
+        lines.append(f"- **{hit.title}** — matched: {', '.join(hit.phrases[:5])}. {hit.advice}")
+    st.warning("\n".join(lines))
+
+
 def run_common_scams():
     st.header("🚨 Common Scams in the Caribbean")
     st.markdown("Be alert when traveling or living in the Caribbean. Here are some common scams to watch out for:")
 
     show_random = st.toggle("🎲 Show One Random Scam", value=True)
 
+    for p in load_common_scams()[1]:
+        (st.error if p.level == "error" else st.warning)(p.message)
     scams = commonscams2(show_one=show_random)
-    
+    if not scams:
+        return
+
     if show_random:
         st.subheader(f"🧠 {scams['title']}")
         st.write(scams["description"])
@@ -49,6 +88,31 @@ def run_common_scams():
             with st.expander(f"🧠 {scam['title']}"):
                 st.write(scam["description"])
 
+    st.divider()
+    st.subheader("🔍 Check a message")
+    pasted = st.text_area("Paste a text, email or offer you received", height=120,
+                          placeholder="e.g. Congratulations, you won! Pay the processing fee to claim your prize…")
+    if pasted.strip():
+        report = check_text(pasted)
+        if report:
+            render_scam_report(report)
+        elif report.hits:
+            st.info("A few warning signs, not enough to call it a scam: "
+                    + ", ".join(p for h in report.hits for p in h.phrases))
+        else:
+            st.success("No known scam phrases found. Stay careful with anything that asks for money or codes.")
+
+        contacts = check_scam_contacts(pasted)
+        if contacts["listed"]:
+            st.error("🚫 **Reported scam contacts:** "
+                     + ", ".join(f"{c['value']} ({c['type']})" for c in contacts["listed"])
+                     + "  \nDo not call, pay or click. Contact your bank or the police if you already have.")
+        if contacts["not_listed"]:
+            note = "" if contacts["blocklist_available"] else " (blocklist not installed, so these weren't checked)"
+            st.caption("Contacts found, not on the blocklist" + note + ": "
+                       + ", ".join(c["value"] for c in contacts["not_listed"])
+                       + ". Not being listed doesn't make them safe.")
+
     st.markdown("""
     ---
     ✅ **Tips to Stay Safe:**
@@ -0,0 +1,143 @@
+# content_registry.py
+"""
+Hot-reloading registry for the JSON content in files/.
+
+Callers ask for `(path, kind, build)` and get the current snapshot straight
+from a dict: no stat and no lock on the request path. The first request for
+an entry builds it inline. After that a daemon thread polls the mtime and
+size of every registered file. When a file changes, the thread re-runs the
+builders for that file and swaps each new snapshot in with a single
+reference assignment. Requests keep reading the previous snapshot until the
+swap, so a reload never blocks them.
+
+If a rebuild raises, the previous snapshot stays in place. Set
+CONTENT_POLL_INTERVAL=0 to disable the thread. Each `get()` then checks the
+mtime itself, which suits short batch jobs.
+"""
+from __future__ import annotations
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+POLL_INTERVAL_S = float(os.getenv("CONTENT_POLL_INTERVAL", "2.0"))
+
+log = logging.getLogger(__name__)
+
+Stamp = Tuple[int, int]
+
+
+class Snapshot(NamedTuple):
+    value: Any
+    stamp: Stamp        # (mtime_ns, size) of the file it was built from
+    version: int        # bumps on every successful rebuild
+    built_at: float
+
+
+def _stamp(path: str) -> Stamp:
+    try:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return (-1, -1)
+
+
+class ContentRegistry:
+    def __init__(self, poll_interval: float = POLL_INTERVAL_S):
+        self.poll_interval = poll_interval
+        self._snapshots: Dict[Tuple[str, str], Snapshot] = {}
+        self._builders: Dict[Tuple[str, str], Callable[[Path], Any]] = {}  # insertion order = rebuild order
+        # registration + rebuilds, never taken by warm reads; re-entrant because a
+        # builder may read another entry (the hustle catalog reads the hustle list)
+        self._lock = threading.RLock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.reloads = 0
+        self.failures = 0
+
+    # ---------- reads ----------
+    def get(self, path: Path, kind: str, build: Callable[[Path], Any]) -> Any:
+        key = (str(path), kind)
+        snap = self._snapshots.get(key)
+        if snap is not None:
+            if self.poll_interval <= 0 and _stamp(key[0]) != snap.stamp:
+                return self._rebuild(key, force=False).value
+            return snap.value
+        with self._lock:
+            snap = self._snapshots.get(key)
+            if snap is None:
+                stamp = _stamp(key[0])
+                snap = Snapshot(build(Path(key[0])), stamp, 1, time.time())
+                self._snapshots[key] = snap
+                self._builders[key] = build  # after build(): dependencies register first
+        self._ensure_watcher()
+        return snap.value
+
+    def snapshot(self, path: Path, kind: str) -> Optional[Snapshot]:
+        return self._snapshots.get((str(path), kind))
+
+    # ---------- reloads ----------
+    def _rebuild(self, key: Tuple[str, str], force: bool = True) -> Snapshot:
+        with self._lock:
+            old = self._snapshots[key]
+            stamp = _stamp(key[0])
+            if not force and stamp == old.stamp:
+                return old  # another thread got here first
+            try:
+                value = self._builders[key](Path(key[0]))
+            except Exception:
+                self.failures += 1
+                log.exception("Reload of %s (%s) failed; keeping version %d", key[0], key[1], old.version)
+                # remember the stamp anyway so a broken file isn't re-parsed every poll
+                snap = old._replace(stamp=stamp)
+            else:
+                self.reloads += 1
+                snap = Snapshot(value, stamp, old.version + 1, time.time())
+            self._snapshots[key] = snap  # atomic swap
+            return snap
+
+    def poll_once(self) -> List[Tuple[str, str]]:
+        """Rebuild every entry whose file changed since its snapshot; returns the keys reloaded."""
+        changed: Dict[str, Stamp] = {}
+        for key in list(self._builders):
+            snap = self._snapshots.get(key)
+            if snap is None:
+                continue
+            stamp = changed.get(key[0]) or _stamp(key[0])
+            if stamp != snap.stamp:
+                changed[key[0]] = stamp
+        reloaded = []
+        for key in list(self._builders):  # registration order: base data before derived indexes
+            if key[0] in changed:
+                self._rebuild(key)
+                reloaded.append(key)
+        return reloaded
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.poll_once()
+            except Exception:
+                log.exception("Content poll failed")
+
+    def _ensure_watcher(self) -> None:
+        if self.poll_interval <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._watch, name="content-registry", daemon=True)
+                self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshots.clear()
+            self._builders.clear()
+
+
+REGISTRY = ContentRegistry()
@@ -0,0 +1,211 @@
+# convo_store.py
+from __future__ import annotations
+import gzip
+import json
+import re
+import struct
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from log_writer import get_writer, rotated_path
+from setup_wizard import CONVO_DIR, _convo_path_for
+
+INDEX_DIR = CONVO_DIR / ".index"
+RESUME_TURNS = 20  # messages reloaded into the chat for a returning user
+
+_MAGIC = b"ECCBIDX1"
+_HEADER = struct.Struct("<8sQQQ")  # magic, inode, indexed_size, count
+# log_message writes "ts" first, so the timestamp sits in the first bytes of each line
+_TS_RE = re.compile(rb'"ts":\s*"([^"]+)"')
+
+
+def _parse_ts(raw: str | bytes | None) -> float:
+    try:
+        if isinstance(raw, bytes):
+            raw = raw.decode("ascii")
+        return datetime.fromisoformat(raw).timestamp()
+    except Exception:
+        return 0.0
+
+
+class ConversationIndex:
+    """
+    Byte-offset index over one JSONL conversation log.
+
+    Keeps the start offset and timestamp of every complete line. Refreshing only
+    scans bytes appended since the last refresh, and the index is persisted in
+    files/conversations/.index so a restart does not rescan whole files.
+    A shrunk or replaced file (log rotation) triggers a rebuild.
+    """
+
+    def __init__(self, log_path: Path):
+        self.log_path = Path(log_path)
+        self.idx_path = INDEX_DIR / f"{self.log_path.stem}.idx"
+        self.offsets = array("Q")
+        self.stamps = array("d")
+        self.indexed_size = 0
+        self.inode = 0
+        self._lock = threading.Lock()
+        self._load_sidecar()
+
+    # ---------- sidecar persistence ----------
+    def _load_sidecar(self) -> None:
+        try:
+            raw = self.idx_path.read_bytes()
+            magic, inode, size, count = _HEADER.unpack_from(raw, 0)
+            if magic != _MAGIC:
+                return
+            pos = _HEADER.size
+            offsets, stamps = array("Q"), array("d")
+            offsets.frombytes(raw[pos:pos + 8 * count])
+            stamps.frombytes(raw[pos + 8 * count:pos + 16 * count])
+            if len(offsets) == len(stamps) == count:
+                self.offsets, self.stamps = offsets, stamps
+                self.indexed_size, self.inode = size, inode
+        except Exception:
+            pass
+
+    def _save_sidecar(self) -> None:
+        try:
+            INDEX_DIR.mkdir(parents=True, exist_ok=True)
+            tmp = self.idx_path.with_suffix(".tmp")
+            with tmp.open("wb") as f:
+                f.write(_HEADER.pack(_MAGIC, self.inode, self.indexed_size, len(self.offsets)))
+                f.write(self.offsets.tobytes())
+                f.write(self.stamps.tobytes())
+            tmp.replace(self.idx_path)
+        except Exception:
+            pass
+
+    # ---------- incremental refresh ----------
+    def refresh(self) -> int:
+        """Index any newly appended lines; returns the number of entries."""
+        with self._lock:
+            try:
+                st_ = self.log_path.stat()
+            except FileNotFoundError:
+                self.offsets, self.stamps = array("Q"), array("d")
+                self.indexed_size = self.inode = 0
+                return 0
+
+            if st_.st_ino != self.inode or st_.st_size < self.indexed_size:
+                self.offsets, self.stamps = array("Q"), array("d")
+                self.indexed_size, self.inode = 0, st_.st_ino
+
+            if st_.st_size == self.indexed_size:
+                return len(self.offsets)
+
+            pos = self.indexed_size
+            with self.log_path.open("rb") as f:
+                f.seek(pos)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # partial write; pick it up next time
+                    if line.strip():
+                        m = _TS_RE.search(line, 0, 96)
+                        self.offsets.append(pos)
+                        self.stamps.append(_parse_ts(m.group(1)) if m else 0.0)
+                    pos += len(line)
+            self.indexed_size = pos
+            self._save_sidecar()
+            return len(self.offsets)
+
+    # ---------- reads ----------
+    def read(self, start: int, stop: int) -> List[dict]:
+        """Decode entries [start, stop) with a single seek."""
+        start, stop = max(0, start), min(stop, len(self.offsets))
+        if start >= stop:
+            return []
+        out: List[dict] = []
+        with self.log_path.open("rb") as f:
+            f.seek(self.offsets[start])
+            for _ in range(stop - start):
+                line = f.readline()
+                try:
+                    out.append(json.loads(line))
+                except Exception:
+                    continue
+        return out
+
+    def range_for(self, since: Optional[datetime], until: Optional[datetime]) -> Tuple[int, int]:
+        lo = bisect_left(self.stamps, since.timestamp()) if since else 0
+        hi = bisect_right(self.stamps, until.timestamp()) if until else len(self.stamps)
+        return lo, hi
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Public API (keyed by email, same file naming as log_message)
+# ──────────────────────────────────────────────────────────────────────────────
+_INDEXES: dict[Path, ConversationIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def _index_for(email: str) -> ConversationIndex:
+    path = _convo_path_for(email)
+    with _INDEXES_LOCK:
+        idx = _INDEXES.get(path)
+        if idx is None:
+            idx = _INDEXES[path] = ConversationIndex(path)
+    get_writer().flush(timeout=2.0)  # make queued entries visible before reading
+    idx.refresh()
+    return idx
+
+
+def _archived_tail(log_path: Path, n: int) -> List[dict]:
+    """Last `n` entries of the newest rotated archive (cold path, full decompress)."""
+    arch = rotated_path(log_path, 1)
+    if n <= 0 or not arch.exists():
+        return []
+    try:
+        with gzip.open(arch, "rt", encoding="utf-8") as f:
+            lines = f.read().splitlines()[-n:]
+        return [json.loads(l) for l in lines if l.strip()]
+    except Exception:
+        return []
+
+
+def count_messages(email: str) -> int:
+    return len(_index_for(email).offsets)
+
+
+def load_page(email: str, limit: int = RESUME_TURNS, before: Optional[int] = None) -> Tuple[List[dict], Optional[int]]:
+    """
+    Return up to `limit` entries ending just before entry number `before`
+    (default: the newest), oldest first, plus the cursor for the previous page
+    (None when the start of the log is reached).
+    """
+    idx = _index_for(email)
+    end = len(idx.offsets) if before is None else min(before, len(idx.offsets))
+    start = max(0, end - limit)
+    return idx.read(start, end), (start if start > 0 else None)
+
+
+def load_recent(email: str, limit: int = RESUME_TURNS) -> List[dict]:
+    """Last `limit` entries for `email`, reaching into the newest archive if the live log is short."""
+    idx = _index_for(email)
+    entries, _ = load_page(email, limit)
+    if len(entries) < limit:
+        entries = _archived_tail(idx.log_path, limit - len(entries)) + entries
+    return entries
+
+
+def load_between(email: str, since: Optional[datetime] = None, until: Optional[datetime] = None) -> List[dict]:
+    """Entries whose timestamp falls in [since, until] (tz-aware datetimes)."""
+    idx = _index_for(email)
+    lo, hi = idx.range_for(since, until)
+    return idx.read(lo, hi)
+
+
+def resume_messages(email: str, limit: int = RESUME_TURNS) -> List[dict]:
+    """Chat-ready history ({"role", "content"}) for a returning user."""
+    if not email:
+        return []
+    return [
+        {"role": e["role"], "content": e.get("content") or ""}
+        for e in load_recent(email, limit)
+        if e.get("role") in ("user", "assistant")
+    ]
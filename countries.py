@@ -0,0 +1,158 @@
+# countries.py
+from __future__ import annotations
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Mapping, NamedTuple, Optional, Tuple
+
+# ---------------------------------
+# Country / region registry
+# ---------------------------------
+# One frozen table for every module that needs a country's canonical name,
+# display name, ISO2 code, currency or ECCU membership. Every spelling we
+# accept ("St. Lucia", "Saint Lucia", "st lucia", "LC", "LCA") is folded
+# by country_key() and indexed once at import, so a lookup is one
+# (memoized) normalization plus one dict hit. pycountry is only read once
+# here, to add the rest of the world. It is optional.
+ECCU = "ECCU"
+CARIBBEAN = "Caribbean (non-ECCU)"
+OTHER = "Global / Other"
+REGIONS = (ECCU, CARIBBEAN, OTHER)  # setup_wizard home_region values
+
+
+class Country(NamedTuple):
+    name: str                 # ISO-style short name, used in location dicts and COUNTRY_TONE
+    display: str              # what the UI shows and profiles store ("St. Lucia")
+    iso2: str
+    currency: Optional[str]   # preferred ISO 4217 code, None when we don't know it
+    region: str
+
+    @property
+    def is_eccu(self) -> bool:
+        return self.region == ECCU
+
+
+_REGIONAL: Tuple[Country, ...] = (
+    # ECCU block (display order = wizard order)
+    Country("Anguilla", "Anguilla", "AI", "XCD", ECCU),
+    Country("Antigua and Barbuda", "Antigua & Barbuda", "AG", "XCD", ECCU),
+    Country("Dominica", "Dominica", "DM", "XCD", ECCU),
+    Country("Grenada", "Grenada", "GD", "XCD", ECCU),
+    Country("Montserrat", "Montserrat", "MS", "XCD", ECCU),
+    Country("Saint Kitts and Nevis", "St. Kitts & Nevis", "KN", "XCD", ECCU),
+    Country("Saint Lucia", "St. Lucia", "LC", "XCD", ECCU),
+    Country("Saint Vincent and the Grenadines", "St. Vincent & the Grenadines", "VC", "XCD", ECCU),
+    # Wider Caribbean commonly used
+    Country("Barbados", "Barbados", "BB", "BBD", CARIBBEAN),
+    Country("Trinidad and Tobago", "Trinidad & Tobago", "TT", "TTD", CARIBBEAN),
+    Country("Jamaica", "Jamaica", "JM", "JMD", CARIBBEAN),
+    Country("Bahamas", "Bahamas", "BS", "BSD", CARIBBEAN),
+    Country("Haiti", "Haiti", "HT", "HTG", CARIBBEAN),
+    Country("Cuba", "Cuba", "CU", "CUP", CARIBBEAN),
+    Country("Dominican Republic", "Dominican Republic", "DO", "DOP", CARIBBEAN),
+    # Fallbacks
+    Country("United States", "United States", "US", "USD", OTHER),
+    Country("United Kingdom", "United Kingdom", "GB", "GBP", OTHER),
+    Country("Canada", "Canada", "CA", "CAD", OTHER),
+    Country("France", "France", "FR", "EUR", OTHER),
+)
+
+_EXTRA_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "AG": ("Antigua", "Barbuda"),
+    "DM": ("Commonwealth of Dominica",),
+    "KN": ("St Kitts", "Saint Kitts", "Nevis", "St Kitts-Nevis"),
+    "VC": ("St Vincent", "Saint Vincent", "SVG"),
+    "TT": ("Trinidad", "Tobago", "T&T"),
+    "US": ("USA", "United States of America", "America"),
+    "GB": ("UK", "Great Britain", "England"),
+}
+
+# currency unions people give as their "country" (keyed by country_key)
+_CURRENCY_AREAS: Mapping[str, str] = MappingProxyType({
+    "eurozone": "EUR",
+    "euro area": "EUR",
+    "european union": "EUR",
+    "eu": "EUR",
+})
+
+
+@lru_cache(maxsize=4096)
+def country_key(name: str) -> str:
+    """'St. Kitts & Nevis', 'Saint Kitts and Nevis', 'st kitts-nevis' → 'saint kitts and nevis'."""
+    s = (name or "").lower().replace("&", " and ")
+    s = re.sub(r"[^a-z0-9 ]+", " ", s)
+    s = re.sub(r"\bst\b", "saint", s)
+    s = re.sub(r"\bthe\b", " ", s)
+    return " ".join(s.split())
+
+
+def _build() -> Tuple[Mapping[str, Country], Mapping[str, Country]]:
+    by_iso2: Dict[str, Country] = {}
+    aliases: Dict[str, Country] = {}
+
+    def add(country: Country, *names: str) -> None:
+        for n in names:
+            k = country_key(n or "")
+            if k:
+                aliases.setdefault(k, country)  # regional entries win
+
+    for c in _REGIONAL:
+        by_iso2[c.iso2] = c
+        add(c, c.name, c.display, c.iso2, *_EXTRA_ALIASES.get(c.iso2, ()))
+    try:
+        import pycountry  # optional: adds the rest of the world
+        world = list(pycountry.countries)
+    except Exception:
+        world = []
+    for pc in world:
+        names = [getattr(pc, a, "") for a in ("common_name", "name", "official_name", "alpha_2", "alpha_3")]
+        c = by_iso2.get(pc.alpha_2)
+        if c is None:
+            label = names[0] or pc.name
+            c = by_iso2[pc.alpha_2] = Country(label, label, pc.alpha_2, None, OTHER)
+        add(c, *names)
+    return MappingProxyType(by_iso2), MappingProxyType(aliases)
+
+
+BY_ISO2, _BY_KEY = _build()
+
+ECCU_COUNTRIES: Tuple[Country, ...] = tuple(c for c in _REGIONAL if c.region == ECCU)
+CARIBBEAN_COUNTRIES: Tuple[Country, ...] = tuple(c for c in _REGIONAL if c.region == CARIBBEAN)
+
+
+# ---------------------------------
+# Lookups
+# ---------------------------------
+def lookup(name: Optional[str]) -> Optional[Country]:
+    """Country for any known spelling, ISO2 or ISO3 code; None if unknown."""
+    if not name:
+        return None
+    return _BY_KEY.get(country_key(name.strip()))
+
+
+def canonical(name: Optional[str]) -> str:
+    """Canonical (ISO-style) name, or the stripped input when the country is unknown."""
+    c = lookup(name)
+    return c.name if c else (name or "").strip()
+
+
+def iso2(name: Optional[str]) -> Optional[str]:
+    c = lookup(name)
+    return c.iso2 if c else None
+
+
+def currency_for(name: Optional[str]) -> Optional[str]:
+    c = lookup(name)
+    if c:
+        return c.currency
+    return _CURRENCY_AREAS.get(country_key((name or "").strip()))
+
+
+def is_eccu(name: Optional[str]) -> bool:
+    c = lookup(name)
+    return bool(c and c.is_eccu)
+
+
+def display_names(region: str) -> list[str]:
+    """UI labels for one region, in wizard order."""
+    return [c.display for c in _REGIONAL if c.region == region]
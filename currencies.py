@@ -0,0 +1,124 @@
+# currencies.py
+from __future__ import annotations
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Mapping, NamedTuple, Optional, Tuple
+
+import countries
+
+# ---------------------------------
+# Currency registry
+# ---------------------------------
+# Built once per process. The currency pickers and code validation read
+# these tuples and maps and never scan pycountry on a rerun. pycountry
+# supplies the full ISO 4217 code and name list when installed; otherwise
+# we fall back to the compact list the setup wizard has always offered.
+# Minor units and symbols are ours: pycountry has neither.
+EXCLUDED = frozenset({"XTS", "XXX"})  # test code / "no currency"
+
+# ISO 4217 minor units that differ from the usual 2
+_MINOR_UNITS: Dict[str, int] = {
+    **dict.fromkeys(("BIF", "CLP", "DJF", "GNF", "ISK", "JPY", "KMF", "KRW", "PYG", "RWF",
+                     "UGX", "VND", "VUV", "XAF", "XOF", "XPF"), 0),
+    **dict.fromkeys(("BHD", "IQD", "JOD", "KWD", "LYD", "OMR", "TND"), 3),
+    **dict.fromkeys(("CLF", "UYW"), 4),
+}
+
+_SYMBOLS: Dict[str, str] = {
+    # Caribbean + ECCU
+    "XCD": "EC$", "JMD": "J$", "TTD": "TT$", "BBD": "Bds$", "BSD": "B$", "HTG": "G", "CUP": "$MN", "DOP": "RD$",
+    # common world
+    "USD": "US$", "CAD": "CA$", "AUD": "A$", "NZD": "NZ$", "HKD": "HK$", "SGD": "S$", "MXN": "MX$",
+    "EUR": "€", "GBP": "£", "JPY": "¥", "CNY": "CN¥", "INR": "₹", "KRW": "₩", "NGN": "₦", "BRL": "R$",
+    "ZAR": "R", "CHF": "CHF", "TRY": "₺", "PLN": "zł", "KES": "KSh",
+}
+
+# A compact world currency list (fallback if pycountry isn’t available)
+COMMON_WORLD_CURRENCIES = (
+    "USD", "EUR", "GBP", "CAD", "AUD", "JPY", "CNY", "INR", "BRL", "ZAR", "KES", "NGN", "SAR", "AED",
+    "CHF", "SEK", "NOK", "DKK", "PLN", "TRY", "MXN", "ARS", "CLP", "PEN", "COP", "NZD", "KRW", "HKD", "SGD",
+    # Caribbean + ECCU
+    "XCD", "BBD", "TTD", "BSD", "JMD", "HTG", "CUP", "DOP",
+)
+_FALLBACK_NAMES = {
+    "USD": "US Dollar", "EUR": "Euro", "GBP": "Pound Sterling", "CAD": "Canadian Dollar",
+    "XCD": "East Caribbean Dollar", "BBD": "Barbados Dollar", "TTD": "Trinidad and Tobago Dollar",
+    "BSD": "Bahamian Dollar", "JMD": "Jamaican Dollar", "HTG": "Gourde", "CUP": "Cuban Peso",
+    "DOP": "Dominican Peso",
+}
+
+
+class Currency(NamedTuple):
+    code: str          # ISO 4217 alpha-3
+    name: str
+    minor_units: int
+    symbol: str        # "EC$"; the code itself when we have no symbol
+
+    @property
+    def label(self) -> str:
+        sym = f" ({self.symbol})" if self.symbol != self.code else ""
+        return f"{self.code} — {self.name}{sym}"
+
+
+def _build() -> Tuple[Tuple[Currency, ...], bool]:
+    try:
+        import pycountry  # optional
+        rows = {c.alpha_3: c.name for c in pycountry.currencies if len(getattr(c, "alpha_3", "")) == 3}
+        complete = True
+    except Exception:
+        rows = {code: _FALLBACK_NAMES.get(code, code) for code in COMMON_WORLD_CURRENCIES}
+        complete = False
+    return tuple(
+        Currency(code, name, _MINOR_UNITS.get(code, 2), _SYMBOLS.get(code, code))
+        for code, name in sorted(rows.items()) if code not in EXCLUDED
+    ), complete
+
+
+CURRENCIES, _COMPLETE = _build()
+CODES: Tuple[str, ...] = tuple(c.code for c in CURRENCIES)                    # sorted, picker order
+INDEX: Mapping[str, int] = MappingProxyType({code: i for i, code in enumerate(CODES)})
+BY_CODE: Mapping[str, Currency] = MappingProxyType({c.code: c for c in CURRENCIES})
+LABELS: Mapping[str, str] = MappingProxyType({c.code: c.label for c in CURRENCIES})
+_CODE_SET: FrozenSet[str] = frozenset(CODES)
+
+# ECCU + wider Caribbean currencies, from the country registry
+REGIONAL_CODES: Tuple[str, ...] = tuple(sorted(
+    {c.currency for c in countries.ECCU_COUNTRIES + countries.CARIBBEAN_COUNTRIES if c.currency}
+))
+
+
+# ---------------------------------
+# Lookups
+# ---------------------------------
+def is_valid(code: Optional[str]) -> bool:
+    """Known ISO 4217 code (or, without pycountry, any 3-letter code)."""
+    if not isinstance(code, str):
+        return False
+    if _COMPLETE:
+        return code in _CODE_SET
+    return len(code) == 3 and code.isalpha()
+
+
+def index_of(code: Optional[str], default: str = "USD", codes: Tuple[str, ...] = CODES) -> int:
+    """Position of `code` (else `default`, else 0) for st.selectbox(index=...)."""
+    if codes is CODES:
+        return INDEX.get(code or "", INDEX.get(default, 0))
+    return codes.index(code) if code in codes else (codes.index(default) if default in codes else 0)
+
+
+def label(code: str) -> str:
+    return LABELS.get(code, code)
+
+
+def symbol(code: str) -> str:
+    c = BY_CODE.get(code)
+    return c.symbol if c else code
+
+
+def minor_units(code: str) -> int:
+    c = BY_CODE.get(code)
+    return c.minor_units if c else 2
+
+
+def format_amount(amount: float, code: str) -> str:
+    """1234.5, "XCD" → "1,234.50 XCD"; 1234.6, "JPY" → "1,235 JPY"."""
+    return f"{amount:,.{minor_units(code)}f} {code}"
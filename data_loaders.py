@@ -0,0 +1,341 @@
+# data_loaders.py
+"""
+Streamlit-free loaders for the JSON content in files/.
+
+Each loader returns `(items, problems)`: the validated records as a tuple
+(shared between callers, treat them as read-only) and a tuple of
+`Problem(level, message)` describing anything skipped or broken. Pages turn
+problems into st.warning/st.error; agent tools and batch jobs just use the
+items, so nothing here needs a Streamlit script context.
+
+Results live in content_registry.REGISTRY: the first call parses inline,
+later edits to the file are picked up by its background watcher and swapped
+in without a restart, and callers never wait on a reload.
+"""
+from __future__ import annotations
+import json
+import re
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Tuple
+
+from advice_index import AGE_GROUPS, AdviceIndex, Tip
+from content_registry import REGISTRY
+from hustle_catalog import COST_BANDS, HustleCatalog
+from scam_detector import Category, ScamDetector
+from statement_engine import CategoryRules
+
+FILES_DIR = Path("files")
+SIDE_HUSTLES_JSON = FILES_DIR / "side_huslte_options.json"
+QUESTIONS_JSON = FILES_DIR / "questions.json"
+COMMON_SCAMS_JSON = FILES_DIR / "common_scams.json"
+INVESTING_ADVICE_JSON = FILES_DIR / "investing_advice.json"
+SCAM_LEXICON_JSON = FILES_DIR / "scam_lexicon.json"
+MERCHANT_CATEGORIES_JSON = FILES_DIR / "merchant_categories.json"
+QUESTION_DIFFICULTY_JSON = FILES_DIR / "question_difficulty.json"
+
+
+class Problem(NamedTuple):
+    level: str    # "warning" | "error"
+    message: str
+
+
+Loaded = Tuple[Tuple[Dict[str, Any], ...], Tuple[Problem, ...]]
+
+
+CACHE = REGISTRY
+
+
+def clear_cache() -> None:
+    CACHE.clear()
+
+
+def _get(path: Path, kind: str, parse: Callable[[Path], Tuple[Any, Tuple[Problem, ...]]]):
+    """CACHE.get() that keeps the last good items when an edit breaks the file."""
+    def build(p: Path):
+        items, problems = parse(p)
+        prev = CACHE.snapshot(p, kind)
+        if not items and prev is not None and prev.value[0]:
+            return prev.value[0], problems + (Problem("warning", f"Still using the last good copy of {p}."),)
+        return items, problems
+    return CACHE.get(Path(path), kind, build)
+
+
+def _read_json(path: Path, what: str, expect: type) -> Tuple[Any, List[Problem]]:
+    if not path.exists():
+        return expect(), [Problem("error", f"{what} not found at: {path}")]
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception as e:
+        return expect(), [Problem("error", f"Failed to parse {path}: {e}")]
+    if not isinstance(data, expect):
+        kind = "list" if expect is list else "object"
+        return expect(), [Problem("error", f"{path} must contain a JSON {kind}")]
+    return data, []
+
+
+def _read_json_list(path: Path, what: str) -> Tuple[List[Any], List[Problem]]:
+    return _read_json(path, what, list)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Side hustles
+# ──────────────────────────────────────────────────────────────────────────────
+def _parse_side_hustles(path: Path) -> Loaded:
+    data, problems = _read_json_list(path, "Side hustle JSON")
+    valid: List[Dict[str, Any]] = []
+    for i, item in enumerate(data):
+        if not isinstance(item, dict):
+            problems.append(Problem("warning", f"Skipping item #{i}: not an object"))
+            continue
+
+        title = (item.get("title") or "").strip()
+        description = (item.get("description") or "").strip()
+        requirements = (item.get("requirements") or "").strip()
+        remote = item.get("remote", False)
+        low_cost = item.get("low_cost", False)
+
+        if not title:
+            problems.append(Problem("warning", f"Skipping item #{i}: missing title"))
+            continue
+        if not isinstance(remote, bool) or not isinstance(low_cost, bool):
+            problems.append(Problem("warning", f"Skipping item #{i}: 'remote'/'low_cost' must be booleans (true/false)"))
+            continue
+
+        skills = item.get("skills") or []
+        cost_band = (item.get("cost_band") or ("low" if low_cost else "medium")).strip().lower()
+        countries = item.get("countries") or []
+        if not isinstance(skills, list) or not all(isinstance(s, str) for s in skills):
+            problems.append(Problem("warning", f"Item #{i} ({title}): 'skills' must be a list of strings; ignoring it"))
+            skills = []
+        if cost_band not in COST_BANDS:
+            problems.append(Problem("warning", f"Item #{i} ({title}): unknown cost_band '{cost_band}'; using the low_cost flag"))
+            cost_band = "low" if low_cost else "medium"
+        if not isinstance(countries, list) or not all(isinstance(c, str) for c in countries):
+            problems.append(Problem("warning", f"Item #{i} ({title}): 'countries' must be a list of strings; ignoring it"))
+            countries = []
+
+        valid.append({
+            "title": title,
+            "description": description,
+            "requirements": requirements,
+            "remote": remote,
+            "low_cost": low_cost,
+            "skills": [s.strip().lower() for s in skills if s.strip()],
+            "cost_band": cost_band,
+            "countries": [c.strip() for c in countries if c.strip()],
+        })
+
+    if not valid and not any(p.level == "error" for p in problems):
+        problems.append(Problem("error", "No valid side hustles found in JSON."))
+    return tuple(valid), tuple(problems)
+
+
+def load_side_hustles(path: Path = SIDE_HUSTLES_JSON) -> Loaded:
+    return _get(path, "side_hustles", _parse_side_hustles)
+
+
+def load_hustle_catalog(path: Path = SIDE_HUSTLES_JSON) -> HustleCatalog:
+    """Indexed catalog over load_side_hustles(), rebuilt with it."""
+    return CACHE.get(Path(path), "hustle_catalog", lambda p: HustleCatalog(load_side_hustles(p)[0]))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Quiz questions
+# ──────────────────────────────────────────────────────────────────────────────
+def _parse_questions(path: Path) -> Loaded:
+    data, problems = _read_json_list(path, "Questions file")
+    valid: List[Dict[str, Any]] = []
+    for i, q in enumerate(data):
+        if not isinstance(q, dict):
+            problems.append(Problem("warning", f"Skipping item {i}: not an object"))
+            continue
+        question = q.get("question")
+        options = q.get("options")
+        answer = q.get("answer")
+        if not question or not isinstance(question, str):
+            problems.append(Problem("warning", f"Skipping item {i}: missing/invalid 'question'"))
+            continue
+        if not options or not isinstance(options, list) or not all(isinstance(o, str) for o in options):
+            problems.append(Problem("warning", f"Skipping item {i}: missing/invalid 'options'"))
+            continue
+        if len(options) < 2 or len(options) > 8:
+            problems.append(Problem("warning", f"Skipping item {i}: options must be between 2 and 8"))
+            continue
+        if not answer or answer not in options:
+            problems.append(Problem("warning", f"Skipping item {i}: 'answer' missing or not in options"))
+            continue
+        valid.append({
+            "question": question.strip(),
+            "options": [o.strip() for o in options],
+            "answer": answer.strip(),
+            **{k: v for k, v in q.items() if k not in ("question", "options", "answer")}
+        })
+    if not valid and not any(p.level == "error" for p in problems):
+        problems.append(Problem("error", "No valid questions found in the JSON file."))
+    return tuple(valid), tuple(problems)
+
+
+def load_questions(path: Path = QUESTIONS_JSON) -> Loaded:
+    return _get(path, "questions", _parse_questions)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Common scams
+# ──────────────────────────────────────────────────────────────────────────────
+def _parse_common_scams(path: Path) -> Loaded:
+    data, problems = _read_json_list(path, "Common scams JSON")
+    valid: List[Dict[str, Any]] = []
+    for i, item in enumerate(data):
+        if not isinstance(item, dict):
+            problems.append(Problem("warning", f"Skipping scam #{i}: not an object"))
+            continue
+        title = (item.get("title") or "").strip()
+        description = (item.get("description") or "").strip()
+        if not title or not description:
+            problems.append(Problem("warning", f"Skipping scam #{i}: needs a title and a description"))
+            continue
+        valid.append({**item, "title": title, "description": description})
+    if not valid and not any(p.level == "error" for p in problems):
+        problems.append(Problem("error", "No valid scams found in JSON."))
+    return tuple(valid), tuple(problems)
+
+
+def load_common_scams(path: Path = COMMON_SCAMS_JSON) -> Loaded:
+    return _get(path, "common_scams", _parse_common_scams)
+
+
+def _parse_scam_lexicon(path: Path) -> Tuple[Tuple[Category, ...], Tuple[Problem, ...]]:
+    data, problems = _read_json(path, "Scam lexicon JSON", dict)
+    valid: List[Category] = []
+    for i, c in enumerate(data.get("categories") or []):
+        if not isinstance(c, dict) or not (c.get("id") or "").strip() or not (c.get("title") or "").strip():
+            problems.append(Problem("warning", f"Skipping lexicon category #{i}: needs an id and a title"))
+            continue
+        lists = []
+        for kind in ("strong", "weak"):
+            phrases = c.get(kind) or []
+            if not isinstance(phrases, list) or not all(isinstance(p, str) for p in phrases):
+                problems.append(Problem("warning", f"{c['title']}: '{kind}' must be a list of strings; ignoring it"))
+                phrases = []
+            lists.append(tuple(p.strip() for p in phrases if p.strip()))
+        valid.append(Category(c["id"].strip(), c["title"].strip(), (c.get("advice") or "").strip(), *lists))
+    if not valid and not any(p.level == "error" for p in problems):
+        problems.append(Problem("error", "No scam categories found in the lexicon."))
+    return tuple(valid), tuple(problems)
+
+
+def load_scam_lexicon(path: Path = SCAM_LEXICON_JSON) -> Tuple[Tuple[Category, ...], Tuple[Problem, ...]]:
+    return _get(path, "scam_lexicon", _parse_scam_lexicon)
+
+
+def load_scam_detector(path: Path = SCAM_LEXICON_JSON) -> ScamDetector:
+    """Phrase automaton over load_scam_lexicon(), rebuilt with it."""
+    def build(p: Path) -> ScamDetector:
+        try:
+            settings = json.loads(p.read_text(encoding="utf-8"))
+        except Exception:
+            settings = {}
+        settings = settings if isinstance(settings, dict) else {}
+        return ScamDetector(load_scam_lexicon(p)[0], settings.get("weights") or {}, int(settings.get("flag_score") or 3))
+    return CACHE.get(Path(path), "scam_detector", build)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Investing advice
+# ──────────────────────────────────────────────────────────────────────────────
+def _parse_investing_advice(path: Path) -> Tuple[AdviceIndex, Tuple[Problem, ...]]:
+    data, problems = _read_json(path, "Investing advice JSON", dict)
+    goals = [g for g in data.get("goals") or [] if isinstance(g, str)]
+    countries: List[Dict[str, Any]] = []
+    for i, c in enumerate(data.get("countries") or []):
+        name = (c.get("name") or "").strip() if isinstance(c, dict) else ""
+        if not name or not isinstance(c.get("advice"), dict):
+            problems.append(Problem("warning", f"Skipping country #{i}: needs a name and an 'advice' object"))
+            continue
+        advice: Dict[str, List[Tip]] = {}
+        for group in AGE_GROUPS:
+            tips = []
+            for j, t in enumerate(c["advice"].get(group) or []):
+                text = (t.get("text") or "").strip() if isinstance(t, dict) else ""
+                goal = (t.get("goal") or "").strip().lower() if text else ""
+                if not text:
+                    problems.append(Problem("warning", f"{name} {group} tip #{j}: missing text; skipping it"))
+                    continue
+                if goals and goal not in goals:
+                    problems.append(Problem("warning", f"{name} {group} tip #{j}: unknown goal '{goal}'"))
+                tips.append(Tip(text, (t.get("markdown") or text).strip(), goal))
+            if not tips:
+                problems.append(Problem("warning", f"{name}: no '{group}' advice"))
+            advice[group] = tips
+        aliases = [a for a in c.get("aliases") or [] if isinstance(a, str)]
+        countries.append({"name": name, "iso2": (c.get("iso2") or "").strip(), "aliases": aliases, "advice": advice})
+    if not countries and not any(p.level == "error" for p in problems):
+        problems.append(Problem("error", "No investing advice found in JSON."))
+    age_groups = data.get("age_groups") if isinstance(data.get("age_groups"), dict) else None
+    return AdviceIndex(countries, age_groups, goals), tuple(problems)
+
+
+def load_investing_advice(path: Path = INVESTING_ADVICE_JSON) -> Tuple[AdviceIndex, Tuple[Problem, ...]]:
+    """Country-normalized advice index (see advice_index.AdviceIndex)."""
+    return _get(path, "investing_advice", _parse_investing_advice)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Merchant categories (statement_engine)
+# ──────────────────────────────────────────────────────────────────────────────
+def _parse_merchant_rules(path: Path) -> Tuple[CategoryRules, Tuple[Problem, ...]]:
+    data, problems = _read_json(path, "Merchant categories JSON", dict)
+    merchants: Dict[str, str] = {}
+    for name, cat in (data.get("merchants") or {}).items():
+        if isinstance(cat, str) and cat.strip() and name.strip():
+            merchants[" ".join(name.lower().split())] = cat.strip()
+        else:
+            problems.append(Problem("warning", f"Merchant '{name}': category must be a non-empty string; skipping it"))
+    rules: List[Tuple[str, List[str]]] = []
+    for i, r in enumerate(data.get("rules") or []):
+        cat = (r.get("category") or "").strip() if isinstance(r, dict) else ""
+        if not cat:
+            problems.append(Problem("warning", f"Skipping rule #{i}: needs a category"))
+            continue
+        patterns = []
+        for pat in r.get("patterns") or []:
+            try:
+                re.compile(pat)
+            except (re.error, TypeError) as e:
+                problems.append(Problem("warning", f"{cat}: bad pattern {pat!r} ({e}); skipping it"))
+                continue
+            patterns.append(pat)
+        rules.append((cat, patterns))
+    noise = [w.lower() for w in data.get("noise_words") or [] if isinstance(w, str) and w.strip()]
+    if not merchants and not rules and not any(p.level == "error" for p in problems):
+        problems.append(Problem("error", "No merchant categories or rules found in JSON."))
+    return CategoryRules(merchants, rules, noise,
+                         (data.get("income_category") or "Income").strip(),
+                         (data.get("fallback_category") or "Other").strip()), tuple(problems)
+
+
+def load_merchant_rules(path: Path = MERCHANT_CATEGORIES_JSON) -> Tuple[CategoryRules, Tuple[Problem, ...]]:
+    """Merchant table + ordered regex rules for statement_engine."""
+    return _get(path, "merchant_rules", _parse_merchant_rules)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Question difficulty (quiz_irt calibration output)
+# ──────────────────────────────────────────────────────────────────────────────
+def _parse_question_difficulty(path: Path) -> Tuple[Mapping[int, float], Tuple[Problem, ...]]:
+    if not path.exists():
+        return MappingProxyType({}), ()  # not calibrated yet: every question counts as b = 0
+    data, problems = _read_json(path, "Question difficulty JSON", dict)
+    out: Dict[int, float] = {}
+    for qid, row in (data.get("questions") or {}).items():
+        try:
+            out[int(qid)] = float(row["b"])
+        except (ValueError, TypeError, KeyError):
+            problems.append(Problem("warning", f"Question difficulty {qid!r}: needs an integer id and a numeric 'b'"))
+    return MappingProxyType(out), tuple(problems)
+
+
+def load_question_difficulty(path: Path = QUESTION_DIFFICULTY_JSON) -> Tuple[Mapping[int, float], Tuple[Problem, ...]]:
+    """crc32 question id → Rasch difficulty, from `python quiz_irt.py calibrate`."""
+    return _get(path, "question_difficulty", _parse_question_difficulty)
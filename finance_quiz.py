@@ -1,68 +1,92 @@
 import streamlit as st
 import random
+import secrets
 import time
 import json
 from pathlib import Path
 
+import data_loaders
+import quiz_events
+import quiz_irt
+
 # =========================
 #   TIMING (TOTAL = 15s)
 # =========================
 ANSWER_TIME = 10   # seconds to choose
 REVEAL_TIME = 5    # seconds to view answer
 TOTAL_TIME = ANSWER_TIME + REVEAL_TIME
+POLL_INTERVAL = 0.12  # seconds between timer reruns
+RESULTS_PAUSE = 1.0   # "Crunching the results..." pause before the leaderboard
+
+FILES_DIR = Path("files")
+QUESTIONS_PATH = FILES_DIR / "questions.json"
+SCORES_PATH = FILES_DIR / "scores.json"
+
+# Country labels as stored in scores.json rows; keep these spellings so new
+# scores line up with old ones on the leaderboard.
+QUIZ_COUNTRIES = [
+    "Anguilla", "Antigua and Barbuda", "Dominica", "Grenada", "Montserrat",
+    "St. Kitts and Nevis", "St. Lucia", "St. Vincent and the Grenadines", "Other",
+]
+
+# =========================
+#   DATA HELPERS
+# =========================
+def load_questions(path: Path = QUESTIONS_PATH):
+    """Load and validate questions JSON (cached in data_loaders), showing any problems on the page."""
+    items, problems = data_loaders.load_questions(path)
+    for p in problems:
+        (st.error if p.level == "error" else st.warning)(p.message)
+    return list(items)
+
+def sort_leaderboard(scores: list, category: str) -> list:
+    """Scores for one category, best first (accuracy, then raw score, total, name)."""
+    category_scores = [s for s in scores if s.get("category") == category]
+    category_scores.sort(
+        key=lambda x: (
+            x.get("score", 0) / max(1, x.get("total", 1)),
+            x.get("score", 0),
+            x.get("total", 0),
+            x.get("username", "")
+        ),
+        reverse=True
+    )
+    return category_scores
+
+def _difficulty_index() -> quiz_irt.DifficultyIndex:
+    """Questions sorted by calibrated difficulty (rebuilt only when either file changes)."""
+    questions, _ = data_loaders.load_questions()
+    difficulty, _ = data_loaders.load_question_difficulty()
+    return quiz_irt.index_for(questions, difficulty)
+
+def _log_answer(q: dict, correct: bool) -> None:
+    """Record one answer event; adaptive runs also feed it into the ability estimate."""
+    ss = st.session_state
+    latency = ss.answer_latency_ms if ss.answer_latency_ms is not None else ANSWER_TIME * 1000
+    try:
+        quiz_events.log_event(quiz_events.AnswerEvent(quiz_irt.question_id(q), ss.selected_index, correct,
+                                                      latency, ss.quiz_session, time.time()))
+    except Exception:
+        pass
+    if ss.adaptive:
+        ss.ability_answers.append((_difficulty_index().difficulty(q), correct))
+
+def _add_adaptive_question() -> None:
+    """Append the unused question closest to the player's current ability estimate."""
+    ss = st.session_state
+    idx = _difficulty_index()
+    used = {idx.position[qid] for qid in map(quiz_irt.question_id, ss.quiz_questions) if qid in idx.position}
+    nxt = idx.pick(quiz_irt.estimate_ability(ss.ability_answers), used)
+    if nxt is not None:
+        ss.quiz_questions.append(idx.questions[nxt])
 
 def start_quiz():
 
-    FILES_DIR = Path("files")
-    QUESTIONS_PATH = FILES_DIR / "questions.json"
-    SCORES_PATH = FILES_DIR / "scores.json"
     FILES_DIR.mkdir(parents=True, exist_ok=True)
 
     # =========================
     #         HELPERS
     # =========================
-    @st.cache_data(show_spinner=False)
-    def load_questions(path: Path = QUESTIONS_PATH):
-        """Load and validate questions JSON."""
-        if not path.exists():
-            st.error(f"Questions file not found: {path}")
-            return []
-        try:
-            data = json.loads(path.read_text(encoding="utf-8"))
-        except Exception as e:
-            st.error(f"Failed to parse {path}: {e}")
-            return []
-
-        valid = []
-        for i, q in enumerate(data):
-            if not isinstance(q, dict):
-                st.warning(f"Skipping item {i}: not an object")
-                continue
-            question = q.get("question")
-            options = q.get("options")
-            answer = q.get("answer")
-            if not question or not isinstance(question, str):
-                st.warning(f"Skipping item {i}: missing/invalid 'question'")
-                continue
-            if not options or not isinstance(options, list) or not all(isinstance(o, str) for o in options):
-                st.warning(f"Skipping item {i}: missing/invalid 'options'")
-                continue
-            if len(options) < 2 or len(options) > 8:
-                st.warning(f"Skipping item {i}: options must be between 2 and 8")
-                continue
-            if not answer or answer not in options:
-                st.warning(f"Skipping item {i}: 'answer' missing or not in options")
-                continue
-            valid.append({
-                "question": question.strip(),
-                "options": [o.strip() for o in options],
-                "answer": answer.strip(),
-                **{k: v for k, v in q.items() if k not in ("question", "options", "answer")}
-            })
-        if not valid:
-            st.error("No valid questions found in the JSON file.")
-        return valid
-
     def load_scores():
         """Load scores list from file (no cache)."""
         if not SCORES_PATH.exists():
@@ -84,11 +108,7 @@ def start_quiz():
     questions = load_questions()
 
     # ECCB Member States
-    eccb_countries = [
-        "Anguilla", "Antigua and Barbuda", "Dominica", "Grenada",
-        "Montserrat", "St. Kitts and Nevis", "St. Lucia",
-        "St. Vincent and the Grenadines", "Other"
-    ]
+    eccb_countries = QUIZ_COUNTRIES
 
     # Avatar catalog (emoji groups)
     AVATAR_CATALOG = {
@@ -262,6 +282,12 @@ def start_quiz():
     ss.setdefault("scored_flags", {})  # {q_index: bool}
     ss.setdefault("category", None)     # difficulty label
     ss.setdefault("score_saved", False) # prevent double save
+    ss.setdefault("adaptive", False)    # pick each next question to match the player's estimated skill
+    ss.setdefault("quiz_total", 0)
+    ss.setdefault("quiz_session", 0)    # random id tying this run's answer events together
+    ss.setdefault("ability_answers", [])  # [(difficulty, correct)] for the ability estimate
+    ss.setdefault("selected_index", None)
+    ss.setdefault("answer_latency_ms", None)
 
     # =========================
     #       PRE-QUIZ SETUP
@@ -283,6 +309,8 @@ def start_quiz():
         num_questions = min(requested_num, max_available)
         if num_questions < requested_num:
             st.warning(f"Only {max_available} questions available. Using {num_questions}.")
+        adaptive = st.toggle("🎯 Adaptive mode: match each question to my level", value=ss.adaptive,
+                             help="Questions get harder as you get them right and easier when you miss.")
 
         if st.button("🚀 Start Quiz"):
             if username.strip() == "":
@@ -298,7 +326,15 @@ def start_quiz():
                 ss.category = difficulty_choice
                 ss.setup_done = True
 
-                ss.quiz_questions = random.sample(questions, num_questions)
+                ss.adaptive = adaptive
+                ss.quiz_total = num_questions
+                ss.quiz_session = secrets.randbits(63)
+                ss.ability_answers = []
+                if adaptive:
+                    first = _difficulty_index().pick(0.0)
+                    ss.quiz_questions = [_difficulty_index().questions[first]]
+                else:
+                    ss.quiz_questions = random.sample(questions, num_questions)
                 ss.question_index = 0
                 ss.last_run_time = time.time()
                 ss.selected_option = None
@@ -324,6 +360,10 @@ def start_quiz():
                 "total": len(ss.quiz_questions)
             })
             ss.score_saved = True
+            try:
+                quiz_events.get_event_log().flush()  # this quiz's answers, visible to calibrate/stats now
+            except Exception:
+                pass
 
         st.balloons()
         st.markdown(f"## 🎉 Quiz Complete, {ss.username} from {ss.country}!")
@@ -331,20 +371,11 @@ def start_quiz():
         st.progress(ss.score / max(1, len(ss.quiz_questions)))
 
         with st.spinner("Crunching the results..."):
-            time.sleep(1.0)
+            time.sleep(RESULTS_PAUSE)
 
         st.subheader(f"🏅 Leaderboard — {ss.category}")
         scores = load_scores()
-        category_scores = [s for s in scores if s.get("category") == ss.category]
-        category_scores.sort(
-            key=lambda x: (
-                x.get("score", 0) / max(1, x.get("total", 1)),
-                x.get("score", 0),
-                x.get("total", 0),
-                x.get("username", "")
-            ),
-            reverse=True
-        )
+        category_scores = sort_leaderboard(scores, ss.category)
 
         placement = None
         for idx, s in enumerate(category_scores):
@@ -447,6 +478,10 @@ def start_quiz():
                     ss.avatar_kind = None
                     ss.avatar_emoji = None
                     ss.avatar_image_bytes = None
+                    ss.quiz_total = 0
+                    ss.ability_answers = []
+                    ss.selected_index = None
+                    ss.answer_latency_ms = None
                     st.rerun()
 
         st.stop()
@@ -474,7 +509,7 @@ def start_quiz():
     with col_meta:
         st.markdown(
             f"<b>{ss.username}</b> — {ss.country}<br>"
-            f"Question {ss.question_index + 1} of {len(ss.quiz_questions)} | "
+            f"Question {ss.question_index + 1} of {ss.quiz_total or len(ss.quiz_questions)} | "
             f"Score: <b>{ss.score}</b> | Mode: <b>{ss.category}</b>",
             unsafe_allow_html=True
         )
@@ -500,11 +535,13 @@ def start_quiz():
             for i, option in enumerate(q["options"]):
                 if cols[i % 2].button(option, key=f"opt_{ss.question_index}_{i}"):
                     ss.selected_option = option
+                    ss.selected_index = i
+                    ss.answer_latency_ms = int((time.time() - ss.last_run_time) * 1000)
                     # jump straight to reveal phase
                     ss.last_run_time = time.time() - ANSWER_TIME - 0.01
                     st.rerun()
 
-        time.sleep(0.12)
+        time.sleep(POLL_INTERVAL)
         st.rerun()
 
     # === PHASE 2: Reveal Answers (ANSWER_TIME–TOTAL_TIME) ===
@@ -514,9 +551,11 @@ def start_quiz():
 
         qkey = ss.question_index
         if not ss.scored_flags.get(qkey, False):
-            if ss.selected_option == q["answer"]:
+            correct = ss.selected_option == q["answer"]
+            if correct:
                 ss.score += 1
             ss.scored_flags[qkey] = True
+            _log_answer(q, correct)
 
         with answer_placeholder.container():
             for option in q["options"]:
@@ -534,7 +573,7 @@ def start_quiz():
         progress_placeholder.progress(min((elapsed - ANSWER_TIME) / REVEAL_TIME, 1.0))
         info_placeholder.info(f"➡️ Next question in {REVEAL_TIME} seconds...")
 
-        time.sleep(0.12)
+        time.sleep(POLL_INTERVAL)
         st.rerun()
 
     # === PHASE 3: Advance (>= TOTAL_TIME) ===
@@ -548,6 +587,10 @@ def start_quiz():
         ss.question_index += 1
         ss.last_run_time = time.time()
         ss.selected_option = None
+        ss.selected_index = None
+        ss.answer_latency_ms = None
+        if ss.adaptive and len(ss.quiz_questions) < ss.quiz_total:
+            _add_adaptive_question()
 
         st.rerun()
 
@@ -0,0 +1,136 @@
+# hustle_catalog.py
+from __future__ import annotations
+import random
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+# ---------------------------------
+# Side-hustle catalog index
+# ---------------------------------
+# Every attribute value gets an int bitset over the catalog (bit i = hustle i):
+#   remote, low_cost, skill:<tag>, cost:<band>, country:<name>
+# A filter is the AND of a few ints, and the members of any mask are memoized
+# as a tuple, so repeat picks from the same filter combination are O(1).
+COST_BANDS = ("low", "medium", "high")
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOP = frozenset("a an and or the of for to with in on via like as e g etc your you".split())
+
+
+def _tokens(text: str) -> List[str]:
+    return [t for t in _TOKEN.findall((text or "").lower()) if len(t) > 1 and t not in _STOP]
+
+
+def _norm(value: str) -> str:
+    return (value or "").strip().lower().replace(" ", "_").replace("-", "_")
+
+
+class HustleCatalog:
+    """Immutable index over validated hustle dicts (see small_hustles.load_side_hustles)."""
+
+    def __init__(self, hustles: Sequence[Dict[str, Any]]):
+        self.items: Tuple[Mapping[str, Any], ...] = tuple(MappingProxyType(dict(h)) for h in hustles)
+        self.all_mask = (1 << len(self.items)) - 1
+        masks: Dict[str, int] = {}
+        words: Dict[str, int] = {}
+        unrestricted = 0
+        for i, h in enumerate(self.items):
+            bit = 1 << i
+            if h.get("remote"):
+                masks["remote"] = masks.get("remote", 0) | bit
+            if h.get("low_cost"):
+                masks["low_cost"] = masks.get("low_cost", 0) | bit
+            for s in h.get("skills") or ():
+                masks[f"skill:{_norm(s)}"] = masks.get(f"skill:{_norm(s)}", 0) | bit
+            band = h.get("cost_band") or ("low" if h.get("low_cost") else "medium")
+            masks[f"cost:{band}"] = masks.get(f"cost:{band}", 0) | bit
+            countries = h.get("countries") or ()
+            if not countries:
+                unrestricted |= bit  # no list = suitable everywhere
+            for c in countries:
+                masks[f"country:{_norm(c)}"] = masks.get(f"country:{_norm(c)}", 0) | bit
+            text = " ".join([h.get("title", ""), h.get("description", ""), h.get("requirements", ""),
+                             " ".join(h.get("skills") or ())])
+            for tok in set(_tokens(text)):
+                words[tok] = words.get(tok, 0) | bit
+        self.masks: Mapping[str, int] = MappingProxyType(masks)
+        self.unrestricted = unrestricted
+        self.words: Mapping[str, int] = MappingProxyType(words)
+        self._vocab: Tuple[str, ...] = tuple(sorted(words))
+        self._members = lru_cache(maxsize=256)(self._members_uncached)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    # ---------- attributes ----------
+    @property
+    def skills(self) -> List[str]:
+        return sorted(k.split(":", 1)[1] for k in self.masks if k.startswith("skill:"))
+
+    @property
+    def countries(self) -> List[str]:
+        return sorted(k.split(":", 1)[1] for k in self.masks if k.startswith("country:"))
+
+    # ---------- masks ----------
+    def keyword_mask(self, query: str) -> int:
+        """AND over query words; each word matches any indexed word it prefixes ('design' → 'designs')."""
+        mask = self.all_mask
+        for q in _tokens(query):
+            m = self.words.get(q, 0)
+            if not m:
+                for w in self._vocab:
+                    if w.startswith(q):
+                        m |= self.words[w]
+            mask &= m
+            if not mask:
+                break
+        return mask
+
+    def mask_for(
+        self,
+        remote_only: bool = False,
+        low_cost_only: bool = False,
+        skills: Iterable[str] = (),
+        cost_band: Optional[str] = None,
+        country: Optional[str] = None,
+        keyword: Optional[str] = None,
+    ) -> int:
+        mask = self.all_mask
+        if remote_only:
+            mask &= self.masks.get("remote", 0)
+        if low_cost_only:
+            mask &= self.masks.get("low_cost", 0)
+        for s in skills or ():
+            mask &= self.masks.get(f"skill:{_norm(s)}", 0)
+        if cost_band:
+            mask &= self.masks.get(f"cost:{_norm(cost_band)}", 0)
+        if country:
+            mask &= self.masks.get(f"country:{_norm(country)}", 0) | self.unrestricted
+        if keyword:
+            mask &= self.keyword_mask(keyword)
+        return mask
+
+    def _members_uncached(self, mask: int) -> Tuple[int, ...]:
+        out = []
+        while mask:
+            low = mask & -mask
+            out.append(low.bit_length() - 1)
+            mask ^= low
+        return tuple(out)
+
+    # ---------- queries ----------
+    def filter(self, **filters: Any) -> List[Mapping[str, Any]]:
+        return [self.items[i] for i in self._members(self.mask_for(**filters))]
+
+    def count(self, **filters: Any) -> int:
+        return bin(self.mask_for(**filters)).count("1")
+
+    def pick(self, rng: Optional[random.Random] = None, **filters: Any) -> Optional[Dict[str, Any]]:
+        members = self._members(self.mask_for(**filters))
+        if not members:
+            return None
+        return dict(self.items[(rng or random).choice(members)])
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        return [dict(self.items[i]) for i in self._members(self.keyword_mask(query))[:limit]]
@@ -0,0 +1,99 @@
+# image_pipeline.py
+from __future__ import annotations
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+# ---------------------------------
+# Chat image preprocessing
+# ---------------------------------
+# Vision models downscale anything much past ~1.5k px on the long side anyway,
+# so full-resolution phone photos only cost upload time and tokens. Every image
+# in a turn is decoded, EXIF-rotated, shrunk to IMAGE_MAX_SIDE and re-encoded
+# (JPEG, or PNG when it has transparency) on a small thread pool. Pillow
+# releases the GIL while decoding/resizing, so a handful of photos prepare
+# in parallel. The bytes go straight to agno.media.Image(content=...), with no
+# temp files. If re-encoding would not make a small image smaller, its
+# original bytes are kept.
+MAX_SIDE = int(os.getenv("IMAGE_MAX_SIDE", "1568"))
+JPEG_QUALITY = int(os.getenv("IMAGE_JPEG_QUALITY", "85"))
+MAX_IMAGES = int(os.getenv("IMAGE_MAX_PER_TURN", "4"))
+
+_pool = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="image-prep")
+_PASSTHROUGH = {"JPEG": "jpeg", "PNG": "png", "WEBP": "webp"}  # formats models accept as-is
+
+
+class PreparedImage(NamedTuple):
+    name: str
+    content: bytes
+    format: str           # "jpeg" | "png" | "webp"
+    size: Tuple[int, int]
+    original_bytes: int
+
+    @property
+    def saved(self) -> int:
+        return self.original_bytes - len(self.content)
+
+
+def prepare(data: bytes, name: str = "image", max_side: int = MAX_SIDE,
+            quality: int = JPEG_QUALITY) -> Optional[PreparedImage]:
+    """Downsized, re-encoded copy of one image; None if Pillow can't read it."""
+    from PIL import Image, ImageOps
+
+    try:
+        img = Image.open(io.BytesIO(data))
+        fmt, original_size = img.format, img.size
+        if fmt == "JPEG":
+            img.draft("RGB", (max_side, max_side))  # decode at 1/2, 1/4, 1/8 scale when possible
+        img = ImageOps.exif_transpose(img)          # also loads the first frame of GIF/WebP animations
+    except Exception:
+        return None
+
+    resized = max(original_size) > max_side
+    if max(img.size) > max_side:
+        img.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+
+    alpha = img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info)
+    buf = io.BytesIO()
+    if alpha:
+        img.convert("RGBA").save(buf, "PNG", optimize=True)
+        out_fmt = "png"
+    else:
+        img.convert("RGB").save(buf, "JPEG", quality=quality, optimize=True, progressive=True)
+        out_fmt = "jpeg"
+    content = buf.getvalue()
+
+    if not resized and fmt in _PASSTHROUGH and len(data) <= len(content):
+        content, out_fmt = data, _PASSTHROUGH[fmt]
+    return PreparedImage(name, content, out_fmt, img.size, len(data))
+
+
+def prepare_many(items: Iterable[Tuple[str, bytes]], max_images: int = MAX_IMAGES) -> List[PreparedImage]:
+    """(name, bytes) pairs → prepared images in upload order, unreadable ones dropped."""
+    items = list(items)[:max_images]
+    if len(items) == 1:
+        done = [prepare(items[0][1], items[0][0])]
+    else:
+        done = list(_pool.map(lambda it: prepare(it[1], it[0]), items))
+    return [p for p in done if p is not None]
+
+
+def agno_images(prepared: Iterable[PreparedImage]) -> list:
+    from agno.media import Image
+    return [Image(content=p.content, format=p.format) for p in prepared]
+
+
+def _size(n: int) -> str:
+    return f"{n / 1024 / 1024:.1f} MB" if n >= 1 << 20 else f"{n / 1024:.0f} KB"
+
+
+def savings_note(prepared: List[PreparedImage]) -> str:
+    """'🖼️ 3 images: 9.8 MB → 640 KB (93% smaller)'."""
+    before = sum(p.original_bytes for p in prepared)
+    after = sum(len(p.content) for p in prepared)
+    if not prepared or not before:
+        return ""
+    plural = "s" if len(prepared) != 1 else ""
+    pct = f" ({1 - after / before:.0%} smaller)" if after < before else ""
+    return f"🖼️ {len(prepared)} image{plural}: {_size(before)} → {_size(after)}{pct}"
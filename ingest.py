@@ -0,0 +1,138 @@
+# ingest.py
+"""
+Memory-bounded ingestion for chat uploads.
+
+An upload is read once, in CHUNK_BYTES pieces, and each piece is:
+  * hashed (sha256) and written to files/uploads/<aa>/<sha256><ext>, so the
+    raw bytes live on disk, addressed by content, and the same file uploaded
+    twice is stored once;
+  * decoded incrementally with the encoding sniffed from the first chunk
+    (BOM, then strict UTF-8, then cp1252), until MAX_TEXT_CHARS of text have
+    been collected. The rest is only hashed and stored.
+
+Chat history keeps the capped text plus an `Upload` reference, never the raw
+upload, and never more than one decoded copy. Uploads over MAX_UPLOAD_BYTES
+are rejected without storing anything.
+
+    INGEST_MAX_BYTES   largest accepted upload in bytes   (default 25 MB)
+    INGEST_MAX_CHARS   text passed on to the chat/agent   (default 60,000)
+"""
+from __future__ import annotations
+import codecs
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, NamedTuple, Optional
+
+UPLOAD_DIR = Path(os.getenv("UPLOAD_DIR", "files/uploads"))
+CHUNK_BYTES = 1 << 20
+MAX_UPLOAD_BYTES = int(os.getenv("INGEST_MAX_BYTES", str(25 * 1024 * 1024)))
+MAX_TEXT_CHARS = int(os.getenv("INGEST_MAX_CHARS", "60000"))
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"), (codecs.BOM_UTF32_BE, "utf-32"),  # before UTF-16: same first two bytes
+    (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+class UploadTooLarge(ValueError):
+    def __init__(self, name: str, limit: int):
+        shown = f"{limit / 1024 / 1024:.0f} MB" if limit >= 1 << 20 else f"{limit:,} byte"
+        super().__init__(f"{name} is larger than the {shown} upload limit")
+        self.name, self.limit = name, limit
+
+
+class Upload(NamedTuple):
+    sha256: str
+    name: str
+    size: int
+    path: str       # files/uploads/… (relative when UPLOAD_DIR is)
+
+    def ref(self) -> dict:
+        """JSON-safe reference for chat history and conversation logs."""
+        return self._asdict()
+
+
+class Ingested(NamedTuple):
+    upload: Upload
+    text: str             # decoded prefix, at most max_chars ("" when decode=False)
+    encoding: Optional[str]
+    truncated: bool       # text stops before the end of the file
+
+
+def sniff_encoding(prefix: bytes) -> str:
+    """Encoding for the whole upload, judged on its first chunk."""
+    for bom, enc in _BOMS:
+        if prefix.startswith(bom):
+            return enc
+    try:
+        # final=False: a multi-byte character cut at the chunk edge is not an error
+        codecs.getincrementaldecoder("utf-8")().decode(prefix, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "cp1252"
+
+
+def path_for(sha256: str, suffix: str = "") -> Path:
+    return UPLOAD_DIR / sha256[:2] / f"{sha256}{suffix}"
+
+
+def ingest(file: BinaryIO, name: Optional[str] = None, decode: bool = True,
+           max_chars: int = MAX_TEXT_CHARS, max_bytes: int = MAX_UPLOAD_BYTES) -> Ingested:
+    """Stream `file` to content-addressed storage, decoding at most `max_chars` of it on the way."""
+    name = name or getattr(file, "name", None) or "upload"
+    size = getattr(file, "size", None)
+    if size is not None and size > max_bytes:
+        raise UploadTooLarge(name, max_bytes)
+    if hasattr(file, "seek"):
+        file.seek(0)
+
+    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    decoder, encoding = None, None
+    parts, chars, truncated, total = [], 0, False, 0
+    fd, tmp = tempfile.mkstemp(dir=UPLOAD_DIR, prefix=".incoming-")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := file.read(CHUNK_BYTES):
+                total += len(chunk)
+                if total > max_bytes:
+                    raise UploadTooLarge(name, max_bytes)
+                digest.update(chunk)
+                out.write(chunk)
+                if decode and not truncated:
+                    if decoder is None:
+                        encoding = sniff_encoding(chunk)
+                        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+                    text = decoder.decode(chunk)
+                    if chars + len(text) > max_chars:
+                        text, truncated = text[:max_chars - chars], True
+                    parts.append(text)
+                    chars += len(text)
+        if decoder is not None and not truncated:
+            parts.append(decoder.decode(b"", final=True))
+
+        sha = digest.hexdigest()
+        dest = path_for(sha, Path(name).suffix.lower()[:10])
+        if dest.exists():
+            os.unlink(tmp)
+        else:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp, dest)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    finally:
+        if hasattr(file, "seek"):
+            file.seek(0)
+
+    return Ingested(Upload(sha, name, total, str(dest)), "".join(parts), encoding, truncated)
+
+
+def open_upload(upload: Upload | dict) -> BinaryIO:
+    """Re-open stored bytes from an Upload or its ref() dict."""
+    path = upload["path"] if isinstance(upload, dict) else upload.path
+    return open(path, "rb")
@@ -0,0 +1,189 @@
+# loadtest/mock_openrouter.py
+"""
+Local stand-in for the OpenRouter chat completions API.
+
+    python loadtest/mock_openrouter.py --port 8765 --tps 40 --ttft-ms 300 --tool-rate 0.5
+
+Speaks the OpenAI-compatible /v1/chat/completions protocol (streaming SSE and
+plain JSON). Replies are scripted: after `--ttft-ms` the server streams
+`--tokens` words at `--tps` tokens/sec. With probability `--tool-rate` the
+first round of a turn asks for one of our local tools instead (never the web
+search tools), so the agent's tool loop runs without touching the network.
+Point the app at it with OPENROUTER_BASE_URL=http://127.0.0.1:8765/v1.
+"""
+from __future__ import annotations
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+# Local, offline tools the scripted model may call (first match in the request's tool list wins)
+SAFE_TOOLS = ["generate_business_idea", "get_random_side_job", "commonscams2", "investing_advice"]
+TOOL_ARGS = {
+    "generate_business_idea": {"count": 1},
+    "get_random_side_job": {"remote_only": True},
+    "commonscams2": {"show_one": True},
+    "investing_advice": {"country": "Dominica", "age_group": "youth"},
+}
+WORDS = ("Here is a practical plan for your EC$ budget: set aside savings first, "
+         "track spending weekly, and build a small emergency fund before investing. ").split()
+
+
+class ScriptConfig:
+    def __init__(self, tps: float = 40.0, ttft_ms: float = 300.0, tokens: int = 120, tool_rate: float = 0.3, seed: Optional[int] = None):
+        self.tps = max(1.0, tps)
+        self.ttft_ms = max(0.0, ttft_ms)
+        self.tokens = max(1, tokens)
+        self.tool_rate = min(1.0, max(0.0, tool_rate))
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.tool_calls = 0
+        self.tokens_sent = 0
+
+    def roll_tool(self) -> bool:
+        with self.lock:
+            return self.rng.random() < self.tool_rate
+
+
+def _pick_tool(body: dict) -> Optional[str]:
+    offered = {(t.get("function") or {}).get("name") for t in body.get("tools") or []}
+    for name in SAFE_TOOLS:
+        if name in offered:
+            return name
+    return None
+
+
+def _wants_tool(body: dict, cfg: ScriptConfig) -> Optional[str]:
+    msgs = body.get("messages") or []
+    if msgs and msgs[-1].get("role") == "tool":
+        return None  # second round of the turn: answer with text
+    name = _pick_tool(body)
+    return name if name and cfg.roll_tool() else None
+
+
+class Handler(BaseHTTPRequestHandler):
+    cfg: ScriptConfig = ScriptConfig()
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):  # keep the harness output readable
+        pass
+
+    def _json(self, code: int, payload: dict) -> None:
+        raw = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._json(200, {"data": [{"id": "mock/model", "object": "model"}]})
+        else:
+            self._json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._json(404, {"error": "not found"})
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+        cfg = self.cfg
+        with cfg.lock:
+            cfg.requests += 1
+        tool = _wants_tool(body, cfg)
+        model = body.get("model") or "mock/model"
+        cid = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        time.sleep(cfg.ttft_ms / 1000.0)
+
+        if not body.get("stream"):
+            self._json(200, self._completion(cid, model, tool))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def send(delta: dict, finish: Optional[str] = None, usage: Optional[dict] = None):
+            chunk = {"id": cid, "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                     "choices": [{"index": 0, "delta": delta, "finish_reason": finish}]}
+            if usage:
+                chunk["usage"] = usage
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+
+        try:
+            send({"role": "assistant", "content": ""})
+            if tool:
+                with cfg.lock:
+                    cfg.tool_calls += 1
+                send({"tool_calls": [{"index": 0, "id": f"call_{uuid.uuid4().hex[:8]}", "type": "function",
+                                      "function": {"name": tool, "arguments": json.dumps(TOOL_ARGS.get(tool, {}))}}]})
+                send({}, finish="tool_calls", usage={"prompt_tokens": 900, "completion_tokens": 12, "total_tokens": 912})
+            else:
+                gap = 1.0 / cfg.tps
+                for i in range(cfg.tokens):
+                    send({"content": WORDS[i % len(WORDS)] + " "})
+                    time.sleep(gap)
+                with cfg.lock:
+                    cfg.tokens_sent += cfg.tokens
+                send({}, finish="stop", usage={"prompt_tokens": 900, "completion_tokens": cfg.tokens,
+                                               "total_tokens": 900 + cfg.tokens})
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _completion(self, cid: str, model: str, tool: Optional[str]) -> dict:
+        if tool:
+            msg = {"role": "assistant", "content": None, "tool_calls": [{
+                "id": f"call_{uuid.uuid4().hex[:8]}", "type": "function",
+                "function": {"name": tool, "arguments": json.dumps(TOOL_ARGS.get(tool, {}))}}]}
+            finish = "tool_calls"
+        else:
+            time.sleep(self.cfg.tokens / self.cfg.tps)
+            msg = {"role": "assistant", "content": " ".join(WORDS[i % len(WORDS)] for i in range(self.cfg.tokens))}
+            finish = "stop"
+        return {"id": cid, "object": "chat.completion", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "message": msg, "finish_reason": finish}],
+                "usage": {"prompt_tokens": 900, "completion_tokens": self.cfg.tokens, "total_tokens": 900 + self.cfg.tokens}}
+
+
+def serve(host: str = "127.0.0.1", port: int = 8765, cfg: Optional[ScriptConfig] = None) -> ThreadingHTTPServer:
+    """Start the server on a daemon thread and return it (port 0 picks a free port)."""
+    handler = type("ScriptedHandler", (Handler,), {"cfg": cfg or ScriptConfig()})
+    httpd = ThreadingHTTPServer((host, port), handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, name="mock-openrouter", daemon=True).start()
+    return httpd
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Scripted OpenAI-compatible server for load tests.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--tps", type=float, default=40.0, help="streamed tokens per second")
+    ap.add_argument("--ttft-ms", type=float, default=300.0, help="delay before the first chunk")
+    ap.add_argument("--tokens", type=int, default=120, help="tokens per text reply")
+    ap.add_argument("--tool-rate", type=float, default=0.3, help="chance the first round calls a tool")
+    ap.add_argument("--seed", type=int, default=None)
+    args = ap.parse_args()
+    cfg = ScriptConfig(args.tps, args.ttft_ms, args.tokens, args.tool_rate, args.seed)
+    httpd = serve(args.host, args.port, cfg)
+    print(f"Mock OpenRouter on http://{args.host}:{httpd.server_address[1]}/v1  (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        httpd.shutdown()
+
+
+if __name__ == "__main__":
+    main()
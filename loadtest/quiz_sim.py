@@ -0,0 +1,252 @@
+# loadtest/quiz_sim.py
+"""
+Headless simulation of many simultaneous quiz players.
+
+    python loadtest/quiz_sim.py --players 200 --answer-s 2 --reveal-s 1 --ramp-s 0
+
+Each player is a Streamlit AppTest session running the real `start_quiz()`:
+it fills in the setup form, clicks Start, and then the quiz's own timer loop
+(`st.rerun()` every POLL_INTERVAL) drives it to the end. A hook that runs
+before every script execution plays the part of the human: after a random
+think time it picks an option, exactly like the option button handler.
+
+The question timers are shortened (--answer-s/--reveal-s) so a run takes
+seconds, while the poll interval stays at the app's real 120 ms unless
+--poll-s says otherwise. Players start together (or spread over --ramp-s),
+so they finish together and race on files/scores.json the way a classroom
+does.
+
+Reported:
+  reruns/sec       script executions across all sessions (the server's work)
+  CPU / RSS        this process, which is the app server (sessions run in-process)
+  lost updates     completed quizzes whose score row is missing from scores.json
+  leaderboard ms   end-of-quiz render: save, reload, sort, podium and top 10
+
+Runs against a throwaway copy of files/; the real scores are never touched.
+"""
+from __future__ import annotations
+import argparse
+import json
+import logging
+import os
+import random
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from run_chat_load import ResourceSampler, _pct  # noqa: E402
+
+# The AppTest script imports this module by name; alias it when run as __main__
+sys.modules.setdefault("quiz_sim", sys.modules[__name__])
+
+SCRIPT = """
+import quiz_sim
+from finance_quiz import start_quiz
+quiz_sim.before_run()
+start_quiz()
+"""
+
+
+class SimCounters:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reruns = 0
+        self.answers = 0
+
+    def add(self, **kw) -> None:
+        with self.lock:
+            for k, v in kw.items():
+                setattr(self, k, getattr(self, k) + v)
+
+
+COUNTERS = SimCounters()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Hooks run inside each session's script execution
+# ──────────────────────────────────────────────────────────────────────────────
+def before_run() -> None:
+    import streamlit as st
+    import finance_quiz as fq
+
+    COUNTERS.add(reruns=1)
+    ss = st.session_state
+    sim = ss.get("_sim")
+    if not sim or not ss.get("setup_done"):
+        return
+    qs = ss.get("quiz_questions") or []
+    i = ss.get("question_index", 0)
+    if i >= len(qs):
+        if not ss.get("score_saved") and "_sim_lb_t0" not in ss:
+            ss["_sim_lb_t0"] = time.perf_counter()  # end screen starts rendering
+        return
+    if ss.get("selected_option") is not None or not ss.get("last_run_time"):
+        return
+    elapsed = time.time() - ss.last_run_time
+    rng = random.Random(f"{sim['id']}:{i}")
+    think = rng.uniform(0.2, 1.2) * fq.ANSWER_TIME
+    if think <= elapsed < fq.ANSWER_TIME:
+        q = qs[i]
+        wrong = [o for o in q["options"] if o != q["answer"]]
+        pick = q["answer"] if rng.random() < sim["accuracy"] or not wrong else rng.choice(wrong)
+        # same effect as clicking the option button (finance_quiz start_quiz, phase 1)
+        ss.selected_option = pick
+        ss.selected_index = q["options"].index(pick)
+        ss.answer_latency_ms = int(elapsed * 1000)
+        ss.last_run_time = time.time() - fq.ANSWER_TIME - 0.01
+        COUNTERS.add(answers=1)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Driver
+# ──────────────────────────────────────────────────────────────────────────────
+def _prepare_workdir(keep: Optional[str], seed_scores: int) -> Path:
+    work = Path(keep) if keep else Path(tempfile.mkdtemp(prefix="eccb-quiz-"))
+    (work / "files").mkdir(parents=True, exist_ok=True)
+    shutil.copy(ROOT / "files" / "questions.json", work / "files" / "questions.json")
+    if seed_scores >= 0:
+        rng = random.Random(11)
+        rows = [{"username": f"seed{i}", "country": "Dominica", "avatar": "🐢", "category": "Easy Peasy (5)",
+                 "score": rng.randint(0, 5), "total": 5} for i in range(seed_scores)]
+        (work / "files" / "scores.json").write_text(json.dumps(rows, indent=2), encoding="utf-8")
+    else:
+        shutil.copy(ROOT / "files" / "scores.json", work / "files" / "scores.json")
+    return work
+
+
+def run_player(i: int, category: str, delay: float, timeout: float) -> Dict:
+    from streamlit.testing.v1 import AppTest
+
+    time.sleep(delay)
+    t0 = time.perf_counter()
+    at = AppTest.from_string(SCRIPT, default_timeout=timeout)
+    at.session_state["_sim"] = {"id": i, "accuracy": random.Random(i).uniform(0.3, 0.9)}
+    err, lb_ms, resumes = None, None, 0
+    try:
+        at.run()
+        at.text_input[0].set_value(f"player{i}")
+        next(s for s in at.selectbox if s.label.startswith("Select difficulty")).set_value(category)
+        at.run()
+        next(b for b in at.button if "Start Quiz" in b.label).click().run()
+        # Under heavy thread contention AppTest occasionally hands back control
+        # between two timer reruns; carry on like a browser would.
+        deadline = time.perf_counter() + timeout
+        while (not at.exception and not at.session_state["score_saved"]
+               and time.perf_counter() < deadline):
+            at.run()
+            resumes += 1
+        done = time.perf_counter()
+        if at.exception:
+            err = str(at.exception[0].value)
+        elif not at.session_state["score_saved"]:
+            err = f"quiz stopped at question {at.session_state['question_index']}"
+        else:
+            # the click's run returns once the end screen is fully rendered
+            lb_ms = (done - at.session_state["_sim_lb_t0"]) * 1000
+    except Exception as e:
+        err = str(e)
+    return {"player": i, "ms": (time.perf_counter() - t0) * 1000, "error": err, "leaderboard_ms": lb_ms,
+            "resumes": resumes, "saved": err is None}
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Simulate concurrent quiz sessions.")
+    ap.add_argument("--players", type=int, default=100)
+    ap.add_argument("--category", default="Easy Peasy (5)", help="difficulty label (sets question count)")
+    ap.add_argument("--answer-s", type=float, default=2.0, help="answer phase length (app: 10)")
+    ap.add_argument("--reveal-s", type=float, default=1.0, help="reveal phase length (app: 5)")
+    ap.add_argument("--poll-s", type=float, default=None, help="timer rerun interval (app: 0.12)")
+    ap.add_argument("--results-pause-s", type=float, default=0.0, help="'Crunching' pause (app: 1.0)")
+    ap.add_argument("--ramp-s", type=float, default=0.0, help="spread player starts over this many seconds")
+    ap.add_argument("--seed-scores", type=int, default=2000,
+                    help="pre-fill scores.json with N rows (-1 = copy the real file)")
+    ap.add_argument("--timeout", type=float, default=600.0, help="per-session script timeout (s)")
+    ap.add_argument("--workdir", default=None)
+    ap.add_argument("--json", dest="json_out", default=None)
+    args = ap.parse_args()
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    import finance_quiz as fq
+    fq.ANSWER_TIME = args.answer_s
+    fq.REVEAL_TIME = args.reveal_s
+    fq.TOTAL_TIME = args.answer_s + args.reveal_s
+    fq.RESULTS_PAUSE = args.results_pause_s
+    if args.poll_s is not None:
+        fq.POLL_INTERVAL = args.poll_s
+
+    json_out = Path(args.json_out).resolve() if args.json_out else None
+    work = _prepare_workdir(args.workdir, args.seed_scores)
+    os.chdir(work)
+    scores_path = work / "files" / "scores.json"
+    rows_before = len(json.loads(scores_path.read_text(encoding="utf-8")))
+
+    sampler = ResourceSampler()
+    sampler.start()
+    cpu0 = resource.getrusage(resource.RUSAGE_SELF)
+    t0 = time.perf_counter()
+    delays = [args.ramp_s * i / max(1, args.players - 1) for i in range(args.players)]
+    with ThreadPoolExecutor(max_workers=args.players) as pool:
+        results = list(pool.map(lambda i: run_player(i, args.category, delays[i], args.timeout), range(args.players)))
+    wall = time.perf_counter() - t0
+    cpu1 = resource.getrusage(resource.RUSAGE_SELF)
+    sampler.stop()
+
+    try:
+        rows_after: Optional[int] = len(json.loads(scores_path.read_text(encoding="utf-8")))
+    except Exception:
+        rows_after = None  # the file itself was left corrupt
+    saved = sum(1 for r in results if r["saved"])
+    lb = [r["leaderboard_ms"] for r in results if r["leaderboard_ms"] is not None]
+    cpu_s = (cpu1.ru_utime - cpu0.ru_utime) + (cpu1.ru_stime - cpu0.ru_stime)
+    report = {
+        "players": args.players,
+        "category": args.category,
+        "timing_s": {"answer": fq.ANSWER_TIME, "reveal": fq.REVEAL_TIME, "poll": fq.POLL_INTERVAL,
+                     "results_pause": fq.RESULTS_PAUSE, "ramp": args.ramp_s},
+        "completed": saved,
+        "failed": sum(1 for r in results if r["error"]),
+        "wall_s": round(wall, 2),
+        "reruns": COUNTERS.reruns,
+        "reruns_per_s": round(COUNTERS.reruns / wall, 1) if wall else None,
+        "reruns_per_s_per_player": round(COUNTERS.reruns / wall / max(1, args.players), 2) if wall else None,
+        "answers": COUNTERS.answers,
+        "resumes": sum(r["resumes"] for r in results),
+        "session_s": {"p50": _pct([r["ms"] / 1000 for r in results], 50),
+                      "p95": _pct([r["ms"] / 1000 for r in results], 95)},
+        "scores_file": {
+            "rows_before": rows_before,
+            "rows_after": rows_after,
+            "expected_after": rows_before + saved,
+            "lost_updates": None if rows_after is None else rows_before + saved - rows_after,
+            "corrupt": rows_after is None,
+        },
+        "leaderboard_ms": {"p50": _pct(lb, 50), "p95": _pct(lb, 95), "max": round(max(lb), 1) if lb else None,
+                           "mean": round(statistics.mean(lb), 1) if lb else None},
+        "server": {
+            "cpu_s": round(cpu_s, 2),
+            "cpu_util_pct": round(100 * cpu_s / wall, 1) if wall else None,
+            "rss_peak_mb": round(max(sampler.samples), 1) if sampler.samples else None,
+            "maxrss_mb": round(cpu1.ru_maxrss / 1024.0, 1),
+        },
+        "errors": sorted({r["error"] for r in results if r["error"]})[:5],
+        "workdir": str(work),
+    }
+    print(json.dumps(report, indent=2))
+    if json_out:
+        json_out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0 if not report["failed"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,219 @@
+# loadtest/run_chat_load.py
+"""
+Drive N concurrent chat sessions through `render_chatbot` against the mock LLM.
+
+    python loadtest/run_chat_load.py --users 20 --turns 3 --tps 40 --ttft-ms 300
+
+Each virtual user is a Streamlit AppTest session (the real script, widgets and
+session state, minus the browser). The scripted server from
+mock_openrouter.py stands in for OpenRouter, so no tokens are spent and no
+search tools are hit. The app runs against a throwaway copy of files/ so
+profiles, logs and metrics from the run never touch the real data.
+
+Reports client-side turn latency, time to first token (from the app's own
+turn metrics, see telemetry.py), throughput, and this process's CPU and
+memory — which is the app server, since sessions run in-process.
+"""
+from __future__ import annotations
+import argparse
+import json
+import logging
+import os
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+PROMPTS = [
+    "Help me budget EC$2,000 a month.",
+    "Give me a side hustle idea I can do remotely.",
+    "What scams should I watch out for in the Caribbean?",
+    "How should a student in Dominica start saving?",
+]
+
+SCRIPT = """
+from chatbot import render_chatbot
+render_chatbot()
+"""
+
+
+def _profile(i: int) -> dict:
+    return {
+        "setup_complete": True, "name": f"Load {i}", "role": "Student", "home_region": "ECCU",
+        "country": "Dominica", "base_currency": "XCD", "tone": "Friendly", "goals": ["Budgeting"],
+        "email": f"load{i}@example.com", "allow_location": False, "is_eccu": True,
+    }
+
+
+def _pct(xs: List[float], q: float) -> Optional[float]:
+    if not xs:
+        return None
+    xs = sorted(xs)
+    return round(xs[min(len(xs) - 1, int(round(q / 100 * (len(xs) - 1))))], 1)
+
+
+class ResourceSampler(threading.Thread):
+    """Samples this process's RSS (Linux /proc) every `interval` seconds."""
+
+    def __init__(self, interval: float = 0.25):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.samples: List[float] = []
+        self._halt = threading.Event()
+
+    @staticmethod
+    def rss_mb() -> Optional[float]:
+        try:
+            with open("/proc/self/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) / 1024.0
+        except OSError:
+            return None
+        return None
+
+    def run(self):
+        while not self._halt.wait(self.interval):
+            v = self.rss_mb()
+            if v is not None:
+                self.samples.append(v)
+
+    def stop(self):
+        self._halt.set()
+
+
+def _prepare_workdir(keep: Optional[str]) -> Path:
+    work = Path(keep) if keep else Path(tempfile.mkdtemp(prefix="eccb-load-"))
+    (work / "files").mkdir(parents=True, exist_ok=True)
+    for name in ("questions.json", "side_huslte_options.json", "scores.json"):
+        src = ROOT / "files" / name
+        if src.exists():
+            shutil.copy(src, work / "files" / name)
+    if (ROOT / "images").exists() and not (work / "images").exists():
+        shutil.copytree(ROOT / "images", work / "images")
+    return work
+
+
+def run_user(i: int, turns: int, timeout: float) -> List[Dict]:
+    from streamlit.testing.v1 import AppTest
+
+    out = []
+    at = AppTest.from_string(SCRIPT, default_timeout=timeout)
+    at.session_state["user_profile"] = _profile(i)
+    at.session_state["messages"] = []  # start fresh instead of resuming
+    at.run()
+    for t in range(turns):
+        prompt = PROMPTS[(i + t) % len(PROMPTS)]
+        t0 = time.perf_counter()
+        err = None
+        try:
+            at.chat_input[0].set_value(prompt).run()
+            if at.exception:
+                err = str(at.exception[0].value)
+        except Exception as e:
+            err = str(e)
+        out.append({"user": i, "turn": t, "ms": (time.perf_counter() - t0) * 1000, "error": err})
+    return out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Concurrent chat load test against a mock LLM.")
+    ap.add_argument("--users", type=int, default=10)
+    ap.add_argument("--turns", type=int, default=3)
+    ap.add_argument("--server-url", default=None, help="use an already running mock (…/v1)")
+    ap.add_argument("--tps", type=float, default=40.0)
+    ap.add_argument("--ttft-ms", type=float, default=300.0)
+    ap.add_argument("--tokens", type=int, default=120)
+    ap.add_argument("--tool-rate", type=float, default=0.3)
+    ap.add_argument("--timeout", type=float, default=120.0, help="per-turn script timeout (s)")
+    ap.add_argument("--workdir", default=None, help="keep run artifacts here instead of a temp dir")
+    ap.add_argument("--json", dest="json_out", default=None, help="also write the report to this file")
+    args = ap.parse_args()
+    logging.getLogger("streamlit").setLevel(logging.ERROR)  # bare-mode context warnings from tool threads
+
+    from mock_openrouter import ScriptConfig, serve
+
+    cfg = None
+    if args.server_url:
+        base_url = args.server_url
+    else:
+        cfg = ScriptConfig(args.tps, args.ttft_ms, args.tokens, args.tool_rate, seed=7)
+        httpd = serve(port=0, cfg=cfg)
+        base_url = f"http://127.0.0.1:{httpd.server_address[1]}/v1"
+
+    json_out = Path(args.json_out).resolve() if args.json_out else None
+    work = _prepare_workdir(args.workdir)
+    os.chdir(work)
+    os.environ.update({
+        "OPENROUTER_API_KEY": "mock-key",
+        "OPENROUTER_MODEL": "mock/model",
+        "OPENROUTER_BASE_URL": base_url,
+        "TURN_METRICS_PATH": str(work / "files" / "metrics" / "turns.jsonl"),
+    })
+
+    sampler = ResourceSampler()
+    sampler.start()
+    cpu0 = resource.getrusage(resource.RUSAGE_SELF)
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.users) as pool:
+        results = [r for rs in pool.map(lambda i: run_user(i, args.turns, args.timeout), range(args.users)) for r in rs]
+    wall = time.perf_counter() - t0
+    cpu1 = resource.getrusage(resource.RUSAGE_SELF)
+    sampler.stop()
+
+    from log_writer import get_writer
+    get_writer().flush()
+    metrics_path = Path(os.environ["TURN_METRICS_PATH"])
+    ttft, total = [], []
+    if metrics_path.exists():
+        for line in metrics_path.read_text(encoding="utf-8").splitlines():
+            try:
+                m = json.loads(line)["timings"]
+            except Exception:
+                continue
+            if m.get("ttft_ms") is not None:
+                ttft.append(m["ttft_ms"])
+            if m.get("total_ms") is not None:
+                total.append(m["total_ms"])
+
+    ok = [r["ms"] for r in results if not r["error"]]
+    cpu_s = (cpu1.ru_utime - cpu0.ru_utime) + (cpu1.ru_stime - cpu0.ru_stime)
+    report = {
+        "users": args.users,
+        "turns_per_user": args.turns,
+        "turns_ok": len(ok),
+        "turns_failed": len(results) - len(ok),
+        "wall_s": round(wall, 2),
+        "throughput_turns_per_s": round(len(ok) / wall, 2) if wall else None,
+        "turn_ms": {"p50": _pct(ok, 50), "p95": _pct(ok, 95), "mean": round(statistics.mean(ok), 1) if ok else None},
+        "ttft_ms": {"p50": _pct(ttft, 50), "p95": _pct(ttft, 95)},
+        "stream_total_ms": {"p50": _pct(total, 50), "p95": _pct(total, 95)},
+        "server": {
+            "cpu_s": round(cpu_s, 2),
+            "cpu_util_pct": round(100 * cpu_s / wall, 1) if wall else None,
+            "rss_peak_mb": round(max(sampler.samples), 1) if sampler.samples else None,
+            "rss_mean_mb": round(statistics.mean(sampler.samples), 1) if sampler.samples else None,
+            "maxrss_mb": round(cpu1.ru_maxrss / 1024.0, 1),
+        },
+        "mock": {"requests": cfg.requests, "tool_calls": cfg.tool_calls, "tokens_streamed": cfg.tokens_sent} if cfg else None,
+        "errors": sorted({r["error"] for r in results if r["error"]})[:5],
+        "workdir": str(work),
+    }
+    print(json.dumps(report, indent=2))
+    if json_out:
+        json_out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0 if not report["turns_failed"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,147 @@
+# log_writer.py
+from __future__ import annotations
+import atexit
+import gzip
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+from pathlib import Path
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Tunables (override with env vars when deploying)
+# ──────────────────────────────────────────────────────────────────────────────
+MAX_BATCH = int(os.getenv("LOG_MAX_BATCH", "64"))              # entries per flush
+FLUSH_INTERVAL = float(os.getenv("LOG_FLUSH_INTERVAL", "1.0"))  # seconds between flushes
+MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(2 * 1024 * 1024)))  # rotate above this size
+BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))         # compressed archives kept per file
+
+
+def rotated_path(path: Path, n: int) -> Path:
+    """`files/conversations/x.jsonl` -> `files/conversations/x.1.jsonl.gz`."""
+    return path.with_name(f"{path.stem}.{n}{path.suffix}.gz")
+
+
+class JsonlLogWriter:
+    """
+    Background JSON Lines writer.
+
+    `write()` only puts the entry on a queue, so the Streamlit render path never
+    touches the disk. A daemon thread drains the queue, groups entries per file
+    and appends each group with a single open/write, flushing when MAX_BATCH
+    entries are pending or FLUSH_INTERVAL has passed. Files above MAX_BYTES are
+    rotated into gzip archives (x.1.jsonl.gz is the newest).
+    """
+
+    def __init__(self, max_batch: int = MAX_BATCH, flush_interval: float = FLUSH_INTERVAL,
+                 max_bytes: int = MAX_BYTES, backup_count: int = BACKUP_COUNT):
+        self.max_batch = max(1, max_batch)
+        self.flush_interval = max(0.05, flush_interval)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._q: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._io_lock = threading.Lock()  # held while a batch is being written
+
+    # ---------- producer side ----------
+    def write(self, path: Path | str, entry: dict) -> None:
+        """Queue one entry for `path`; returns immediately."""
+        self._ensure_thread()
+        self._q.put((Path(path), entry))
+
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """Block until everything queued so far is on disk. Returns False on timeout."""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._q.put(done)
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        self.flush()
+
+    # ---------- consumer side ----------
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="jsonl-log-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        pending: dict[Path, list[str]] = {}
+        count = 0
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            waiters: list[threading.Event] = []
+            try:
+                item = self._q.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+            elif item is not None:
+                path, entry = item
+                pending.setdefault(path, []).append(json.dumps(entry, ensure_ascii=False) + "\n")
+                count += 1
+
+            if waiters or count >= self.max_batch or time.monotonic() >= deadline:
+                if pending:
+                    self._write_batch(pending)
+                    pending = {}
+                    count = 0
+                deadline = time.monotonic() + self.flush_interval
+                for w in waiters:
+                    w.set()
+
+    def _write_batch(self, pending: dict[Path, list[str]]) -> None:
+        with self._io_lock:
+            for path, lines in pending.items():
+                try:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    with path.open("a", encoding="utf-8") as f:
+                        f.write("".join(lines))
+                    if self.max_bytes and path.stat().st_size > self.max_bytes:
+                        self._rotate(path)
+                except Exception:
+                    # Logging must never take the app down; drop this batch for this file.
+                    pass
+
+    def _rotate(self, path: Path) -> None:
+        """Shift x.N.jsonl.gz -> x.N+1.jsonl.gz and compress the live file into x.1.jsonl.gz."""
+        if self.backup_count <= 0:
+            path.unlink(missing_ok=True)
+            return
+        oldest = rotated_path(path, self.backup_count)
+        oldest.unlink(missing_ok=True)
+        for n in range(self.backup_count - 1, 0, -1):
+            src = rotated_path(path, n)
+            if src.exists():
+                src.replace(rotated_path(path, n + 1))
+        staging = path.with_name(path.name + ".rotating")
+        path.replace(staging)
+        with staging.open("rb") as src, gzip.open(rotated_path(path, 1), "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        staging.unlink(missing_ok=True)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Process-wide writer (one thread shared by every Streamlit session)
+# ──────────────────────────────────────────────────────────────────────────────
+_WRITER: JsonlLogWriter | None = None
+_WRITER_LOCK = threading.Lock()
+
+
+def get_writer() -> JsonlLogWriter:
+    global _WRITER
+    if _WRITER is None:
+        with _WRITER_LOCK:
+            if _WRITER is None:
+                _WRITER = JsonlLogWriter()
+                atexit.register(_WRITER.close)
+    return _WRITER
@@ -0,0 +1,217 @@
+# quiz_events.py
+"""
+Append-only binary log of quiz answers (files/quiz/answers.bin).
+
+A 20-byte header is followed by fixed-width 26-byte little-endian records:
+
+    qid u32 | option u8 | correct u8 | latency_ms u32 | session u64 | ts f64
+
+`option` is 255 when the timer ran out. start_quiz() appends through a shared
+buffered writer: records are packed in memory and written with one append
+when BUFFER_RECORDS are pending, by a daemon timer FLUSH_INTERVAL after the
+first pending record (so a quiet server still writes them), when a quiz
+ends, and at exit. A torn record at the end of the file (crash mid-write) is cut off before
+the next append. Readers memory-map the file as a NumPy structured array, so
+aggregates over millions of answers are a few vectorized passes and no parsing:
+
+    python quiz_events.py stats              # per-question accuracy + mean answer time
+"""
+from __future__ import annotations
+import argparse
+import atexit
+import os
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, List, NamedTuple, Optional
+
+EVENTS_PATH = Path(os.getenv("QUIZ_EVENTS_PATH", "files/quiz/answers.bin"))
+BUFFER_RECORDS = 64
+FLUSH_INTERVAL = float(os.getenv("QUIZ_EVENTS_FLUSH_INTERVAL", "5.0"))  # seconds a record may sit in memory
+NO_OPTION = 255
+
+_MAGIC = b"ECCBQEV1"
+_VERSION = 1
+_HEADER = struct.Struct("<8sHHd")        # magic, version, record size, created_at
+_RECORD = struct.Struct("<IBBIQd")       # see module docstring
+
+# the same layout as a NumPy dtype (packed, no alignment padding)
+DTYPE_FIELDS = [("qid", "<u4"), ("option", "u1"), ("correct", "u1"),
+                ("latency_ms", "<u4"), ("session", "<u8"), ("ts", "<f8")]
+
+
+class AnswerEvent(NamedTuple):
+    qid: int
+    option: Optional[int]   # index of the chosen option, None when the timer ran out
+    correct: bool
+    latency_ms: int
+    session: int
+    ts: float
+
+    def pack(self) -> bytes:
+        option = NO_OPTION if self.option is None else min(int(self.option), NO_OPTION - 1)
+        return _RECORD.pack(self.qid & 0xFFFFFFFF, option, 1 if self.correct else 0,
+                            max(0, min(int(self.latency_ms), 0xFFFFFFFF)), self.session & (2 ** 64 - 1), self.ts)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Writer
+# ──────────────────────────────────────────────────────────────────────────────
+class EventLog:
+    """Buffered appender; one per file per process (see get_event_log)."""
+
+    def __init__(self, path: Path = EVENTS_PATH, buffer_records: int = BUFFER_RECORDS,
+                 flush_interval: float = FLUSH_INTERVAL):
+        self.path = Path(path)
+        self.buffer_records = max(1, buffer_records)
+        self.flush_interval = flush_interval
+        self._buf: List[bytes] = []
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._checked = False
+
+    def append(self, event: AnswerEvent) -> None:
+        with self._lock:
+            self._buf.append(event.pack())
+            if len(self._buf) >= self.buffer_records:
+                self._flush_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()  # no-op when this is the timer's own flush
+            self._timer = None
+        if not self._buf:
+            return
+        data, self._buf = b"".join(self._buf), []
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            size = os.fstat(fd).st_size
+            if size == 0:
+                data = _HEADER.pack(_MAGIC, _VERSION, _RECORD.size, time.time()) + data
+            elif not self._checked:
+                torn = (size - _HEADER.size) % _RECORD.size
+                if torn:
+                    os.ftruncate(fd, size - torn)
+            self._checked = True
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+
+_logs: dict = {}
+_logs_lock = threading.Lock()
+
+
+def get_event_log(path: Path = EVENTS_PATH) -> EventLog:
+    path = Path(path)
+    with _logs_lock:
+        log = _logs.get(path)
+        if log is None:
+            log = _logs[path] = EventLog(path)
+        return log
+
+
+@atexit.register
+def _flush_all() -> None:
+    for log in list(_logs.values()):
+        try:
+            log.flush()
+        except OSError:
+            pass
+
+
+def log_event(event: AnswerEvent, path: Path = EVENTS_PATH) -> None:
+    get_event_log(path).append(event)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Reader + aggregates
+# ──────────────────────────────────────────────────────────────────────────────
+def read_events(path: Path = EVENTS_PATH):
+    """Memory-mapped structured array of every complete record (empty array if there is no log)."""
+    import numpy as np
+
+    dtype = np.dtype(DTYPE_FIELDS)
+    path = Path(path)
+    if path in _logs:
+        _logs[path].flush()  # include this process's pending records
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return np.zeros(0, dtype)
+    if size < _HEADER.size:
+        return np.zeros(0, dtype)
+    with open(path, "rb") as f:
+        magic, version, rec_size, _ = _HEADER.unpack(f.read(_HEADER.size))
+    if magic != _MAGIC or version != _VERSION or rec_size != dtype.itemsize:
+        raise ValueError(f"{path} is not a v{_VERSION} quiz event log")
+    n = (size - _HEADER.size) // rec_size
+    if n == 0:
+        return np.zeros(0, dtype)
+    return np.memmap(path, dtype=dtype, mode="r", offset=_HEADER.size, shape=(n,))
+
+
+class QuestionStats(NamedTuple):
+    qid: Any               # np.ndarray[uint32], sorted
+    answers: Any           # events per question
+    accuracy: Any          # share correct
+    answered: Any          # share with an option chosen (not timed out)
+    mean_latency_ms: Any   # over answered events only (NaN if none)
+
+
+def question_stats(events) -> QuestionStats:
+    import numpy as np
+
+    qids, inv = np.unique(events["qid"], return_inverse=True)
+    n = np.bincount(inv, minlength=len(qids))
+    answered = events["option"] != NO_OPTION
+    n_answered = np.bincount(inv, answered, len(qids))
+    latency = np.bincount(inv, np.where(answered, events["latency_ms"], 0).astype(np.float64), len(qids))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return QuestionStats(
+            qids, n,
+            np.bincount(inv, events["correct"].astype(np.float64), len(qids)) / np.maximum(n, 1),
+            n_answered / np.maximum(n, 1),
+            latency / n_answered,
+        )
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# CLI
+# ──────────────────────────────────────────────────────────────────────────────
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Quiz answer event log")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    s = sub.add_parser("stats", help="per-question accuracy and mean answer time")
+    s.add_argument("--events", type=Path, default=EVENTS_PATH)
+    args = ap.parse_args(argv)
+
+    events = read_events(args.events)
+    if not len(events):
+        print(f"No answers logged at {args.events} yet.")
+        return 1
+    import data_loaders
+    import quiz_irt
+    text = {quiz_irt.question_id(q): q.get("question", "") for q in data_loaders.load_questions()[0]}
+    st = question_stats(events)
+    print(f"{len(events):,} answers, {len(st.qid)} questions")
+    for i in st.accuracy.argsort():
+        q = int(st.qid[i])
+        print(f"{st.accuracy[i]:6.1%}  {st.mean_latency_ms[i] / 1000:5.1f}s  n={st.answers[i]:<6} "
+              f"{text.get(q, q)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
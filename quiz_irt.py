@@ -0,0 +1,219 @@
+# quiz_irt.py
+"""
+Question difficulty for the finance quiz (Rasch / 1PL item response theory).
+
+start_quiz() logs one event per answered (or timed-out) question to the
+binary log in quiz_events.py. The calibration job memory-maps every event and
+fits
+
+    P(correct | player s, question i) = 1 / (1 + exp(-(theta_s - b_i)))
+
+for all players and questions in one batch. Each Newton step is a handful of
+NumPy bincounts over the event arrays, with a N(0, 1) prior on both theta and
+b so questions with a few answers stay near 0. The fitted b values go to
+files/question_difficulty.json, which data_loaders hot-reloads:
+
+    python quiz_irt.py calibrate
+
+Adaptive mode keeps questions sorted by b. After every answer it updates the
+player's ability estimate and bisects for the unused question closest to it,
+choosing at random among near-ties (every question ties before calibration).
+"""
+from __future__ import annotations
+import argparse
+import bisect
+import json
+import os
+import random
+import sys
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Set, Tuple
+
+from quiz_events import EVENTS_PATH, read_events
+
+DIFFICULTY_PATH = Path("files/question_difficulty.json")
+PRIOR_SD = 1.0
+MAX_ITER = 100
+TOL = 1e-6
+TIE_TOL = 0.15   # difficulties this close to the best match count as equally good picks
+
+_rng = random.Random()
+
+
+def question_id(question: Mapping[str, Any] | str) -> int:
+    """Stable 32-bit id from the question text (survives reordering questions.json)."""
+    text = question if isinstance(question, str) else question.get("question", "")
+    return zlib.crc32(" ".join(text.lower().split()).encode("utf-8"))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Calibration
+# ──────────────────────────────────────────────────────────────────────────────
+class Calibration(NamedTuple):
+    qids: Any          # np.ndarray[uint32]
+    b: Any             # np.ndarray[float64], difficulty per qid
+    n: Any             # answers per qid
+    p_correct: Any     # observed share correct per qid
+    sessions: int
+    events: int
+    iterations: int
+
+
+def fit_rasch(qids: Sequence[int], sessions: Sequence[int], correct: Sequence[bool],
+              prior_sd: float = PRIOR_SD, max_iter: int = MAX_ITER, tol: float = TOL) -> Calibration:
+    """Joint MAP fit of player ability and question difficulty over all events at once."""
+    import numpy as np
+
+    q_ids, qi = np.unique(np.asarray(qids, dtype=np.uint32), return_inverse=True)
+    _, si = np.unique(np.asarray(sessions, dtype=np.uint64), return_inverse=True)
+    y = np.asarray(correct, dtype=np.float64)
+    nq, ns = len(q_ids), int(si.max()) + 1 if len(si) else 0
+    theta, b = np.zeros(ns), np.zeros(nq)
+    prec = 1.0 / prior_sd ** 2
+
+    it = 0
+    for it in range(1, max_iter + 1):
+        # one Newton step for all abilities, then one for all difficulties
+        p = 1.0 / (1.0 + np.exp(b[qi] - theta[si]))
+        w = p * (1 - p)
+        theta_step = (np.bincount(si, y - p, ns) - prec * theta) / (np.bincount(si, w, ns) + prec)
+        theta += theta_step
+        p = 1.0 / (1.0 + np.exp(b[qi] - theta[si]))
+        w = p * (1 - p)
+        b_step = (np.bincount(qi, p - y, nq) - prec * b) / (np.bincount(qi, w, nq) + prec)
+        b += b_step
+        if max(np.abs(theta_step).max(initial=0), np.abs(b_step).max(initial=0)) < tol:
+            break
+
+    n = np.bincount(qi, minlength=nq)
+    return Calibration(q_ids, b, n, np.bincount(qi, y, nq) / np.maximum(n, 1), ns, len(y), it)
+
+
+def calibrate(events, questions: Sequence[Mapping[str, Any]] = (), out: Path = DIFFICULTY_PATH) -> Calibration:
+    """Fit every event (quiz_events.read_events array) and write the difficulty file (atomically)."""
+    cal = fit_rasch(events["qid"], events["session"], events["correct"].astype(bool))
+    text = {question_id(q): q.get("question", "") for q in questions}
+    payload = {
+        "version": 1,
+        "fitted_at": time.time(),
+        "model": "rasch",
+        "events": cal.events,
+        "sessions": cal.sessions,
+        "questions": {
+            str(int(q)): {"b": round(float(b), 4), "n": int(n), "p_correct": round(float(p), 4),
+                          **({"question": text[int(q)]} if int(q) in text else {})}
+            for q, b, n, p in zip(cal.qids, cal.b, cal.n, cal.p_correct)
+        },
+    }
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(f".{out.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    os.replace(tmp, out)
+    return cal
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Adaptive selection
+# ──────────────────────────────────────────────────────────────────────────────
+class DifficultyIndex:
+    """Questions sorted by difficulty (uncalibrated ones at b = 0) for nearest-difficulty picks."""
+
+    def __init__(self, questions: Sequence[Mapping[str, Any]], difficulty: Mapping[int, float]):
+        self.questions = tuple(questions)
+        self.by_qid: Dict[int, float] = {question_id(q): float(difficulty.get(question_id(q), 0.0))
+                                         for q in self.questions}
+        ranked = sorted((self.by_qid[question_id(q)], i) for i, q in enumerate(self.questions))
+        self.b: Tuple[float, ...] = tuple(b for b, _ in ranked)
+        self.order: Tuple[int, ...] = tuple(i for _, i in ranked)
+        self.position: Dict[int, int] = {question_id(q): i for i, q in enumerate(self.questions)}
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def difficulty(self, question: Mapping[str, Any]) -> float:
+        return self.by_qid.get(question_id(question), 0.0)
+
+    def pick(self, theta: float, used: Set[int] = frozenset(), tie_tol: float = TIE_TOL,
+             rng: random.Random = _rng) -> Optional[int]:
+        """
+        Index (into questions) of an unused question whose difficulty is closest to `theta`.
+        Every unused question within `tie_tol` of the nearest one is equally likely, so
+        uncalibrated (all b = 0) or near-equal questions don't come out in file order.
+        """
+        hi = bisect.bisect_left(self.b, theta)
+        lo = hi - 1
+        n = len(self.order)
+        best: Optional[float] = None
+        ties: List[int] = []
+        while lo >= 0 or hi < n:
+            # walk outwards from the insertion point, nearer side first
+            if hi >= n or (lo >= 0 and theta - self.b[lo] <= self.b[hi] - theta):
+                cand, dist, lo = self.order[lo], theta - self.b[lo], lo - 1
+            else:
+                cand, dist, hi = self.order[hi], self.b[hi] - theta, hi + 1
+            if best is not None and dist > best + tie_tol:
+                break
+            if cand not in used:
+                best = dist if best is None else best
+                ties.append(cand)
+        return rng.choice(ties) if ties else None
+
+
+def estimate_ability(answers: Sequence[Tuple[float, bool]], prior_sd: float = PRIOR_SD) -> float:
+    """MAP ability from (difficulty, correct) pairs answered so far this quiz."""
+    import math
+    theta, prec = 0.0, 1.0 / prior_sd ** 2
+    for _ in range(20):
+        grad, hess = -prec * theta, prec
+        for b, ok in answers:
+            p = 1.0 / (1.0 + math.exp(b - theta))
+            grad += (1.0 if ok else 0.0) - p
+            hess += p * (1 - p)
+        step = grad / hess
+        theta += step
+        if abs(step) < 1e-6:
+            break
+    return theta
+
+
+_index_memo: Tuple[Any, Any, Optional[DifficultyIndex]] = (None, None, None)
+
+
+def index_for(questions: Sequence[Mapping[str, Any]], difficulty: Mapping[int, float]) -> DifficultyIndex:
+    """DifficultyIndex for the loader's current (shared, immutable) questions + difficulties."""
+    global _index_memo
+    q, d, idx = _index_memo
+    if q is questions and d is difficulty and idx is not None:
+        return idx
+    idx = DifficultyIndex(questions, difficulty)
+    _index_memo = (questions, difficulty, idx)
+    return idx
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# CLI
+# ──────────────────────────────────────────────────────────────────────────────
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Quiz question difficulty (Rasch model)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    c = sub.add_parser("calibrate", help="fit difficulties from every logged answer")
+    c.add_argument("--events", type=Path, default=EVENTS_PATH)
+    c.add_argument("-o", "--out", type=Path, default=DIFFICULTY_PATH)
+    args = ap.parse_args(argv)
+
+    import data_loaders
+    events = read_events(args.events)
+    if not len(events):
+        print(f"No answers logged at {args.events} yet.")
+        return 1
+    t0 = time.perf_counter()
+    cal = calibrate(events, data_loaders.load_questions()[0], args.out)
+    print(f"{args.out}: {len(cal.qids)} questions from {cal.events:,} answers / {cal.sessions:,} quizzes "
+          f"({cal.iterations} iterations, {time.perf_counter() - t0:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
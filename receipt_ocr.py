@@ -0,0 +1,280 @@
+# receipt_ocr.py
+"""
+Offline receipt reading for chat uploads.
+
+A photo is first decoded at most MAX_SIDE px on its long side and checked
+cheaply for receipt shape (portrait, mostly light paper, a little dark ink), so
+selfies and screenshots never reach Tesseract. A receipt photo is then cleaned
+up with OpenCV (upscaled if small, denoised, deskewed, adaptive threshold) and
+read by Tesseract through pytesseract. Then the text is parsed into line items, subtotal, tax and total.
+Results are cached by image hash, in memory and under files/receipts/cache, so
+re-uploading the same photo costs nothing. Several photos are read in parallel:
+Tesseract runs as its own process and OpenCV releases the GIL.
+
+When a photo parses as a receipt, the chat sends the agent its text and the
+budget entries (see `expenses`) instead of making a vision-model call.
+Anything that doesn't parse goes to the vision model as before. Both
+pytesseract and the tesseract binary (packages.txt) are optional: without
+them available() is False and nothing changes.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+CACHE_DIR = Path(os.getenv("RECEIPT_CACHE_DIR", "files/receipts/cache"))
+MEMORY_ITEMS = 64
+PARSER_VERSION = 1                      # bump to invalidate cached parses
+TESSERACT_CONFIG = "--oem 1 --psm 6"    # LSTM engine, one uniform block of text
+MIN_WIDTH = 1000                        # upscale narrow photos/scans before OCR
+MAX_SIDE = int(os.getenv("RECEIPT_MAX_SIDE", "2000"))   # downscale big photos before denoising
+
+_pool = ThreadPoolExecutor(max_workers=min(2, os.cpu_count() or 1), thread_name_prefix="receipt-ocr")
+_available: Optional[bool] = None       # cv2 + pytesseract + tesseract binary (checked once)
+
+
+def available() -> bool:
+    global _available
+    if _available is None:
+        try:
+            import cv2  # noqa: F401
+            import pytesseract
+            pytesseract.get_tesseract_version()
+            _available = True
+        except Exception:
+            _available = False
+    return _available
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Parsing
+# ──────────────────────────────────────────────────────────────────────────────
+class Receipt(NamedTuple):
+    merchant: str
+    items: Tuple[Tuple[str, float], ...]    # (description, amount)
+    subtotal: Optional[float]
+    tax: Optional[float]
+    total: Optional[float]
+
+    @property
+    def ok(self) -> bool:
+        """Confident enough to skip the vision model: a total, and items that roughly add up to it."""
+        if not self.total or self.total <= 0:
+            return False
+        if not self.items:
+            return False
+        base = self.subtotal if self.subtotal else self.total - (self.tax or 0.0)
+        return abs(sum(a for _, a in self.items) - base) <= max(0.05, 0.02 * base)
+
+
+_AMOUNT = r"-?\d{1,3}(?:,\d{3})*\.\d{2}|-?\d+\.\d{2}"
+_LINE = re.compile(rf"^(?P<desc>.*?[A-Za-z].*?)[\s.:$]*(?:EC\$|US\$|\$)?\s*(?P<amt>{_AMOUNT})\s*[A-Z*]?$")
+_TOTAL = re.compile(r"\b(grand\s+total|total\s+due|amount\s+due|balance\s+due|total)\b", re.I)
+_SUBTOTAL = re.compile(r"\bsub\s*-?\s*total\b", re.I)
+_TAX = re.compile(r"\b(vat|tax|gst|abst)\b", re.I)
+# payment / change lines, and lines that are never items
+_SKIP = re.compile(r"\b(cash|change|tendered|visa|master\s*card|debit|credit|card|paid|balance|"
+                   r"discount|savings|points|tip)\b", re.I)
+
+
+def _amount(s: str) -> float:
+    return float(s.replace(",", ""))
+
+
+def parse_receipt(text: str) -> Receipt:
+    merchant, items = "", []
+    subtotal = tax = total = None
+    for raw in (text or "").splitlines():
+        line = " ".join(raw.split())
+        if not line:
+            continue
+        if not merchant and len(re.findall(r"[A-Za-z]", line)) >= 3 and not re.search(_AMOUNT, line):
+            merchant = line.title()
+        m = _LINE.match(line)
+        if not m:
+            continue
+        desc, amt = m.group("desc").strip(" .:-*"), _amount(m.group("amt"))
+        if _SUBTOTAL.search(desc):
+            subtotal = amt
+        elif _TOTAL.search(desc):
+            total = amt if total is None else max(total, amt)
+        elif _TAX.search(desc):
+            tax = (tax or 0.0) + amt
+        elif not _SKIP.search(desc) and total is None:
+            items.append((desc, amt))
+    return Receipt(merchant, tuple(items), subtotal, tax, total)
+
+
+def expenses(receipt: Receipt, rules=None) -> List[Dict[str, float]]:
+    """expenses_list entries for budget_gen.budgeting_function, the total split by category."""
+    if rules is None:
+        from data_loaders import load_merchant_rules
+        rules = load_merchant_rules()[0]
+    total = receipt.total or sum(a for _, a in receipt.items)
+    if not total:
+        return []
+    store = rules.categorize(receipt.merchant)
+    if store != rules.fallback_category or not receipt.items:
+        return [{"Category": store, "Amount": round(total, 2)}]
+    # unknown store: categorize each line, spreading tax/rounding across lines pro rata
+    by_cat: Dict[str, float] = {}
+    for desc, amt in receipt.items:
+        cat = rules.categorize(desc)
+        by_cat[cat] = by_cat.get(cat, 0.0) + amt
+    scale = total / (sum(by_cat.values()) or total)
+    return [{"Category": c, "Amount": round(a * scale, 2)} for c, a in by_cat.items()]
+
+
+def receipt_markdown(receipt: Receipt, name: str = "receipt") -> str:
+    lines = [f"**Receipt ({name}):** {receipt.merchant or 'unknown store'}"]
+    lines += [f"- {d}: {a:,.2f}" for d, a in receipt.items[:30]]
+    if len(receipt.items) > 30:
+        lines.append(f"- … {len(receipt.items) - 30} more lines")
+    for label, v in (("Subtotal", receipt.subtotal), ("Tax", receipt.tax), ("Total", receipt.total)):
+        if v is not None:
+            lines.append(f"**{label}:** {v:,.2f}")
+    entries = expenses(receipt)
+    if entries:
+        lines.append("Budget entries: " + ", ".join(f"{e['Category']} {e['Amount']:,.2f}" for e in entries))
+    return "\n".join(lines)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# OCR
+# ──────────────────────────────────────────────────────────────────────────────
+def load_gray(data: bytes, max_side: int = MAX_SIDE):
+    """Grayscale image with its long side capped at `max_side` (None if OpenCV can't decode it)."""
+    import cv2
+    import numpy as np
+
+    img = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_GRAYSCALE)
+    if img is None:
+        return None
+    h, w = img.shape
+    if max(h, w) > max_side:
+        scale = max_side / max(h, w)
+        img = cv2.resize(img, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+    return img
+
+
+def looks_like_receipt(img) -> bool:
+    """
+    Cheap shape check on a small copy: receipts are photographed upright, are mostly
+    light paper, and have a little dark ink spread over them. Rejects most selfies,
+    landscapes and dark-mode screenshots before any OCR work.
+    """
+    import cv2
+
+    h, w = img.shape
+    if h < w * 0.9:
+        return False
+    small = cv2.resize(img, (max(1, w * 256 // h), 256), interpolation=cv2.INTER_AREA)
+    ink = cv2.threshold(small, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)[1]
+    ink_share = cv2.countNonZero(ink) / ink.size
+    return 0.02 <= ink_share <= 0.35 and float(small.mean()) >= 110
+
+
+def preprocess(img):
+    """Binarized, deskewed version of a load_gray() image, ready for Tesseract."""
+    import cv2
+
+    h, w = img.shape
+    if w < MIN_WIDTH:
+        scale = MIN_WIDTH / w
+        img = cv2.resize(img, (MIN_WIDTH, int(h * scale)), interpolation=cv2.INTER_CUBIC)
+    img = cv2.fastNlMeansDenoising(img, None, h=10, templateWindowSize=7, searchWindowSize=11)  # default 21: ~3x slower
+
+    # deskew from the minimum-area rectangle around the dark (ink) pixels
+    ink = cv2.threshold(img, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)[1]
+    coords = cv2.findNonZero(ink)
+    if coords is not None and len(coords) > 50:
+        angle = cv2.minAreaRect(coords)[-1]
+        angle = angle - 90 if angle > 45 else angle
+        if 0.5 < abs(angle) < 20:
+            h, w = img.shape
+            rot = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+            img = cv2.warpAffine(img, rot, (w, h), flags=cv2.INTER_CUBIC, borderMode=cv2.BORDER_REPLICATE)
+
+    return cv2.adaptiveThreshold(img, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 15)
+
+
+def ocr(data: bytes) -> str:
+    """Receipt text, or "" when the image doesn't decode or doesn't look like a receipt."""
+    import pytesseract
+
+    img = load_gray(data)
+    if img is None or not looks_like_receipt(img):
+        return ""
+    return pytesseract.image_to_string(preprocess(img), config=TESSERACT_CONFIG)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Cache + pool
+# ──────────────────────────────────────────────────────────────────────────────
+_memory: "OrderedDict[str, Receipt]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _cache_get(key: str) -> Optional[Receipt]:
+    with _lock:
+        if key in _memory:
+            _memory.move_to_end(key)
+            return _memory[key]
+    try:
+        raw = json.loads((CACHE_DIR / f"{key}.json").read_text(encoding="utf-8"))
+        if raw.get("version") != PARSER_VERSION:
+            return None
+        r = raw["receipt"]
+        receipt = Receipt(r["merchant"], tuple((d, a) for d, a in r["items"]), r["subtotal"], r["tax"], r["total"])
+    except Exception:
+        return None
+    _cache_put(key, receipt, persist=False)
+    return receipt
+
+
+def _cache_put(key: str, receipt: Receipt, persist: bool = True) -> None:
+    with _lock:
+        _memory[key] = receipt
+        _memory.move_to_end(key)
+        while len(_memory) > MEMORY_ITEMS:
+            _memory.popitem(last=False)
+    if persist:
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp = CACHE_DIR / f".{key}.{os.getpid()}.tmp"
+            tmp.write_text(json.dumps({"version": PARSER_VERSION, "receipt": receipt._asdict()}), encoding="utf-8")
+            os.replace(tmp, CACHE_DIR / f"{key}.json")
+        except OSError:
+            pass
+
+
+def read_receipt(data: bytes) -> Optional[Receipt]:
+    """Parsed receipt for one image (cached by content hash); None when OCR isn't available or fails."""
+    key = hashlib.sha256(data).hexdigest()
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+    if not available():
+        return None
+    try:
+        receipt = parse_receipt(ocr(data))
+    except Exception:
+        return None
+    _cache_put(key, receipt)
+    return receipt
+
+
+def read_receipts(images: Iterable[bytes]) -> List[Optional[Receipt]]:
+    """read_receipt over several images on the worker pool, in order."""
+    images = list(images)
+    if not images or not available():
+        return [None] * len(images)
+    if len(images) == 1:
+        return [read_receipt(images[0])]
+    return list(_pool.map(read_receipt, images))
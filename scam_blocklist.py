@@ -0,0 +1,307 @@
+# scam_blocklist.py
+"""
+Bloom-filter blocklist for reported scam phone numbers, domains, emails and
+payment/social handles.
+
+The filter is built offline from a plain-text list, one indicator per line.
+Blank lines and lines starting with # are skipped. A line can name its kind
+("phone:", "domain:", "email:", "handle:") or leave the kind to be guessed:
+
+    python scam_blocklist.py build reported.txt              # → files/blocklist/scam_blocklist.bloom
+    python scam_blocklist.py build reported.txt --fp 0.0001 -o other.bloom
+    python scam_blocklist.py check "WhatsApp +1 (767) 555-0199 or pay $quickcash"
+
+At query time the file is memory-mapped, not loaded. A lookup hashes the
+normalized indicator once and reads k bits, so a list of hundreds of
+thousands of entries costs a few MB of page cache and no Python objects.
+A Bloom filter can give false positives (at the rate chosen at build time)
+but never false negatives, so a hit means "reported, verify before trusting".
+Nothing is bundled: with no filter file every lookup returns "not checked".
+"""
+from __future__ import annotations
+import argparse
+import hashlib
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+BLOCKLIST_PATH = Path(os.getenv("SCAM_BLOCKLIST_PATH", "files/blocklist/scam_blocklist.bloom"))
+DEFAULT_FP_RATE = 0.001
+
+_MAGIC = b"ECCBBLM1"
+_HEADER = struct.Struct("<8sQIQd")  # magic, m (bits), k, n (items), built_at
+KINDS = ("phone", "domain", "email", "handle")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Normalization + extraction
+# ──────────────────────────────────────────────────────────────────────────────
+def normalize(kind: str, value: str) -> Optional[str]:
+    """Canonical 'kind:value' key, or None if `value` isn't a usable indicator."""
+    v = (value or "").strip()
+    if kind == "phone":
+        digits = re.sub(r"\D", "", v)
+        if len(digits) == 10:          # NANP without the country code (all ECCU numbers are +1)
+            digits = "1" + digits
+        return f"phone:{digits}" if 7 <= len(digits) <= 15 else None
+    if kind == "domain":
+        v = re.sub(r"^[a-z][a-z0-9+.-]*://", "", v.lower())
+        v = v.split("/", 1)[0].split("?", 1)[0].split("#", 1)[0].rsplit("@", 1)[-1].split(":", 1)[0].strip(".")
+        if v.startswith("www."):
+            v = v[4:]
+        try:
+            v = v.encode("idna").decode("ascii")
+        except UnicodeError:
+            return None
+        return f"domain:{v}" if "." in v and re.fullmatch(r"[a-z0-9.-]+", v) else None
+    if kind == "email":
+        v = v.lower()
+        return f"email:{v}" if re.fullmatch(r"[^@\s]+@[^@\s]+\.[a-z0-9-]+", v) else None
+    if kind == "handle":
+        v = v.lower().lstrip("@$").strip()
+        return f"handle:{v}" if re.fullmatch(r"[a-z0-9._-]{2,64}", v) else None
+    return None
+
+
+def guess_kind(value: str) -> str:
+    v = value.strip()
+    if "@" in v and not v.startswith("@"):
+        return "email"
+    if v[:1] in ("@", "$"):
+        return "handle"
+    if re.fullmatch(r"[+\d\s().-]{7,}", v):
+        return "phone"
+    if "." in v or "://" in v:
+        return "domain"
+    return "handle"
+
+
+def parse_line(line: str) -> Optional[str]:
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    kind, sep, rest = line.partition(":")
+    if sep and kind.lower() in KINDS:
+        return normalize(kind.lower(), rest)
+    return normalize(guess_kind(line), line)
+
+
+_URL = re.compile(r"\b(?:https?://)?(?:[a-z0-9-]+\.)+[a-z]{2,24}(?:/[^\s<>\"']*)?", re.I)
+# A host with no scheme, "www." or path only counts when it ends in a TLD scam links
+# use (any two-letter country code, or a common generic one), and never when that
+# "TLD" is a file extension: "report.pdf" and "St.Lucia" are not domains.
+_BARE_TLDS = frozenset("""
+    com net org info biz xyz top online site website club shop store app live link click
+    icu vip win bid loan work today support services help email cloud digital tech pro
+""".split())
+_FILE_EXTS = frozenset("""
+    pdf doc docx xls xlsx ppt pptx csv txt md rtf odt jpg jpeg png gif bmp webp heic svg
+    mp3 mp4 mov avi zip rar gz tar exe apk dmg js py html htm json xml css
+""".split())
+_EMAIL = re.compile(r"\b[\w.+-]+@(?:[a-z0-9-]+\.)+[a-z]{2,24}\b", re.I)
+_PHONE = re.compile(r"(?<![\w])(?:\+?1[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}(?!\d)|(?<![\w])\+\d{8,15}(?!\d)")
+_WA_ME = re.compile(r"wa\.me/(\d{7,15})", re.I)
+_HANDLE = re.compile(r"(?<![\w@$])[@$][a-z][a-z0-9._-]{1,63}", re.I)
+
+
+class Indicator(NamedTuple):
+    kind: str
+    raw: str      # as it appeared in the text (host only, for domains)
+    key: str      # normalized "kind:value"
+
+
+def _is_domain(match: str) -> bool:
+    """Whether a _URL match is a link/host rather than a file name or "word.word" text."""
+    m = match.lower()
+    if m.startswith(("http://", "https://")):
+        return True
+    host = m.split("/", 1)[0]
+    tld = host.rsplit(".", 1)[-1]
+    if tld in _FILE_EXTS:
+        return False
+    return host.startswith("www.") or "/" in m or len(tld) == 2 or tld in _BARE_TLDS
+
+
+def extract(text: str) -> List[Indicator]:
+    """Phone numbers, domains (from URLs), emails and @/$ handles found in `text`, de-duplicated."""
+    text = text or ""
+    found: List[Indicator] = []
+    seen = set()
+
+    def add(kind: str, raw: str) -> None:
+        key = normalize(kind, raw)
+        if key and key not in seen and key != "domain:wa.me":
+            seen.add(key)
+            found.append(Indicator(kind, key.split(":", 1)[1] if kind == "domain" else raw, key))
+
+    emails = _EMAIL.findall(text)
+    for e in emails:
+        add("email", e)
+        add("domain", e.rsplit("@", 1)[1])
+    email_spans = "\n".join(emails)
+    for m in _URL.finditer(text):
+        if m.group(0) not in email_spans and _is_domain(m.group(0)):
+            add("domain", m.group(0))
+    for n in _WA_ME.findall(text):
+        add("phone", n)
+    for m in _PHONE.finditer(text):
+        add("phone", m.group(0))
+    for m in _HANDLE.finditer(text):
+        add("handle", m.group(0))
+    return found
+
+
+def _domain_parents(key: str) -> List[str]:
+    """domain:pay.evil.co.uk → itself, evil.co.uk, co.uk (stops before the bare TLD)."""
+    labels = key.split(":", 1)[1].split(".")
+    return [f"domain:{'.'.join(labels[i:])}" for i in range(len(labels) - 1)]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Filter
+# ──────────────────────────────────────────────────────────────────────────────
+def _positions(key: str, m: int, k: int) -> Iterable[int]:
+    # Kirsch–Mitzenmacher double hashing from one 128-bit digest
+    d = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+    h1, h2 = int.from_bytes(d[:8], "little"), int.from_bytes(d[8:], "little") | 1
+    return ((h1 + i * h2) % m for i in range(k))
+
+
+def sizing(n: int, fp_rate: float) -> Tuple[int, int]:
+    """(bits, hashes) for n items at the target false-positive rate."""
+    n = max(n, 1)
+    m = max(64, int(math.ceil(-n * math.log(fp_rate) / (math.log(2) ** 2))))
+    m = (m + 7) // 8 * 8
+    k = max(1, round(m / n * math.log(2)))
+    return m, k
+
+
+def build(keys: Iterable[str], out: Path = BLOCKLIST_PATH, fp_rate: float = DEFAULT_FP_RATE) -> Tuple[int, int, int]:
+    """Write a filter for the (normalized) keys; returns (items, bits, hashes)."""
+    keys = sorted(set(keys))
+    m, k = sizing(len(keys), fp_rate)
+    bits = bytearray(m // 8)
+    for key in keys:
+        for pos in _positions(key, m, k):
+            bits[pos >> 3] |= 1 << (pos & 7)
+    out = Path(out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(f".{out.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, m, k, len(keys), time.time()))
+        f.write(bits)
+    os.replace(tmp, out)
+    return len(keys), m, k
+
+
+class BloomBlocklist:
+    """Read-only, memory-mapped view of a filter written by build()."""
+
+    def __init__(self, path: Path = BLOCKLIST_PATH):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.m, self.k, self.n, self.built_at = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC or len(self._mm) < _HEADER.size + self.m // 8:
+            self._mm.close()
+            raise ValueError(f"{self.path} is not a scam blocklist filter")
+        self.stamp = (os.stat(self.path).st_mtime_ns, len(self._mm))
+
+    def __contains__(self, key: str) -> bool:
+        mm, base = self._mm, _HEADER.size
+        return all(mm[base + (pos >> 3)] >> (pos & 7) & 1 for pos in _positions(key, self.m, self.k))
+
+    def listed(self, ind: Indicator) -> bool:
+        if ind.kind == "domain":
+            return any(p in self for p in _domain_parents(ind.key))
+        return ind.key in self
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+_open_lock = threading.Lock()
+_current: Optional[BloomBlocklist] = None
+
+
+def get_blocklist(path: Path = BLOCKLIST_PATH) -> Optional[BloomBlocklist]:
+    """Shared mapping of the filter (re-opened when the file is rebuilt); None if there is no filter."""
+    global _current
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    cur = _current
+    if cur is not None and cur.path == Path(path) and cur.stamp == (st.st_mtime_ns, st.st_size):
+        return cur
+    with _open_lock:
+        cur = _current
+        if cur is None or cur.path != Path(path) or cur.stamp != (st.st_mtime_ns, st.st_size):
+            try:
+                cur = _current = BloomBlocklist(path)
+            except (OSError, ValueError, struct.error):
+                return None
+        return cur
+
+
+class Finding(NamedTuple):
+    kind: str
+    value: str
+    listed: bool
+
+
+def check_text(text: str, path: Path = BLOCKLIST_PATH) -> Tuple[List[Finding], bool]:
+    """(findings for every indicator in `text`, whether a blocklist was available)."""
+    bl = get_blocklist(path)
+    inds = extract(text)
+    if bl is None:
+        return [Finding(i.kind, i.raw, False) for i in inds], False
+    return [Finding(i.kind, i.raw, bl.listed(i)) for i in inds], True
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# CLI
+# ──────────────────────────────────────────────────────────────────────────────
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="build a filter from a plain-text indicator list")
+    b.add_argument("source", type=Path)
+    b.add_argument("-o", "--out", type=Path, default=BLOCKLIST_PATH)
+    b.add_argument("--fp", type=float, default=DEFAULT_FP_RATE, help="target false-positive rate")
+    c = sub.add_parser("check", help="extract indicators from text and look them up")
+    c.add_argument("text")
+    c.add_argument("--filter", type=Path, default=BLOCKLIST_PATH)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "build":
+        keys, skipped = [], 0
+        with open(args.source, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                key = parse_line(line)
+                if key:
+                    keys.append(key)
+                elif line.strip() and not line.lstrip().startswith("#"):
+                    skipped += 1
+        n, m, k = build(keys, args.out, args.fp)
+        print(f"{args.out}: {n:,} indicators, {m // 8 / 1024:,.1f} KiB, k={k}, fp≈{args.fp:g}"
+              + (f" ({skipped:,} unparseable lines skipped)" if skipped else ""))
+        return 0
+
+    findings, available = check_text(args.text, args.filter)
+    if not available:
+        print(f"No blocklist at {args.filter}; build one with `python scam_blocklist.py build <list.txt>`.")
+    for fd in findings:
+        print(f"{'LISTED' if fd.listed else 'ok    '}  {fd.kind:<7} {fd.value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+# scam_detector.py
+from __future__ import annotations
+import re
+from collections import deque
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Sequence, Tuple
+
+# ---------------------------------
+# Scam phrase detector
+# ---------------------------------
+# files/scam_lexicon.json lists "strong" and "weak" phrases for each of the ten
+# scams in files/common_scams.json. All phrases go into one word-level
+# Aho-Corasick automaton, built once per lexicon version (data_loaders hot-reloads
+# it), so a scan is one regex tokenize plus one pass over the tokens however many
+# phrases there are. A category is flagged when the distinct phrases it matched
+# reach `flag_score` (strong = 2, weak = 1 by default) and at least one of them is
+# a strong phrase: topic words alone ("taxi", "fare", "tour") never flag a message.
+# A weak phrase that only repeats words of a strong match ("fee" inside "processing
+# fee") adds nothing, and apostrophes stay inside words so "won't" is not "won t".
+_TOKEN = re.compile(r"[a-z0-9]+(?:'[a-z0-9]+)*")
+
+
+def _stem(tok: str) -> str:
+    # "cards" / "card", "fees" / "fee": enough folding for short phrase lists
+    return tok[:-1] if len(tok) > 3 and tok.endswith("s") and not tok.endswith("ss") else tok
+
+
+def tokens(text: str) -> List[str]:
+    return [_stem(t) for t in _TOKEN.findall((text or "").lower().replace("\u2019", "'"))]
+
+
+class Category(NamedTuple):
+    id: str
+    title: str         # matches a title in files/common_scams.json
+    advice: str
+    strong: Tuple[str, ...]
+    weak: Tuple[str, ...]
+
+
+class CategoryHit(NamedTuple):
+    id: str
+    title: str
+    advice: str
+    score: int
+    phrases: Tuple[str, ...]
+
+
+class ScamReport(NamedTuple):
+    flagged: Tuple[CategoryHit, ...]    # categories at or over the threshold, best first
+    hits: Tuple[CategoryHit, ...]       # every category with at least one match
+
+    def __bool__(self) -> bool:
+        return bool(self.flagged)
+
+    def summary(self) -> str:
+        return "; ".join(f"{h.title} ({', '.join(h.phrases[:4])})" for h in self.flagged)
+
+
+class ScamDetector:
+    """Immutable automaton over validated lexicon categories (see data_loaders.load_scam_lexicon)."""
+
+    def __init__(self, categories: Sequence[Category], weights: Mapping[str, int] = MappingProxyType({}),
+                 flag_score: int = 3):
+        self.categories: Tuple[Category, ...] = tuple(categories)
+        self.flag_score = flag_score
+        strong_w, weak_w = int(weights.get("strong", 2)), int(weights.get("weak", 1))
+
+        # phrase id → (category index, phrase text, weight, strong?, length in tokens)
+        phrases: List[Tuple[int, str, int, bool, int]] = []
+        goto: List[Dict[str, int]] = [{}]
+        out: List[Tuple[int, ...]] = [()]
+        for ci, cat in enumerate(self.categories):
+            for text, w, strong in [(p, strong_w, True) for p in cat.strong] + [(p, weak_w, False) for p in cat.weak]:
+                words = tokens(text)
+                if not words:
+                    continue
+                state = 0
+                for word in words:
+                    nxt = goto[state].get(word)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[state][word] = nxt
+                        goto.append({})
+                        out.append(())
+                    state = nxt
+                out[state] += (len(phrases),)
+                phrases.append((ci, text, w, strong, len(words)))
+
+        # failure links (BFS); each state's outputs include those of its failure chain
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            s = queue.popleft()
+            for word, t in goto[s].items():
+                queue.append(t)
+                f = fail[s]
+                while f and word not in goto[f]:
+                    f = fail[f]
+                nxt = goto[f].get(word, 0)
+                fail[t] = nxt if nxt != t else 0  # depth-1 states fail to the root
+                out[t] += out[fail[t]]
+
+        self._goto = tuple(MappingProxyType(g) for g in goto)
+        self._fail = tuple(fail)
+        self._out = tuple(out)
+        self._phrases = tuple(phrases)
+
+    def __len__(self) -> int:
+        return len(self._phrases)
+
+    def matches(self, text: str) -> List[Tuple[int, int]]:
+        """(phrase id, index of its last token) for every phrase found in `text` (repeats included)."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found: List[Tuple[int, int]] = []
+        state = 0
+        for i, word in enumerate(tokens(text)):
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            for pid in out[state]:
+                found.append((pid, i))
+        return found
+
+    def scan(self, text: str) -> ScamReport:
+        found = self.matches(text)
+        phrases = self._phrases
+        in_strong = set()   # token positions covered by a strong match
+        for pid, end in found:
+            if phrases[pid][3]:
+                in_strong.update(range(end - phrases[pid][4] + 1, end + 1))
+
+        per_cat: Dict[int, Dict[str, int]] = {}
+        has_strong = set()
+        for pid, end in found:
+            ci, phrase, w, strong, n = phrases[pid]
+            if not strong and all(i in in_strong for i in range(end - n + 1, end + 1)):
+                continue
+            per_cat.setdefault(ci, {})[phrase] = w  # distinct phrases only
+            if strong:
+                has_strong.add(ci)
+        hits = sorted(
+            ((CategoryHit(self.categories[ci].id, self.categories[ci].title, self.categories[ci].advice,
+                          sum(found.values()), tuple(sorted(found, key=lambda p: (-found[p], p)))), ci)
+             for ci, found in per_cat.items()),
+            key=lambda h: -h[0].score,
+        )
+        flagged = tuple(h for h, ci in hits if h.score >= self.flag_score and ci in has_strong)
+        return ScamReport(flagged, tuple(h for h, _ in hits))
+
@@ -5,7 +5,10 @@ from pathlib import Path
 from datetime import datetime, timezone
 import re
 import streamlit as st
+import countries
+import currencies
 from avatar_builder import avatar_editor
+from log_writer import get_writer
 
 DATA_DIR = Path("files")
 PROFILE = DATA_DIR / "user_profile.json"
@@ -34,30 +37,11 @@ DEFAULTS = {
     "last_seen_at": None,
 }
 
-ECCU_COUNTRIES = [
-    "Anguilla", "Antigua & Barbuda", "Dominica", "Grenada",
-    "Montserrat", "St. Kitts & Nevis", "St. Lucia", "St. Vincent & the Grenadines",
-]
-CARIB_NON_ECCU = ["Barbados", "Trinidad & Tobago", "Jamaica", "Bahamas", "Haiti", "Cuba", "Dominican Republic"]
+# Display names + country → currency come from the shared registry (countries.py)
+ECCU_COUNTRIES = countries.display_names(countries.ECCU)
+CARIB_NON_ECCU = countries.display_names(countries.CARIBBEAN)
 COUNTRIES = ECCU_COUNTRIES + CARIB_NON_ECCU
 
-# Country -> currency map for our region
-COUNTRY_TO_CUR = {
-    "Anguilla": "XCD", "Antigua & Barbuda": "XCD", "Dominica": "XCD",
-    "Grenada": "XCD", "Montserrat": "XCD", "St. Kitts & Nevis": "XCD",
-    "St. Lucia": "XCD", "St. Vincent & the Grenadines": "XCD",
-    "Barbados": "BBD", "Trinidad & Tobago": "TTD", "Jamaica": "JMD", "Bahamas": "BSD",
-    "Haiti": "HTG", "Cuba": "CUP", "Dominican Republic": "DOP",
-}
-
-# A compact world currency list (fallback if pycountry isn’t available)
-COMMON_WORLD_CURRENCIES = [
-    "USD","EUR","GBP","CAD","AUD","JPY","CNY","INR","BRL","ZAR","KES","NGN","SAR","AED",
-    "CHF","SEK","NOK","DKK","PLN","TRY","MXN","ARS","CLP","PEN","COP","NZD","KRW","HKD","SGD",
-    # Caribbean + ECCU
-    "XCD","BBD","TTD","BSD","JMD","HTG","CUP","DOP",
-]
-
 GOAL_OPTIONS = ["Budgeting", "Saving", "Investing", "Debt reduction", "Business ideas", "Fraud awareness"]
 TONES = ["Friendly", "Professional", "Youthful", "Formal", "Concise"]
 ROLES = ["Student", "Young Adult", "Adult"]
@@ -84,23 +68,11 @@ def load_profile() -> dict:
 def save_profile(p: dict) -> None:
     DATA_DIR.mkdir(exist_ok=True, parents=True)
     # derive is_eccu on save
-    p["is_eccu"] = p.get("home_region") == "ECCU" or p.get("country") in ECCU_COUNTRIES
+    p["is_eccu"] = p.get("home_region") == "ECCU" or countries.is_eccu(p.get("country"))
     PROFILE.write_text(json.dumps(p, indent=2))
     # keep session in sync for immediate use in chat
     st.session_state["user_profile"] = p
 
-def _world_currency_list():
-    """Return a sorted world currency list; try pycountry, else fallback."""
-    try:
-        import pycountry  # type: ignore
-        world = sorted({c.alpha_3 for c in pycountry.currencies if hasattr(c, "alpha_3") and len(c.alpha_3) == 3})
-        for bad in ("XTS","XXX"):
-            if bad in world:
-                world.remove(bad)
-        return world
-    except Exception:
-        return sorted(set(COMMON_WORLD_CURRENCIES))
-
 # ──────────────────────────────────────────────────────────────────────────────
 # Conversation logging helpers (per-user JSONL)
 # ──────────────────────────────────────────────────────────────────────────────
@@ -110,19 +82,20 @@ def _convo_path_for(email: str) -> Path:
 def log_message(role: str, content: str, email: str | None = None, meta: dict | None = None) -> None:
     """
     Append one message to the per-user conversation log as JSON Lines.
-    Safe to call repeatedly from your chatbot after each send/receive.
+    Safe to call repeatedly from your chatbot after each send/receive: the entry
+    is queued for the background writer (see log_writer.py), so this never
+    blocks on disk I/O. Pass `email` to skip the profile lookup entirely.
     """
-    prof = st.session_state.get("user_profile") or load_profile()
-    email = email or prof.get("email") or "guest"
+    if not email:
+        prof = st.session_state.get("user_profile") or load_profile()
+        email = prof.get("email") or "guest"
     entry = {
         "ts": datetime.now(timezone.utc).isoformat(),
         "role": role,
         "content": content,
         "meta": meta or {},
     }
-    p = _convo_path_for(email)
-    with p.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    get_writer().write(_convo_path_for(email), entry)
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Guard to require setup when AI loads
@@ -200,7 +173,7 @@ def render_setup_wizard() -> bool:
 
         if p["auto_currency"]:
             # ECCU/Caribbean: look up from table; Global: leave as-is unless we can infer
-            suggested = COUNTRY_TO_CUR.get(p["country"])
+            suggested = countries.currency_for(p["country"])
             if not suggested and p["home_region"] == "ECCU":
                 suggested = "XCD"
             if suggested:
@@ -209,10 +182,9 @@ def render_setup_wizard() -> bool:
             else:
                 st.caption("No default found for your country. You can pick a currency below if you prefer.")
         else:
-            world = _world_currency_list()
-            # Preselect current base if present
-            idx = world.index(p["base_currency"]) if p["base_currency"] in world else (world.index("USD") if "USD" in world else 0)
-            p["base_currency"] = st.selectbox("Base currency (ISO 4217, e.g., XCD, USD…)", world, index=idx)
+            # Preselect current base if present (registry is built once per process)
+            p["base_currency"] = st.selectbox("Base currency (ISO 4217, e.g., XCD, USD…)", currencies.CODES,
+                                              index=currencies.index_of(p["base_currency"]), format_func=currencies.label)
 
         # Small hint for ECCU
         if p["home_region"] == "ECCU" and p["base_currency"] != "XCD":
@@ -262,7 +234,7 @@ def render_setup_wizard() -> bool:
                 return False
 
             # Mark ECCU membership for downstream logic
-            p["is_eccu"] = p["home_region"] == "ECCU" or p["country"] in ECCU_COUNTRIES
+            p["is_eccu"] = p["home_region"] == "ECCU" or countries.is_eccu(p["country"])
 
             # Bookkeeping on first save or update
             p["setup_complete"] = True
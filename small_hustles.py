@@ -1,14 +1,16 @@
 import streamlit as st
-import json
 import random
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
+import data_loaders
+from data_loaders import SIDE_HUSTLES_JSON
+from hustle_catalog import HustleCatalog
+
 # ---------------------------------
 # Paths (matches your structure)
 # ---------------------------------
 FILES_DIR = Path("files")
-SIDE_HUSTLES_JSON = FILES_DIR / "side_huslte_options.json"  # <- your filename
 
 # ---------------------------------
 # Seeds for business idea generator
@@ -29,105 +31,57 @@ TARGET_AUDIENCES = [
 ]
 
 # ---------------------------------
-# Loaders
+# Loaders (data + caching live in data_loaders; this layer only reports)
 # ---------------------------------
-@st.cache_data(show_spinner=False)
+def _report_problems(problems) -> None:
+    for p in problems:
+        (st.error if p.level == "error" else st.warning)(p.message)
+
 def load_side_hustles(path: Path = SIDE_HUSTLES_JSON) -> List[Dict[str, Any]]:
-    """Load and validate side hustles from JSON file."""
-    if not path.exists():
-        st.error(f"Side hustle JSON not found at: {path}")
-        return []
-
-    try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-    except Exception as e:
-        st.error(f"Failed to parse JSON at {path}: {e}")
-        return []
-
-    valid: List[Dict[str, Any]] = []
-    for i, item in enumerate(data):
-        if not isinstance(item, dict):
-            st.warning(f"Skipping item #{i}: not an object")
-            continue
-
-        title = (item.get("title") or "").strip()
-        description = (item.get("description") or "").strip()
-        requirements = (item.get("requirements") or "").strip()
-        remote = item.get("remote", False)
-        low_cost = item.get("low_cost", False)
-
-        # basic validation
-        if not title:
-            st.warning(f"Skipping item #{i}: missing title")
-            continue
-        if not isinstance(remote, bool) or not isinstance(low_cost, bool):
-            st.warning(f"Skipping item #{i}: 'remote'/'low_cost' must be booleans (true/false)")
-            continue
-
-        valid.append({
-            "title": title,
-            "description": description,
-            "requirements": requirements,
-            "remote": bool(remote),
-            "low_cost": bool(low_cost),
-        })
-
-    if not valid:
-        st.error("No valid side hustles found in JSON.")
-    return valid
+    """Load and validate side hustles from JSON file, showing any problems on the page."""
+    items, problems = data_loaders.load_side_hustles(path)
+    _report_problems(problems)
+    return list(items)
+
+def get_catalog(path: Path = SIDE_HUSTLES_JSON) -> HustleCatalog:
+    """Shared catalog index; rebuilt only when the JSON file changes."""
+    return data_loaders.load_hustle_catalog(path)
 
 # ---------------------------------
 # Core logic
 # ---------------------------------
 
-def get_random_side_hustle(
-    hustles: List[Dict[str, Any]],
-    remote_only: bool = False, 
-    low_cost_only: bool = False
-) -> Optional[Dict[str, Any]]:
-    """
-    Returns a random side hustle from the list, with optional filtering.
-
-    Args:
-        hustles (list): The list of side hustle dictionaries.
-        remote_only (bool): If True, only return remote options.
-        low_cost_only (bool): If True, only return low-cost options.
-
-    Returns:
-        dict | None: A single side hustle dictionary or None if no match.
-    """
-    filtered = [
-        h for h in hustles
-        if (not remote_only or h["remote"]) and (not low_cost_only or h["low_cost"])
-    ]
-    if not filtered:
-        return None
-    return random.choice(filtered)
-
 def get_random_side_job(
     remote_only: bool = False, 
-    low_cost_only: bool = False
+    low_cost_only: bool = False,
+    skill: Optional[str] = None,
+    cost_band: Optional[str] = None,
+    country: Optional[str] = None,
+    keyword: Optional[str] = None,
 ) -> Optional[Dict[str, Any]]:
     """
-    Returns a random side hustle from the list, with optional filtering.
+    Returns a random side hustle from the catalog, with optional filtering.
 
     Args:
-        hustles (list): The list of side hustle dictionaries.
         remote_only (bool): If True, only return remote options.
         low_cost_only (bool): If True, only return low-cost options.
+        skill (str, optional): Skill tag the hustle should use, e.g. "writing", "design",
+            "tech", "marketing", "teaching", "admin", "animals", "social_media".
+        cost_band (str, optional): Startup cost band: "low", "medium" or "high".
+        country (str, optional): Only hustles suitable in this country.
+        keyword (str, optional): Words to search for in the title, description and requirements.
 
     Returns:
         dict | None: A single side hustle dictionary or None if no match.
     """
-    side_hustles = load_side_hustles()
-
-    filtered = [
-        h for h in side_hustles
-        if (not remote_only or h["remote"]) and (not low_cost_only or h["low_cost"])
-    ]
-    if not filtered:
-        return None
-    return random.choice(filtered)
+    return get_catalog().pick(
+        remote_only=remote_only,
+        low_cost_only=low_cost_only,
+        skills=[skill] if skill else (),
+        cost_band=cost_band,
+        country=country,
+        keyword=keyword,
+    )
 
 def generate_business_idea(count: int = 1) -> list:
     """
@@ -154,7 +108,7 @@ def run_small_hustles():
     st.header("🧵 Smart Hustle Suggestions")
     st.markdown("Explore random side hustles or generate small business ideas tailored to your situation.")
 
-    side_hustles = load_side_hustles()
+    catalog = get_catalog()
 
     st.subheader("💼 Find a Random Side Hustle")
     col1, col2 = st.columns(2)
@@ -162,9 +116,17 @@ def run_small_hustles():
         remote_only = st.checkbox("💻 Remote Only", value=True)
     with col2:
         low_cost_only = st.checkbox("💸 Low Startup Cost", value=True)
+    col3, col4 = st.columns(2)
+    with col3:
+        skills = st.multiselect("🛠️ Skills", catalog.skills, format_func=lambda s: s.replace("_", " ").title())
+    with col4:
+        keyword = st.text_input("🔎 Keyword", placeholder="e.g. writing, website, pets")
+
+    filters = dict(remote_only=remote_only, low_cost_only=low_cost_only, skills=skills, keyword=keyword)
+    st.caption(f"{catalog.count(**filters)} of {len(catalog)} side hustles match.")
 
     if st.button("🎲 Suggest a Side Hustle"):
-        pick = get_random_side_hustle(side_hustles, remote_only=remote_only, low_cost_only=low_cost_only)
+        pick = catalog.pick(**filters)
         if not pick:
             st.error("🚫 No side hustles found with those filters!")
         else:
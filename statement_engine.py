@@ -0,0 +1,306 @@
+# statement_engine.py
+"""
+Local "where did my money go" engine for uploaded bank-statement CSVs.
+
+The CSV is read in chunks, so a multi-year export never sits in memory as
+text. Each chunk goes through these steps:
+  1. Find the date / description / amount (or debit + credit) columns.
+  2. Normalize descriptions into merchant keys ("POS PURCHASE MASSY STORES
+     #0231" → "massy stores").
+  3. Categorize only the merchants not seen in earlier chunks: the cached
+     merchant table (files/merchant_categories.json) first, then the regex
+     rules, applied to the whole column at once.
+  4. Fold monthly category totals, income and merchant totals into running
+     sums.
+
+The result feeds budget_gen.budgeting_function directly (budget_inputs) and is
+summarized as a short markdown table for the chat.
+"""
+from __future__ import annotations
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import IO, Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+CHUNK_ROWS = 50_000
+
+_DATE_COLS = ("date", "transaction date", "trans date", "posting date", "posted date", "value date", "booking date")
+_DESC_COLS = ("description", "details", "narrative", "memo", "payee", "merchant", "particulars", "transaction details",
+              "transaction description", "reference", "name")
+_AMOUNT_COLS = ("amount", "transaction amount", "amount (xcd)", "amount xcd", "value")
+_DEBIT_COLS = ("debit", "debits", "withdrawal", "withdrawals", "money out", "paid out", "dr")
+_CREDIT_COLS = ("credit", "credits", "deposit", "deposits", "money in", "paid in", "cr")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Rules
+# ──────────────────────────────────────────────────────────────────────────────
+class CategoryRules:
+    """Immutable merchant table + ordered regex rules (see data_loaders.load_merchant_rules)."""
+
+    def __init__(self, merchants: Mapping[str, str], rules: Sequence[Tuple[str, Sequence[str]]],
+                 noise_words: Sequence[str] = (), income_category: str = "Income",
+                 fallback_category: str = "Other"):
+        self.merchants: Mapping[str, str] = MappingProxyType({k.lower(): v for k, v in merchants.items()})
+        self.rules: Tuple[Tuple[str, "re.Pattern[str]"], ...] = tuple(
+            (cat, re.compile("|".join(f"(?:{p})" for p in patterns))) for cat, patterns in rules if patterns
+        )
+        self.noise = re.compile(r"\b(?:%s)\b" % "|".join(map(re.escape, noise_words))) if noise_words else None
+        self.income_category = income_category
+        self.fallback_category = fallback_category
+        self.categories: Tuple[str, ...] = tuple(dict.fromkeys(
+            [c for c, _ in self.rules] + list(self.merchants.values()) + [income_category, fallback_category]
+        ))
+        self.lookup = lru_cache(maxsize=8192)(self._lookup_uncached)
+
+    def __len__(self) -> int:
+        return len(self.merchants) + len(self.rules)
+
+    def merchant_key(self, description: str) -> str:
+        s = re.sub(r"[^a-z& ]+", " ", (description or "").lower())
+        if self.noise is not None:
+            s = self.noise.sub(" ", s)
+        return " ".join(s.split()[:4])
+
+    def _lookup_uncached(self, key: str) -> Optional[str]:
+        """Merchant table hit for a normalized key (any 1- or 2-word span), else None."""
+        words = key.split()
+        for n in (2, 1):
+            for i in range(len(words) - n + 1):
+                cat = self.merchants.get(" ".join(words[i:i + n]))
+                if cat:
+                    return cat
+        return None
+
+    def categorize(self, description: str) -> str:
+        """Single description (receipts, tools); statements use categorize_many."""
+        key = self.merchant_key(description)
+        cat = self.lookup(key)
+        if cat:
+            return cat
+        text = (description or "").lower()
+        for cat, rx in self.rules:
+            if rx.search(text):
+                return cat
+        return self.fallback_category
+
+    def categorize_many(self, descriptions: "pd.Series", keys: "pd.Series") -> "pd.Series":
+        """Vectorized: table lookups on the keys, then each rule over the still-uncategorized rows."""
+        out = keys.map(self.lookup)
+        text = descriptions.str.lower()
+        for cat, rx in self.rules:
+            todo = out.isna()
+            if not todo.any():
+                break
+            hit = todo & text.str.contains(rx, na=False)
+            out = out.mask(hit, cat)
+        return out.fillna(self.fallback_category)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Analysis
+# ──────────────────────────────────────────────────────────────────────────────
+class StatementSummary(NamedTuple):
+    rows: int                     # transactions used
+    skipped: int                  # rows without a usable date or amount
+    months: Tuple[str, ...]       # "2025-01", ...
+    spending: Any                 # DataFrame: month × category, positive amounts spent
+    income: Any                   # Series: month → money in
+    top_merchants: Any            # Series: merchant → total spent (top 10)
+    uncategorized_share: float    # share of spending that fell through to the fallback category
+
+
+def _pick(columns: Sequence[str], names: Sequence[str]) -> Optional[str]:
+    lowered = {c.strip().lower(): c for c in columns}
+    for n in names:
+        if n in lowered:
+            return lowered[n]
+    for n in names:  # "Transaction Date (posted)" and friends
+        for low, orig in lowered.items():
+            if low.startswith(n):
+                return orig
+    return None
+
+
+def _money(col: "pd.Series") -> "pd.Series":
+    import pandas as pd
+    s = col.astype("string").str.strip()
+    neg = s.str.startswith("(", na=False) & s.str.endswith(")", na=False)
+    num = pd.to_numeric(s.str.replace(r"[^\d.\-]", "", regex=True), errors="coerce")
+    return num.where(~neg, -num.abs())
+
+
+def _dayfirst(sample: "pd.Series") -> bool:
+    """dd/mm vs mm/dd from values whose first or second part is > 12 (Caribbean banks mostly use dd/mm)."""
+    parts = sample.dropna().astype("string").str.extract(r"^(\d{1,2})[/.-](\d{1,2})[/.-]\d{2,4}")
+    parts = parts.dropna().astype(int)
+    if parts.empty:
+        return False
+    return not (parts[1] > 12).any()
+
+
+def analyze_csv(source: Union[str, IO[bytes], IO[str]], rules: Optional[CategoryRules] = None,
+                chunksize: int = CHUNK_ROWS) -> Optional[StatementSummary]:
+    """Summarize a statement CSV; None when it doesn't look like one (no date/description/amount columns)."""
+    import pandas as pd
+    if rules is None:
+        from data_loaders import load_merchant_rules
+        rules = load_merchant_rules()[0]
+
+    try:
+        reader = pd.read_csv(source, chunksize=chunksize, dtype="string", skipinitialspace=True,
+                             encoding_errors="replace", on_bad_lines="skip")
+    except Exception:
+        return None
+
+    cols: Optional[Dict[str, Optional[str]]] = None
+    dayfirst = False
+    memo: Dict[str, str] = {}
+    spend_parts: List[pd.Series] = []
+    income_parts: List[pd.Series] = []
+    merchant_parts: List[pd.Series] = []
+    rows = skipped = 0
+
+    try:
+        for chunk in reader:
+            if cols is None:
+                cols = {
+                    "date": _pick(chunk.columns, _DATE_COLS),
+                    "desc": _pick(chunk.columns, _DESC_COLS),
+                    "amount": _pick(chunk.columns, _AMOUNT_COLS),
+                    "debit": _pick(chunk.columns, _DEBIT_COLS),
+                    "credit": _pick(chunk.columns, _CREDIT_COLS),
+                }
+                if not cols["date"] or not cols["desc"] or not (cols["amount"] or cols["debit"] or cols["credit"]):
+                    return None
+                dayfirst = _dayfirst(chunk[cols["date"]].head(200))
+
+            dates = pd.to_datetime(chunk[cols["date"]], errors="coerce", dayfirst=dayfirst, format="mixed")
+            if cols["amount"]:
+                amount = _money(chunk[cols["amount"]])
+            else:
+                debit = _money(chunk[cols["debit"]]).abs().fillna(0) if cols["debit"] else 0
+                credit = _money(chunk[cols["credit"]]).abs().fillna(0) if cols["credit"] else 0
+                amount = credit - debit
+                amount = amount.where(amount != 0)
+            ok = dates.notna() & amount.notna()
+            skipped += int((~ok).sum())
+            if not ok.any():
+                continue
+            desc = chunk[cols["desc"]].fillna("").astype("string")[ok]
+            dates, amount = dates[ok], amount[ok].astype(float)
+            month = dates.dt.year * 100 + dates.dt.month        # 202501; formatted once at the end
+            rows += int(ok.sum())
+
+            # normalize each distinct description, categorize each distinct merchant once per statement
+            codes, uniques = pd.factorize(desc)
+            keys = pd.Series(pd.Index(uniques).map(rules.merchant_key).to_numpy()[codes], index=desc.index)
+            new = ~keys.isin(memo.keys())
+            if new.any():
+                first = ~keys[new].duplicated()
+                fresh_desc, fresh_keys = desc[new][first], keys[new][first]
+                memo.update(zip(fresh_keys, rules.categorize_many(fresh_desc, fresh_keys)))
+            category = keys.map(memo).astype("string")
+            category = category.mask(amount > 0, rules.income_category)
+            category = category.mask((amount < 0) & (category == rules.income_category), rules.fallback_category)
+
+            out = amount < 0
+            spend_parts.append((-amount[out]).groupby([month[out], category[out]]).sum())
+            income_parts.append(amount[~out].groupby(month[~out]).sum())
+            merchant_parts.append((-amount[out]).groupby(keys[out]).sum())
+    except (pd.errors.ParserError, UnicodeDecodeError, ValueError):
+        if cols is None:
+            return None
+
+    if cols is None or rows == 0:
+        return None
+
+    def _fold(parts: List[pd.Series]) -> pd.Series:
+        parts = [p for p in parts if len(p)]
+        return pd.concat(parts).groupby(level=list(range(parts[0].index.nlevels))).sum() if parts else pd.Series(dtype=float)
+
+    spend = _fold(spend_parts)
+    spending = spend.unstack(fill_value=0.0) if len(spend) else pd.DataFrame(dtype=float)
+    income = _fold(income_parts)
+    label = lambda m: f"{m // 100:04d}-{m % 100:02d}"
+    spending = spending.rename(index=label).rename_axis(index=None, columns=None)
+    income = income.rename(index=label).rename_axis(None)
+    months = tuple(sorted(set(spending.index) | set(income.index)))
+    spending = spending.reindex(list(months), fill_value=0.0)
+    if len(spending.columns):
+        spending = spending[spending.sum().sort_values(ascending=False).index]
+    income = income.reindex(list(months), fill_value=0.0)
+    total = float(spending.to_numpy().sum()) if spending.size else 0.0
+    other = float(spending[rules.fallback_category].sum()) if rules.fallback_category in spending else 0.0
+    return StatementSummary(
+        rows=rows,
+        skipped=skipped,
+        months=months,
+        spending=spending,
+        income=income,
+        top_merchants=_fold(merchant_parts).sort_values(ascending=False).head(10).rename_axis(None),
+        uncategorized_share=(other / total) if total else 0.0,
+    )
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Outputs
+# ──────────────────────────────────────────────────────────────────────────────
+def budget_inputs(summary: StatementSummary, exclude: Sequence[str] = ("Transfers",)) -> Tuple[float, List[Dict[str, Any]]]:
+    """(average monthly income, [{"Category", "Amount"}] average monthly spend) for budgeting_function."""
+    n = max(len(summary.months), 1)
+    income = round(float(summary.income.sum()) / n, 2)
+    expenses = [
+        {"Category": cat, "Amount": round(float(total) / n, 2)}
+        for cat, total in summary.spending.sum().items()
+        if cat not in exclude and total > 0
+    ]
+    return income, expenses
+
+
+def summary_markdown(summary: StatementSummary, currency: str = "XCD") -> str:
+    """Compact table for the chat (and as LLM context instead of the raw CSV)."""
+    n = max(len(summary.months), 1)
+    totals = summary.spending.sum()
+    spent = float(totals.sum())
+    period = f"{summary.months[0]} to {summary.months[-1]}" if summary.months else "no dated rows"
+    lines = [
+        f"**Where your money went** ({period}, {summary.rows:,} transactions, {n} month{'s' if n != 1 else ''})",
+        "",
+        f"| Category | Avg / month ({currency}) | Share |",
+        "|---|---:|---:|",
+    ]
+    for cat, total in totals.items():
+        if total > 0:
+            lines.append(f"| {cat} | {total / n:,.2f} | {total / spent:.0%} |")
+    lines += [
+        "",
+        f"Money in: **{float(summary.income.sum()) / n:,.2f}** / month · Money out: **{spent / n:,.2f}** / month",
+    ]
+    if len(summary.top_merchants):
+        lines.append("Top merchants: " + ", ".join(
+            f"{m or 'unknown'} ({v:,.0f})" for m, v in summary.top_merchants.head(5).items()))
+    if summary.uncategorized_share > 0.25:
+        lines.append(f"_{summary.uncategorized_share:.0%} of spending couldn't be categorized (shown as Other)._")
+    if summary.skipped:
+        lines.append(f"_{summary.skipped:,} rows without a readable date or amount were skipped._")
+    return "\n".join(lines)
+
+
+# "where did my money go" / "what did I spend it on" / "break it down by category": the table is the answer
+_QUESTION = re.compile(
+    r"where\b.*\b(money|cash|pay|salary|income)\b.*\b(go|goes|went|going)\b"
+    r"|what\b.*\b(did|do|am)\s+i\b.*\b(spend|spent|spending)\b(\s+(it|money|most))?\s*(on|at)?\s*\??\s*$"
+    r"|\b(break\s*down|breakdown)\b|\bspending\s+by\s+categor|\bcategori[sz]e\b"
+    r"|^\s*(summar(y|i[sz]e)|analy[sz]e)\b[\w\s]{0,30}$",
+    re.I,
+)
+# asking for advice or a plan needs the agent, even when phrased around the statement
+_ADVICE = re.compile(r"\b(how\s+(can|do|should)|should|suggest|tips?|advice|cut|reduce|save|saving|plan|"
+                     r"improve|help\s+me|afford|invest)\b", re.I)
+
+
+def is_statement_question(prompt: str) -> bool:
+    """Empty prompt or a plain "where did my money go / breakdown" question: the summary fully answers it."""
+    prompt = (prompt or "").strip()
+    return not prompt or (bool(_QUESTION.search(prompt)) and not _ADVICE.search(prompt))
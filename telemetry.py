@@ -0,0 +1,170 @@
+# telemetry.py
+from __future__ import annotations
+import math
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from log_writer import get_writer
+
+METRICS_DIR = Path("files") / "metrics"
+TURN_METRICS_PATH = Path(os.getenv("TURN_METRICS_PATH", str(METRICS_DIR / "turns.jsonl")))
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000.0, 1)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Latency histogram (constant memory, approximate percentiles)
+# ──────────────────────────────────────────────────────────────────────────────
+class LatencyHistogram:
+    """Log-scale buckets from 1 ms to ~10 min (≈12% wide), plus exact count/sum/max."""
+
+    BUCKETS_PER_DECADE = 20
+    MAX_MS = 600_000
+
+    def __init__(self):
+        self.n_buckets = int(math.log10(self.MAX_MS) * self.BUCKETS_PER_DECADE) + 1
+        self.counts = [0] * (self.n_buckets + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def _bucket(self, ms: float) -> int:
+        if ms <= 1:
+            return 0
+        return min(self.n_buckets, int(math.log10(ms) * self.BUCKETS_PER_DECADE) + 1)
+
+    def _upper(self, b: int) -> float:
+        return 10 ** (b / self.BUCKETS_PER_DECADE)
+
+    def add(self, ms: float) -> None:
+        ms = max(0.0, float(ms))
+        self.counts[self._bucket(ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q / 100.0 * self.count
+        seen = 0
+        for b, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank and c:
+                return min(self._upper(b), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        def r(v):
+            return None if v is None else round(v, 1)
+        return {
+            "count": self.count,
+            "mean_ms": r(self.total / self.count) if self.count else None,
+            "p50_ms": r(self.percentile(50)),
+            "p90_ms": r(self.percentile(90)),
+            "p99_ms": r(self.percentile(99)),
+            "max_ms": r(self.max) if self.count else None,
+        }
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Per-turn spans
+# ──────────────────────────────────────────────────────────────────────────────
+class TurnTimer:
+    """
+    Timing spans for one chat turn.
+
+    Named spans (prompt building, agent construction, ...) are measured with
+    `span()`, the stream loop reports the first content chunk and tool call
+    start/complete events, and `to_meta()` flattens everything into the dict
+    stored in the log entry's `meta` field. All times are milliseconds relative
+    to the start of the turn.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: Dict[str, float] = {}
+        self.first_token_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.tool_calls: List[Dict[str, Any]] = []
+        self._open_tools: Dict[str, Dict[str, Any]] = {}
+        self.content_chunks = 0
+        self.content_chars = 0
+        self.usage: Dict[str, int] = {}
+
+    def _now(self) -> float:
+        return time.perf_counter() - self.started
+
+    @contextmanager
+    def span(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans[name] = self.spans.get(name, 0.0) + (time.perf_counter() - t0)
+
+    # ---------- stream events ----------
+    def content(self, text: str) -> None:
+        if self.first_token_at is None:
+            self.first_token_at = self._now()
+        self.content_chunks += 1
+        self.content_chars += len(text or "")
+
+    def tool_started(self, name: str, call_id: Optional[str] = None) -> None:
+        call = {"name": name, "start_ms": _ms(self._now()), "ms": None}
+        self._open_tools[call_id or name] = call
+        self.tool_calls.append(call)
+
+    def tool_completed(self, name: str, call_id: Optional[str] = None, error: bool = False) -> Optional[float]:
+        call = self._open_tools.pop(call_id or name, None)
+        if call is None:
+            return None
+        call["ms"] = round(_ms(self._now()) - call["start_ms"], 1)
+        if error:
+            call["error"] = True
+        return call["ms"]
+
+    def record_usage(self, metrics: Any) -> None:
+        """Pull token counts from an agno run's metrics dict (values may be lists per message)."""
+        if not isinstance(metrics, dict):
+            return
+        for key in ("input_tokens", "output_tokens", "total_tokens"):
+            v = metrics.get(key)
+            if isinstance(v, (list, tuple)):
+                v = sum(x for x in v if isinstance(x, (int, float)))
+            if isinstance(v, (int, float)):
+                self.usage[key] = int(v)
+
+    def finish(self) -> None:
+        if self.finished_at is None:
+            self.finished_at = self._now()
+
+    # ---------- export ----------
+    def to_meta(self) -> Dict[str, Any]:
+        self.finish()
+        timings = {f"{k}_ms": _ms(v) for k, v in self.spans.items()}
+        timings["ttft_ms"] = _ms(self.first_token_at) if self.first_token_at is not None else None
+        timings["total_ms"] = _ms(self.finished_at)
+        tokens = dict(self.usage)
+        tokens["chunks"] = self.content_chunks
+        tokens["chars"] = self.content_chars
+        if "output_tokens" not in tokens:
+            tokens["output_tokens_est"] = self.content_chars // 4
+        return {
+            "timings": timings,
+            "tools": [c["name"] for c in self.tool_calls],
+            "tool_calls": [dict(c) for c in self.tool_calls],
+            "tokens": tokens,
+        }
+
+
+def export_turn_metrics(meta: Dict[str, Any], **extra: Any) -> None:
+    """Append one turn's metrics to files/metrics/turns.jsonl (through the background writer)."""
+    entry = {"ts": datetime.now(timezone.utc).isoformat(), **extra, **meta}
+    get_writer().write(TURN_METRICS_PATH, entry)
@@ -0,0 +1,231 @@
+# tool_budget.py
+from __future__ import annotations
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from log_writer import get_writer
+from telemetry import METRICS_DIR, LatencyHistogram
+
+TOOL_CALLS_PATH = METRICS_DIR / "tool_calls.jsonl"
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Budgets (seconds). Override with TOOL_BUDGETS="duckduckgo=8,google_search_tools=8"
+# ──────────────────────────────────────────────────────────────────────────────
+DEFAULT_BUDGET_S = float(os.getenv("TOOL_DEFAULT_BUDGET", "20"))
+BUDGETS: Dict[str, float] = {
+    "duckduckgo": 10.0,
+    "google_search_tools": 10.0,
+    "yfinance_tools": 12.0,
+    "hackers_news": 10.0,
+    "wikipedia_tools": 10.0,
+    "currencyconverter": 15.0,
+    "budgeting_function": 10.0,
+}
+WINDOW = 100           # recent samples per tool used for p95
+MIN_SAMPLES = 5        # don't judge a tool on fewer calls than this
+RETRY_AFTER_S = 600.0  # a demoted tool gets another chance after this long
+QUEUE_WAIT_S = float(os.getenv("TOOL_QUEUE_WAIT", "2"))  # give up if no worker frees up in this long
+
+_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tool-budget")
+
+
+def parse_budgets(spec: Optional[str]) -> Dict[str, float]:
+    """'duckduckgo=8, yfinance_tools=12' -> {"duckduckgo": 8.0, "yfinance_tools": 12.0}"""
+    out: Dict[str, float] = {}
+    for part in (spec or "").split(","):
+        if "=" not in part:
+            continue
+        k, v = part.split("=", 1)
+        try:
+            out[k.strip()] = float(v)
+        except ValueError:
+            continue
+    return out
+
+
+BUDGETS.update(parse_budgets(os.getenv("TOOL_BUDGETS")))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Per-tool statistics
+# ──────────────────────────────────────────────────────────────────────────────
+class ToolStats:
+    """
+    Latency bookkeeping per tool label (toolkit name, or function name for our
+    own tools): a lifetime histogram plus a window of recent samples for p95.
+    Samples are also appended to files/metrics/tool_calls.jsonl and replayed
+    at startup, so demotions survive a restart.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hist: Dict[str, LatencyHistogram] = {}
+        self.recent: Dict[str, deque] = {}
+        self.timeouts: Dict[str, int] = {}
+        self.demoted_at: Dict[str, float] = {}
+        self.labels: Dict[str, str] = {}  # function name -> label
+        self._loaded = False
+
+    def label_for(self, function_name: str) -> str:
+        return self.labels.get(function_name, function_name)
+
+    def register_toolkit(self, toolkit: Any) -> None:
+        label = getattr(toolkit, "name", None) or type(toolkit).__name__
+        for fn in (getattr(toolkit, "functions", None) or {}):
+            self.labels[fn] = label
+
+    def _add(self, label: str, ms: float, timed_out: bool) -> None:
+        self.hist.setdefault(label, LatencyHistogram()).add(ms)
+        self.recent.setdefault(label, deque(maxlen=WINDOW)).append(ms)
+        if timed_out:
+            self.timeouts[label] = self.timeouts.get(label, 0) + 1
+
+    def record(self, function_name: str, ms: float, timed_out: bool = False, error: bool = False) -> None:
+        self.load_history()
+        label = self.label_for(function_name)
+        with self._lock:
+            self._add(label, ms, timed_out)
+        get_writer().write(TOOL_CALLS_PATH, {
+            "ts": datetime.now(timezone.utc).isoformat(),
+            "tool": label,
+            "function": function_name,
+            "ms": round(ms, 1),
+            "timed_out": timed_out,
+            "error": error,
+        })
+
+    def load_history(self) -> None:
+        """Replay the tail of tool_calls.jsonl once per process."""
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with TOOL_CALLS_PATH.open("r", encoding="utf-8") as f:
+                tail = deque(f, maxlen=WINDOW * 20)
+        except OSError:
+            return
+        with self._lock:
+            for line in tail:
+                try:
+                    e = json.loads(line)
+                    self._add(e["tool"], float(e["ms"]), bool(e.get("timed_out")))
+                except Exception:
+                    continue
+
+    def p95(self, label: str) -> Optional[float]:
+        with self._lock:
+            xs = sorted(self.recent.get(label) or ())
+        if len(xs) < MIN_SAMPLES:
+            return None
+        return xs[min(len(xs) - 1, int(round(0.95 * (len(xs) - 1))))]
+
+    def is_demoted(self, label: str) -> bool:
+        """p95 at/over budget → demoted; after RETRY_AFTER_S the tool is let back in to re-probe."""
+        p95 = self.p95(label)
+        now = time.time()
+        with self._lock:
+            if p95 is None or p95 < budget_for(label) * 1000:
+                self.demoted_at.pop(label, None)
+                return False
+            since = self.demoted_at.setdefault(label, now)
+            if now - since >= RETRY_AFTER_S:
+                self.demoted_at[label] = now
+                self.recent[label].clear()  # fresh window for the probe
+                return False
+            return True
+
+    def table(self) -> List[Dict[str, Any]]:
+        rows = []
+        for label, h in sorted(self.hist.items()):
+            s = h.summary()
+            rows.append({
+                "tool": label,
+                "calls": s["count"],
+                "p50_ms": s["p50_ms"],
+                "p95_ms": self.p95(label),
+                "max_ms": s["max_ms"],
+                "timeouts": self.timeouts.get(label, 0),
+                "budget_s": budget_for(label),
+                "demoted": label in self.demoted_at,
+            })
+        return rows
+
+
+STATS = ToolStats()
+
+
+def budget_for(label: str) -> float:
+    return BUDGETS.get(label, DEFAULT_BUDGET_S)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# agno integration
+# ──────────────────────────────────────────────────────────────────────────────
+def budget_hook(function_name: str, function_call: Callable, arguments: Dict[str, Any]):
+    """
+    agno tool hook: time every tool call and give up after the tool's budget.
+
+    On timeout the model gets a short fallback message instead of the result so
+    it can answer with other tools or general knowledge; the worker thread is
+    left to finish in the background (Python threads cannot be killed).
+    The budget starts when a worker picks the call up. If every worker is still
+    stuck on earlier slow calls after QUEUE_WAIT_S, the call is dropped without
+    recording a sample, so a busy pool never counts against a healthy tool.
+    """
+    label = STATS.label_for(function_name)
+    budget = budget_for(label)
+    started = threading.Event()
+    began: List[float] = []
+
+    def run():
+        began.append(time.perf_counter())
+        started.set()
+        return function_call(**(arguments or {}))
+
+    future = _pool.submit(run)
+    if not started.wait(QUEUE_WAIT_S) and future.cancel():
+        return (f"The {function_name} tool could not start (other tool calls are still running) and was "
+                f"skipped. Answer with other tools or general knowledge and say the data may be incomplete.")
+    started.wait()  # cancel() lost the race: the worker is starting it now
+    t0 = began[0]
+    try:
+        result = future.result(timeout=max(0.0, budget - (time.perf_counter() - t0)))
+    except FutureTimeout:
+        STATS.record(function_name, budget * 1000, timed_out=True)
+        return (f"The {function_name} tool took longer than {budget:.0f}s and was skipped. "
+                f"Answer with other tools or general knowledge and say the data may be incomplete.")
+    except Exception:
+        STATS.record(function_name, (time.perf_counter() - t0) * 1000, error=True)
+        raise
+    STATS.record(function_name, (time.perf_counter() - t0) * 1000)
+    return result
+
+
+def select_tools(toolkits: Iterable[Any], functions: Iterable[Callable]) -> Tuple[List[Any], List[str]]:
+    """
+    Register toolkit labels, then drop any tool whose recent p95 exceeds its
+    budget. Returns (tools to give the agent, labels that were demoted).
+    """
+    STATS.load_history()
+    keep: List[Any] = []
+    demoted: List[str] = []
+    for tk in toolkits:
+        STATS.register_toolkit(tk)
+        label = getattr(tk, "name", None) or type(tk).__name__
+        if STATS.is_demoted(label):
+            demoted.append(label)
+        else:
+            keep.append(tk)
+    for fn in functions:
+        label = getattr(fn, "__name__", str(fn))
+        if STATS.is_demoted(label):
+            demoted.append(label)
+        else:
+            keep.append(fn)
+    return keep, demoted